@@ -1,7 +1,11 @@
 # app.py - Archivo principal de la API
 from flask import Flask, jsonify
 from flask_cors import CORS
-from routes.movies import movies_bp
+from routes.movies import movies_bp, prewarmer, cache_backend
+from services.scheduler import scheduler
+from services.link_validator import link_validator
+from config import config
+import database
 import os
 
 app = Flask(__name__)
@@ -18,6 +22,25 @@ CORS(app, resources={
 # Registrar blueprints
 app.register_blueprint(movies_bp)
 
+# Conexiones SQLite por hilo: se liberan al terminar cada app context
+database.init_app(app)
+
+# Jobs en segundo plano
+if config.LINK_VALIDATOR_INTERVAL_MINUTES > 0:
+    # El esquema se pone al día una vez al arrancar, no en cada pasada
+    database.init_db()
+    scheduler.add_job(
+        'link_validator',
+        lambda: link_validator.run(limit=config.LINK_VALIDATOR_LIMIT),
+        minutes=config.LINK_VALIDATOR_INTERVAL_MINUTES
+    )
+if config.PREWARM_INTERVAL_MINUTES > 0:
+    # Corre en un solo worker: con cache en memoria solo calienta el suyo
+    if cache_backend.name == 'memory':
+        print("PREWARM con CACHE_BACKEND=memory: solo se calienta el cache de un worker")
+    scheduler.add_job('prewarm', prewarmer.run, minutes=config.PREWARM_INTERVAL_MINUTES)
+# scheduler.start() va en cada worker (post_fork en gunicorn.conf.py)
+
 # Ruta raíz
 @app.route('/')
 def index():
@@ -31,6 +54,7 @@ def index():
             'details': '/api/details/<tmdb_id>?type=movie|tv',
             'movie_links': '/api/links/<tmdb_id>?auto_scrape=true',
             'series_season': '/api/series/<tmdb_id>/season/<season>',
+            'series_season_links': '/api/series/<tmdb_id>/season/<season>/links',
             'series_links': '/api/series/<tmdb_id>/links?season=1&episode=1',
             'stats': '/api/stats',
             'request': '/api/request'
@@ -57,4 +81,5 @@ def internal_error(error):
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') != 'production'
+    scheduler.start()
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
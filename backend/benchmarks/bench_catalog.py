@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recorrer el Gist en cada request vs CatalogSnapshot indexado
+Uso: python benchmarks/bench_catalog.py [--entries 50000] [--requests 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.catalog import CatalogSnapshot
+
+
+def build_synthetic_gist(entries):
+    """Gist sintético con ~70% películas y ~30% series"""
+    base = datetime(2024, 1, 1)
+    gist = {}
+    for i in range(entries):
+        tmdb_id = str(100000 + i)
+        added_at = (base + timedelta(minutes=random.randint(0, 500000))).isoformat()
+        if random.random() < 0.7:
+            gist[tmdb_id] = {
+                'tmdb_id': int(tmdb_id),
+                'title': f'Película {i}',
+                'type': 'movie',
+                'poster_path': f'/p{i}.jpg',
+                'listen_url': f'https://firestore.example/channel?m={i}',
+                'added_at': added_at
+            }
+        else:
+            gist[tmdb_id] = {
+                'tmdb_id': int(tmdb_id),
+                'title': f'Serie {i}',
+                'type': 'series',
+                'poster_path': f'/s{i}.jpg',
+                'added_at': added_at,
+                'seasons': {
+                    str(s): {'season_number': s, 'listen_url': f'https://firestore.example/channel?s={i}-{s}'}
+                    for s in range(1, random.randint(2, 6))
+                }
+            }
+    return gist
+
+
+def legacy_home(gist_db, tmdb_ids):
+    """Lo que hacía /api/home: 2 recorridos + 2 búsquedas por item de TMDB"""
+    verified_movies = []
+    for tmdb_id, item in gist_db.items():
+        if item.get('type') == 'movie':
+            verified_movies.append({'tmdb_id': int(tmdb_id), 'title': item['title']})
+    verified_series = []
+    for tmdb_id, item in gist_db.items():
+        if item.get('type') == 'series':
+            verified_series.append({'tmdb_id': int(tmdb_id), 'title': item['title']})
+    flags = [(str(i) in gist_db, str(i) in gist_db) for i in tmdb_ids]
+    return verified_movies[:8], verified_series[:8], flags
+
+
+def legacy_stats(gist_db):
+    """Lo que hacía /api/stats: 3 recorridos completos"""
+    movies_count = sum(1 for item in gist_db.values() if item.get('type') == 'movie')
+    series_count = sum(1 for item in gist_db.values() if item.get('type') == 'series')
+    total_seasons = 0
+    for item in gist_db.values():
+        if item.get('type') == 'series' and item.get('seasons'):
+            total_seasons += len(item['seasons'])
+    return movies_count, series_count, total_seasons
+
+
+def snapshot_home(catalog, tmdb_ids):
+    flags = [catalog.has(i) for i in tmdb_ids]
+    return list(catalog.movies[:8]), list(catalog.series[:8]), flags
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    gist_db = build_synthetic_gist(args.entries)
+    # 60 items de TMDB por home (trending + populares), mitad disponibles
+    tmdb_ids = [random.choice(list(gist_db.keys())) if n % 2 else 999999 + n for n in range(60)]
+
+    start = time.perf_counter()
+    catalog = CatalogSnapshot(gist_db)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Gist sintético: {args.entries} entradas "
+          f"({catalog.stats['total_movies']} películas, {catalog.stats['total_series']} series)")
+    print(f"Construcción del snapshot (una vez por recarga): {build_ms:.1f} ms\n")
+
+    rows = [
+        ('/api/home', timed(lambda: legacy_home(gist_db, tmdb_ids), args.requests),
+         timed(lambda: snapshot_home(catalog, tmdb_ids), args.requests)),
+        ('/api/stats', timed(lambda: legacy_stats(gist_db), args.requests),
+         timed(lambda: dict(catalog.stats), args.requests)),
+    ]
+
+    print(f"{'endpoint':<12} {'antes (ms)':>12} {'snapshot (ms)':>14} {'speedup':>9}")
+    for name, before, after in rows:
+        print(f"{name:<12} {before:>12.3f} {after:>14.4f} {before / max(after, 1e-9):>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
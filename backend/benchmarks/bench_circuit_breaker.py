@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pedidos a un dominio que devuelve 403 (como pelisplushd desde
+las IPs de Render) con y sin circuit breaker.
+
+Sin breaker cada pedido paga todos los reintentos de get_html con su
+backoff; con breaker, después de `min_calls` fallas el resto falla al
+instante hasta que pasa el enfriamiento.
+
+Uso: python benchmarks/bench_circuit_breaker.py [--requests 30] [--retry 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.scrapers import CuevanaScraper
+from services.scrapers.circuit import circuit_breakers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.count += 1
+        time.sleep(0.02)
+        self.send_response(403)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_html contra un dominio bloqueado')
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--retry', type=int, default=3)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/pelicula'
+
+    scraper = CuevanaScraper()
+    print(f"{args.requests} pedidos a un dominio que responde 403, retry={args.retry}\n")
+    print(f"{'modo':<12} {'total (s)':>10} {'por pedido (ms)':>16} {'requests HTTP':>14}")
+    for enabled in (False, True):
+        circuit_breakers.reset()
+        scraper.circuit_breaker = enabled
+        server.count = 0
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            try:
+                scraper.get_html(url, retry=args.retry)
+            except Exception:
+                pass
+        total = time.perf_counter() - start
+        label = 'con breaker' if enabled else 'sin breaker'
+        print(f"{label:<12} {total:>10.2f} {total / args.requests * 1000:>16.1f} {server.count:>14}")
+
+    print("\nScoreboard:")
+    for domain, row in circuit_breakers.scoreboard().items():
+        print(f"  {domain}: {row}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latencia de BaseScraper.get_html con y sin hedge, y reintentos
+acotados por deadline.
+
+Levanta un servidor HTTP local donde 1 de cada --stall-every requests se
+cuelga --stall segundos (como un sitio con cola larga).
+
+Uso: python benchmarks/bench_get_html_hedge.py [--requests 100] [--stall-every 25]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.scrapers import CuevanaScraper
+from services.scrapers.latency import domain_latency
+from services.scrapers.circuit import circuit_breakers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.count += 1
+            stall = server.count % server.stall_every == 0
+        if self.path.startswith('/fail'):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        time.sleep(server.stall if stall else 0.02)
+        body = b'<html><iframe src="https://voe.sx/e/1"></iframe></html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_html: hedge y deadline')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--stall-every', type=int, default=25)
+    parser.add_argument('--stall', type=float, default=3.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.count = 0
+    server.stall_every = args.stall_every
+    server.stall = args.stall
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+
+    scraper = CuevanaScraper()
+    print(f"{args.requests} requests, 1 de cada {args.stall_every} se cuelga {args.stall}s\n")
+    print(f"{'modo':<10} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'max (s)':>8}")
+    for hedge in (False, True):
+        server.count = 0
+        latencies = []
+        for _ in range(args.requests):
+            start = time.monotonic()
+            scraper.get_html(f'{base}/pagina', hedge=hedge)
+            latencies.append(time.monotonic() - start)
+        label = 'hedge' if hedge else 'sin hedge'
+        print(f"{label:<10} {percentile(latencies, 50):>8.3f} {percentile(latencies, 95):>8.3f} "
+              f"{percentile(latencies, 99):>8.3f} {max(latencies):>8.3f}")
+    print(f"hedges: {domain_latency.stats()['hedges']}")
+
+    print("\nSitio caído (503), 5 intentos:")
+    for budget in (None, 2.5):
+        circuit_breakers.reset()    # medir los reintentos, no el circuito
+        start = time.monotonic()
+        deadline = time.monotonic() + budget if budget else None
+        try:
+            scraper.get_html(f'{base}/fail', retry=5, deadline=deadline)
+        except Exception:
+            pass
+        label = f'deadline {budget}s' if budget else 'sin deadline'
+        print(f"  {label:<14} se rindió a los {time.monotonic() - start:.2f}s")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tabla de substrings por scraper vs registro de hosters
+Uso: python benchmarks/bench_hosters.py [--urls 200000] [--domains 400]
+
+Además del tiempo cuenta cuántos nombres distintos salen para el mismo
+hoster: con las tablas viejas "Voe", "voe" y la key cruda conviven.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.scrapers.hosters import detect_hoster, _match, _ALIASES
+
+# Tabla de PelisPlusHDScraper._detect_server (la más completa)
+LEGACY_SERVERS = {
+    'streamwish': 'StreamWish', 'hgplaycdn': 'StreamWish', 'vidhide': 'VidHide',
+    'filelions': 'VidHide', 'voe.sx': 'Voe', 'voe': 'Voe', 'streamtape': 'StreamTape',
+    'filemoon': 'FileMoon', 'waaw': 'Waaw', 'netu': 'Netu', 'fembed': 'Fembed',
+    'watchsb': 'StreamSB', 'streamsb': 'StreamSB', 'streamlare': 'StreamLare',
+    'doodstream': 'DoodStream', 'dood': 'DoodStream', 'mixdrop': 'MixDrop',
+    'upstream': 'UpStream'
+}
+# Tabla de PeliCineHD/Cuevana
+LEGACY_SMALL = {k: k for k in ('voe', 'streamwish', 'filemoon', 'vidhide', 'streamtape')}
+
+HOSTS = ['streamwish', 'hgplaycdn', 'vidhide', 'filelions', 'voe', 'streamtape',
+         'filemoon', 'waaw', 'netu', 'doodstream', 'dood', 'mixdrop', 'okru', 'uqload']
+TLDS = ['com', 'to', 'sx', 'net', 'io', 'pro', 'watch']
+
+
+def legacy_detect(url, table):
+    url_lower = url.lower()
+    for key, name in table.items():
+        if key in url_lower:
+            return name
+    return 'Desconocido'
+
+
+def build_corpus(n, domains):
+    rng = random.Random(42)
+    hosts = [
+        f"{rng.choice(['', 'www.', 'cdn'])}{rng.choice(HOSTS)}{rng.choice(['', str(rng.randint(1, 9))])}.{rng.choice(TLDS)}"
+        for _ in range(domains)
+    ]
+    corpus = []
+    for i in range(n):
+        host = rng.choice(hosts)
+        # Query con otro dominio: la tabla vieja se confunde, el registro no
+        query = f"?ref=streamtape.com&t={i}" if rng.random() < 0.1 else ''
+        scheme = rng.choice(['https:', 'http:', ''])
+        corpus.append(f"{scheme}//{host}/e/{rng.getrandbits(40):x}{query}")
+    return corpus
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    names = [fn(url) for url in corpus]
+    return time.perf_counter() - start, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Clasificación de hosters')
+    parser.add_argument('--urls', type=int, default=200000)
+    parser.add_argument('--domains', type=int, default=400, help='hosts distintos en el corpus')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.urls, args.domains)
+    _match.cache_clear()
+
+    rows = [
+        ('tabla PelisPlusHD', lambda u: legacy_detect(u, LEGACY_SERVERS)),
+        ('tabla PeliCine/Cuevana', lambda u: legacy_detect(u, LEGACY_SMALL)),
+        # Mismo barrido lineal con todos los alias del registro: crece con la tabla
+        ('tabla lineal completa', lambda u: legacy_detect(u, _ALIASES)),
+        ('registro (hosters.py)', detect_hoster),
+    ]
+
+    print(f"{args.urls} URLs, {args.domains} hosts distintos\n")
+    print(f"{'método':<24} {'tiempo (s)':>10} {'µs/URL':>8} {'nombres':>8}")
+    results = {}
+    for label, fn in rows:
+        elapsed, names = timed(fn, corpus)
+        results[label] = names
+        print(f"{label:<24} {elapsed:>10.3f} {elapsed / args.urls * 1e6:>8.2f} {len(set(names)):>8}")
+
+    # URLs donde la tabla vieja clasificó por el query en lugar del host
+    wrong = sum(
+        1 for old, new in zip(results['tabla PelisPlusHD'], results['registro (hosters.py)'])
+        if old != new
+    )
+    print(f"\nDiferencias tabla PelisPlusHD vs registro: {wrong} "
+          f"({wrong / args.urls:.1%}, matches en path/query o variantes no registradas)")
+    info = _match.cache_info()
+    print(f"Cache de hosts: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parseo de páginas de cada sitio (html.parser completo vs lxml
+completo vs parse_targets con SoupStrainer).
+
+Por defecto usa benchmarks/fixtures/<sitio>.html, que son páginas
+SINTÉTICAS (los nodos del reproductor que lee cada scraper más relleno
+generado: metas, hojas de estilo, tarjetas), no capturas de los sitios.
+Con ellas los números solo comparan los métodos entre sí; para medir el
+costo real hay que pasar páginas guardadas de cada sitio con --fixtures
+(curl ... > DIR/pelisplushd.html). Ver fixtures/README.md.
+Reporta tiempo mediano por página, pico de memoria (tracemalloc) y verifica
+que extract_links() devuelva los mismos links con ambos caminos.
+
+Uso: python benchmarks/bench_html_parse.py [--runs 30] [--fixtures DIR]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from services.scrapers import base_scraper
+from services.scrapers import PelisPlusHDScraper, PeliCineHDScraper, CuevanaScraper
+from services.scrapers.pelisplushd import PLAYURL_STRAINER
+from services.scrapers.pelicinehd import PLAYER_STRAINER
+from services.scrapers.cuevana import IFRAME_STRAINER
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SITES = [
+    ('pelisplushd', PelisPlusHDScraper, PLAYURL_STRAINER),
+    ('pelicinehd', PeliCineHDScraper, PLAYER_STRAINER),
+    ('cuevana', CuevanaScraper, IFRAME_STRAINER),
+]
+
+
+def measure(fn, runs):
+    """(mediana en ms, pico de memoria en KB)"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024
+
+
+def extract(scraper_cls, html, parser):
+    """extract_links() sobre el fixture, forzando el parser de BaseScraper"""
+    previous = base_scraper.FAST_PARSER
+    base_scraper.FAST_PARSER = parser
+    try:
+        scraper = scraper_cls()
+        scraper.get_html = lambda url, **kwargs: html
+        return scraper.extract_links(f'https://{scraper_cls.__name__.lower()}.example/pelicula/x')
+    finally:
+        base_scraper.FAST_PARSER = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parseo de HTML de los scrapers')
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    if os.path.abspath(args.fixtures) == os.path.abspath(DEFAULT_FIXTURES):
+        print("Fixtures sintéticos: los tiempos comparan métodos, no predicen el costo con páginas reales\n")
+    print(f"{'sitio':<12} {'método':<22} {'ms/página':>10} {'pico KB':>9}")
+    for name, scraper_cls, strainer in SITES:
+        path = os.path.join(args.fixtures, f'{name}.html')
+        if not os.path.exists(path):
+            print(f"{name:<12} (sin fixture en {path})")
+            continue
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        variants = [
+            ('html.parser completo', lambda: BeautifulSoup(html, 'html.parser')),
+            ('lxml completo', lambda: BeautifulSoup(html, 'lxml')),
+            ('parse_targets (lxml)', lambda: BeautifulSoup(html, 'lxml', parse_only=strainer)),
+        ]
+        for label, fn in variants:
+            ms, peak_kb = measure(fn, args.runs)
+            print(f"{name:<12} {label:<22} {ms:>10.2f} {peak_kb:>9.0f}")
+
+        before = extract(scraper_cls, html, 'html.parser')
+        after = extract(scraper_cls, html, 'lxml')
+        same = before['links'] == after['links']
+        print(f"{name:<12} links: {after['total']} ({'iguales' if same else 'DISTINTOS'} al parseo completo)\n")
+
+
+if __name__ == '__main__':
+    main()
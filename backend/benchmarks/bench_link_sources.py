@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuentes de links en secuencia vs LinkExtractor.run en paralelo.
+
+Las fuentes son simuladas (sleep + resultado) con tiempos parecidos a los
+reales: ZonaHack por Listen, TMDB + PelisPlusHD, y un escenario donde la
+primera fuente falla tarde (el peor caso de la cadena secuencial).
+
+Uso: python benchmarks/bench_link_sources.py [--scale 0.1]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.link_extractor import link_extractor, MODE_FIRST, MODE_MERGE
+
+
+def source(seconds, links=0, fail=False):
+    def run():
+        time.sleep(seconds)
+        if fail:
+            raise TimeoutError(f'sin respuesta en {seconds:.1f}s')
+        return {
+            'success': links > 0,
+            'links': [{'server': 'Voe', 'url': f'https://voe.sx/e/{seconds}-{i}', 'language': 'Latino'}
+                      for i in range(links)],
+            'total': links
+        }
+    return run
+
+
+def sequential(sources):
+    """Lo que hacía /api/links: probar una fuente tras otra"""
+    for name, fn in sources:
+        try:
+            result = fn()
+        except Exception:
+            continue
+        if result.get('success'):
+            return name
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuentes de links: secuencial vs paralelo')
+    parser.add_argument('--scale', type=float, default=0.1, help='factor sobre los tiempos reales (1 = segundos reales)')
+    args = parser.parse_args()
+    k = args.scale
+
+    scenarios = {
+        'zonahack ok': [
+            ('gist_zonahack', source(4 * k, links=18)),
+            ('auto_pelisplushd', source((0.3 + 2) * k, links=10)),
+        ],
+        'zonahack falla tarde': [
+            ('gist_zonahack', source(25 * k, fail=True)),
+            ('auto_pelisplushd', source((0.3 + 6) * k, links=10)),
+        ],
+        'ninguna responde': [
+            ('gist_zonahack', source(25 * k, fail=True)),
+            ('auto_pelisplushd', source((5 + 40) * k, fail=True)),
+        ],
+    }
+    deadline = 25 * k
+
+    print(f"Tiempos escalados x{k}, deadline {deadline:.2f}s\n")
+    print(f"{'escenario':<22} {'secuencial':>11} {'first':>8} {'merge':>8}  fuente (first)")
+    for label, sources in scenarios.items():
+        start = time.perf_counter()
+        sequential(sources)
+        seq = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = link_extractor.run(sources, mode=MODE_FIRST, deadline=time.monotonic() + deadline)
+        first_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        link_extractor.run(sources, mode=MODE_MERGE, deadline=time.monotonic() + deadline)
+        merge_s = time.perf_counter() - start
+
+        print(f"{label:<22} {seq:>10.2f}s {first_s:>7.2f}s {merge_s:>7.2f}s  {first['source'] or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: consultas calientes sobre links con y sin los índices de la
+migración 3, con un millón de links.
+
+Arma la BD en la versión 2 (sin índices), mide, aplica la migración 3,
+vuelve a medir y corre check_query_plans(). Sale con código 1 si alguna
+consulta no usa su índice (sirve como chequeo de regresión).
+
+Uso: python benchmarks/bench_links_indexes.py [--links 1000000] [--series 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database
+from config import config
+
+QUERIES = {
+    'listado /series (página)': ('''
+        SELECT s.*, GROUP_CONCAT(l.url, '||') as links
+        FROM series s
+        LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
+        GROUP BY s.id
+        LIMIT 20 OFFSET ?
+    ''', lambda n: (random.randint(0, n - 20),)),
+    'detalle /series/<id>': ('''
+        SELECT s.*, GROUP_CONCAT(l.url, '||') as links
+        FROM series s
+        LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
+        WHERE s.id = ?
+        GROUP BY s.id
+    ''', lambda n: (random.randint(1, n),)),
+    'links de un episodio': ('''
+        SELECT url FROM links
+        WHERE content_type = 'series' AND content_id = ? AND season = 1 AND episode = 3
+    ''', lambda n: (random.randint(1, n),)),
+    'COUNT(*) por estado': (
+        "SELECT COUNT(*) FROM links WHERE status = 'broken'", lambda n: ()
+    ),
+}
+
+
+def seed(conn, links, series):
+    conn.executemany(
+        'INSERT INTO series (tmdb_id, title, rating, year) VALUES (?, ?, ?, ?)',
+        ((i, f'Serie {i}', 7.0, 2020) for i in range(series))
+    )
+    per_series = max(1, links // series)
+    conn.executemany(
+        'INSERT INTO links (content_id, content_type, url, source, season, episode, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ((i // per_series + 1, 'series', f'https://voe.sx/e/{i}', 'zonahack', 1, i % per_series,
+          'broken' if i % 20 == 0 else 'active') for i in range(links))
+    )
+    conn.commit()
+
+
+def measure(conn, series, repeat):
+    results = {}
+    for label, (sql, params) in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params(series)).fetchall()
+        results[label] = (time.perf_counter() - start) / repeat * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Índices de links: antes/después de la migración 3')
+    parser.add_argument('--links', type=int, default=1_000_000)
+    parser.add_argument('--series', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config.DATABASE_PATH = os.path.join(tmpdir, 'content.db')
+        conn = database.connect()
+        database.migrate(conn, target=2)
+
+        start = time.perf_counter()
+        seed(conn, args.links, args.series)
+        print(f"{args.links:,} links / {args.series:,} series cargados en {time.perf_counter() - start:.1f}s\n")
+
+        before = measure(conn, args.series, args.repeat)
+        start = time.perf_counter()
+        database.migrate(conn)
+        migration = time.perf_counter() - start
+        after = measure(conn, args.series, args.repeat)
+
+        print(f"{'consulta':<28} {'v2 (ms)':>10} {'v3 (ms)':>10} {'mejora':>8}")
+        for label in QUERIES:
+            print(f"{label:<28} {before[label]:>10.2f} {after[label]:>10.2f} {before[label] / max(after[label], 1e-6):>7.0f}x")
+        print(f"\nmigración 3 (crear índices): {migration:.1f}s")
+
+        problems = database.check_query_plans(conn)
+        for name, plan in problems.items():
+            print(f"✗ {name} no usa su índice: {plan}")
+        conn.close()
+        if problems:
+            sys.exit(1)
+        print(f"✓ EXPLAIN QUERY PLAN: {len(database.HOT_QUERIES)} consultas usan sus índices")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dict sin límite (memory_cache original) vs MemoryCache LRU+TTL
+Mide RSS tras cargar N temporadas sintéticas y la latencia de lookup.
+Cada variante corre en un subproceso propio para que el RSS sea comparable.
+
+Uso: python benchmarks/bench_memory_cache.py [--keys 20000] [--budget-mb 64]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.cache import MemoryCache
+
+
+class LegacyDictCache:
+    """Copia de get_from_cache/set_cache antes del cambio"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        if key in self.data:
+            cache_data = self.data[key]
+            if datetime.now() < cache_data['expires']:
+                return cache_data['data']
+            del self.data[key]
+        return None
+
+    def set(self, key, value, ttl_seconds):
+        self.data[key] = {'data': value, 'expires': datetime.now() + timedelta(seconds=ttl_seconds)}
+
+
+def synthetic_season(i):
+    """Temporada con ~10 episodios x 6 links, como la cachea /api/series/<id>/links"""
+    return {
+        'source': 'gist_zonahack',
+        'episodes': [
+            {
+                'episode': ep,
+                'links': [
+                    {'server': host, 'url': f'https://{host}.example/e/{i}-{ep}-{n}', 'language': lang}
+                    for n, (host, lang) in enumerate([
+                        ('voe', 'Latino'), ('streamwish', 'Latino'), ('filemoon', 'Castellano'),
+                        ('vidhide', 'Castellano'), ('streamtape', 'Subtitulado'), ('doodstream', 'Subtitulado')
+                    ])
+                ],
+                'total': 6
+            }
+            for ep in range(1, 11)
+        ],
+        'cache_time': 3.2
+    }
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(variant, keys, budget_mb, lookups):
+    random.seed(7)
+    if variant == 'dict':
+        cache = LegacyDictCache()
+    else:
+        cache = MemoryCache(max_bytes=budget_mb * 1024 * 1024)
+
+    base_rss = rss_mb()
+    for i in range(keys):
+        cache.set(f'series_{i}_s1', synthetic_season(i), ttl_seconds=1800)
+    loaded_rss = rss_mb()
+
+    # 80% de las lecturas van al 20% más reciente (patrón "estreno")
+    hot = max(1, keys // 5)
+    samples = []
+    for _ in range(lookups):
+        i = random.randint(keys - hot, keys - 1) if random.random() < 0.8 else random.randint(0, keys - 1)
+        start = time.perf_counter()
+        cache.get(f'series_{i}_s1')
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+
+    result = {
+        'variant': variant,
+        'rss_mb': round(loaded_rss - base_rss, 1),
+        'p50_us': round(statistics.median(samples), 2),
+        'p99_us': round(samples[int(len(samples) * 0.99) - 1], 2)
+    }
+    if variant == 'lru':
+        stats = cache.stats()
+        result.update({'entries': stats['entries'], 'evictions': stats['evictions'],
+                       'hit_rate': stats['hit_rate']})
+    else:
+        result['entries'] = len(cache.data)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='dict vs MemoryCache')
+    parser.add_argument('--keys', type=int, default=20000)
+    parser.add_argument('--budget-mb', type=int, default=64)
+    parser.add_argument('--lookups', type=int, default=200000)
+    parser.add_argument('--variant', choices=['dict', 'lru'])
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.keys, args.budget_mb, args.lookups)
+        return
+
+    print(f"{args.keys} temporadas sintéticas, presupuesto LRU {args.budget_mb} MB\n")
+    print(f"{'variante':<8} {'RSS (MB)':>9} {'entradas':>9} {'p50 (µs)':>9} {'p99 (µs)':>9}  extra")
+    for variant in ('dict', 'lru'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--variant', variant, '--keys', str(args.keys),
+             '--budget-mb', str(args.budget_mb), '--lookups', str(args.lookups)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        row = json.loads(output)
+        extra = ''
+        if variant == 'lru':
+            extra = f"evictions={row['evictions']} hit_rate={row['hit_rate']}"
+        print(f"{variant:<8} {row['rss_mb']:>9} {row['entries']:>9} {row['p50_us']:>9} {row['p99_us']:>9}  {extra}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tasa de aciertos del cache de links para pedidos interactivos
+sobre el catálogo verificado, con y sin PreWarmer.
+
+Tiempos escalados: las entradas viven --ttl segundos, un scrape tarda
+--scrape segundos y los pedidos llegan al azar sobre --titles títulos.
+El pre-calentado corre cada ttl/6 segundos (como 5 min sobre 30).
+
+Uso: python benchmarks/bench_prewarm.py [--titles 60] [--seconds 12]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.cache import MemoryCache
+from services.prewarmer import PreWarmer, WarmTarget
+
+
+def simulate(args, prewarm):
+    cache = MemoryCache()
+    scrapes = {'interactive': 0, 'prewarm': 0}
+
+    def scrape(key, who):
+        time.sleep(args.scrape)
+        scrapes[who] += 1
+        cache.set(key, {'success': True, 'links': [key]}, ttl_seconds=args.ttl)
+        return {'success': True}
+
+    keys = [f'links_{i}' for i in range(args.titles)]
+    stop = threading.Event()
+    if prewarm:
+        warmer = PreWarmer(
+            cache,
+            lambda: [WarmTarget(key, 'zonahack', lambda key=key: scrape(key, 'prewarm')) for key in keys],
+            budget_seconds=args.ttl / 3,
+            max_refreshes=args.titles,
+            refresh_before=args.ttl / 3,
+            rate_per_second=args.rate
+        )
+
+        def loop():
+            while not stop.is_set():
+                warmer.run()
+                stop.wait(args.ttl / 6)
+        threading.Thread(target=loop, daemon=True).start()
+        time.sleep(args.ttl / 3)  # primera corrida antes del tráfico
+
+    hits = misses = 0
+    waited = 0.0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        key = random.choice(keys)
+        start = time.monotonic()
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            misses += 1
+            scrape(key, 'interactive')
+        waited += time.monotonic() - start
+        time.sleep(args.interval)
+    stop.set()
+    total = hits + misses
+    return hits / total, waited / total, scrapes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hit rate con y sin pre-calentado')
+    parser.add_argument('--titles', type=int, default=60)
+    parser.add_argument('--seconds', type=float, default=12)
+    parser.add_argument('--ttl', type=float, default=3.0)
+    parser.add_argument('--scrape', type=float, default=0.01)
+    parser.add_argument('--interval', type=float, default=0.01, help='segundos entre pedidos')
+    parser.add_argument('--rate', type=float, default=100, help='refrescos/s por upstream')
+    args = parser.parse_args()
+
+    print(f"{args.titles} títulos, TTL {args.ttl}s, scrape {args.scrape * 1000:.0f} ms, {args.seconds}s de tráfico\n")
+    print(f"{'modo':<16} {'hit rate':>9} {'espera media (ms)':>18} {'scrapes inter.':>15} {'scrapes pre.':>13}")
+    for prewarm in (False, True):
+        rate, wait, scrapes = simulate(args, prewarm)
+        label = 'con prewarm' if prewarm else 'sin prewarm'
+        print(f"{label:<16} {rate:>8.1%} {wait * 1000:>18.1f} {scrapes['interactive']:>15} {scrapes['prewarm']:>13}")
+
+
+if __name__ == '__main__':
+    main()
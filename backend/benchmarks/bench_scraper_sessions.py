@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: un scraper nuevo por pedido (sesión nueva, handshake TLS cada
+vez) vs el scraper compartido de scraper_registry (conexiones reutilizadas).
+
+Levanta un servidor HTTPS local con un certificado autofirmado generado
+con el openssl del sistema (si no hay openssl, usa HTTP y solo se ve el
+costo de TCP). Cuenta las conexiones TCP que recibe el servidor y
+comprueba que después de un fork el hijo arma su propia sesión.
+
+Uso: python benchmarks/bench_scraper_sessions.py [--requests 200] [--threads 8]
+"""
+import argparse
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.scrapers import CuevanaScraper, scraper_registry
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = b'<html><iframe src="https://voe.sx/e/1"></iframe></html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(tmpdir):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    scheme = 'http'
+    if shutil.which('openssl'):
+        cert, key = os.path.join(tmpdir, 'cert.pem'), os.path.join(tmpdir, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+             '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+             '-keyout', key, '-out', cert],
+            check=True, capture_output=True
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        # get_html verifica certificados: requests toma el CA de esta variable
+        os.environ['REQUESTS_CA_BUNDLE'] = cert
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'{scheme}://127.0.0.1:{server.server_address[1]}/pelicula'
+
+
+def run(fn, requests_count, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: fn(), range(requests_count)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sesión por pedido vs sesión compartida')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server, url = start_server(tmpdir)
+        print(f"{args.requests} pedidos a {url.split(':')[0].upper()} local, {args.threads} hilos\n")
+        print(f"{'modo':<22} {'total (s)':>10} {'por pedido (ms)':>16} {'conexiones TCP':>15}")
+
+        modes = {
+            'scraper por pedido': lambda: CuevanaScraper().get_html(url, hedge=False),
+            'scraper_registry': lambda: scraper_registry.get(CuevanaScraper).get_html(url, hedge=False),
+        }
+        for label, fn in modes.items():
+            server.connections = 0
+            total = run(fn, args.requests, args.threads)
+            print(f"{label:<22} {total:>10.2f} {total / args.requests * 1000:>16.2f} {server.connections:>15}")
+
+        if hasattr(os, 'fork'):
+            parent = scraper_registry.get(CuevanaScraper)
+            pid = os.fork()
+            if pid == 0:
+                child = scraper_registry.get(CuevanaScraper)
+                child.get_html(url, hedge=False)
+                os._exit(0 if child is not parent else 1)
+            _, status = os.waitpid(pid, 0)
+            ok = os.waitstatus_to_exitcode(status) == 0
+            print(f"\nfork: el hijo {'creó su propia instancia' if ok else 'REUTILIZÓ la del padre'}")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: búsqueda local LIKE '%q%' (la de antes) vs índice FTS5
+(database.search) a medida que crece el catálogo.
+
+Títulos y descripciones sintéticos (relleno + palabras en español, con
+y sin acentos). La columna "aciertos" muestra cuántas filas encuentra
+cada método para "pelicula" (LIKE no encuentra "película"). FTS5 ordena
+por bm25 todas las coincidencias: su costo crece con los aciertos, no
+con el tamaño de la tabla.
+
+Uso: python benchmarks/bench_search_fts.py [--sizes 1000,10000,100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database
+from config import config
+
+WORDS = ['película', 'pelicula', 'acción', 'drama', 'comedia', 'terror', 'noche', 'ciudad',
+         'última', 'misión', 'corazón', 'guerra', 'amor', 'sombra', 'camino', 'río', 'estrella',
+         'destino', 'secreto', 'fuego', 'mar', 'invierno', 'jardín', 'lección', 'ladrón']
+QUERIES = ['pelicula', 'mision imposible', 'corazon de fuego', 'ladr']
+
+
+# Vocabulario de relleno: palabras inventadas, como nombres propios y
+# términos poco repetidos de un catálogo real
+FILLER = [''.join(random.choice('abcdefghijlmnoprstuv') for _ in range(random.randint(4, 9)))
+          for _ in range(20000)]
+
+
+def phrase(count):
+    # ~1 de cada 40 palabras sale de WORDS: las búsquedas son selectivas
+    words = [random.choice(WORDS) if random.random() < 0.025 else random.choice(FILLER)
+             for _ in range(count)]
+    return ' '.join(words).capitalize()
+
+
+def like_search(conn, text, limit=10):
+    return conn.execute(
+        'SELECT * FROM movies WHERE title LIKE ? OR description LIKE ? LIMIT ?',
+        (f'%{text}%', f'%{text}%', limit)
+    ).fetchall()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LIKE vs FTS5 en la búsqueda local')
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'películas':>10} {'LIKE (ms)':>10} {'FTS5 (ms)':>10} {'aciertos LIKE':>14} {'aciertos FTS5':>14}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        random.seed(size)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config.DATABASE_PATH = os.path.join(tmpdir, 'content.db')
+            conn = database.connect()
+            database.migrate(conn)
+            conn.executemany(
+                'INSERT INTO movies (title, description) VALUES (?, ?)',
+                ((phrase(3), phrase(25)) for _ in range(size))
+            )
+            conn.commit()
+
+            like_ms = timed(lambda q: like_search(conn, q), args.repeat)
+            fts_ms = timed(lambda q: database.search(conn, 'movies', q, limit=10), args.repeat)
+            like_hits = len(like_search(conn, 'pelicula', limit=size))
+            fts_hits = len(database.search(conn, 'movies', 'pelicula', limit=size))
+            conn.close()
+        print(f"{size:>10,} {like_ms:>10.2f} {fts_ms:>10.2f} {like_hits:>14,} {fts_hits:>14,}")
+
+
+if __name__ == '__main__':
+    main()
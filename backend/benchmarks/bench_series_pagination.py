@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /series por página con LIMIT/OFFSET sobre el GROUP BY (como
+antes) vs keyset con next_cursor, y COUNT(*) vs el contador por trigger.
+
+El keyset pasa por la ruta real (cliente de prueba de Flask); el cursor
+de la página N se arma con la última fila de la página N-1.
+
+Uso: python benchmarks/bench_series_pagination.py [--series 200000] [--pages 1,100,1000,9000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask
+
+import database
+from config import config
+from routes import series_bp
+from routes.series import _encode_cursor
+
+PER_PAGE = 20
+
+OFFSET_QUERY = '''
+    SELECT s.*, GROUP_CONCAT(l.url, '||') as links
+    FROM series s
+    LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
+    GROUP BY s.id
+    LIMIT ? OFFSET ?
+'''
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/series: OFFSET vs keyset')
+    parser.add_argument('--series', type=int, default=200_000)
+    parser.add_argument('--links', type=int, default=3, help='links por serie')
+    parser.add_argument('--pages', default='1,100,1000,9000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config.DATABASE_PATH = os.path.join(tmpdir, 'content.db')
+        database.init_db()
+        conn = database.get_connection()
+        conn.executemany(
+            'INSERT INTO series (tmdb_id, title, rating) VALUES (?, ?, ?)',
+            ((i, f'Serie {i}', round(random.uniform(1, 9), 1)) for i in range(args.series))
+        )
+        conn.executemany(
+            "INSERT INTO links (content_id, content_type, url, source) VALUES (?, 'series', ?, 'zonahack')",
+            ((i // args.links + 1, f'https://voe.sx/e/{i}') for i in range(args.series * args.links))
+        )
+        conn.commit()
+
+        app = Flask(__name__)
+        app.register_blueprint(series_bp)
+        database.init_app(app)
+        client = app.test_client()
+
+        print(f"{args.series:,} series, {args.series * args.links:,} links\n")
+        print(f"{'página':>7} {'OFFSET (ms)':>12} {'keyset id (ms)':>15} {'keyset rating (ms)':>19}")
+        for page in (int(p) for p in args.pages.split(',')):
+            offset = (page - 1) * PER_PAGE
+            offset_ms = timed(lambda: conn.execute(OFFSET_QUERY, (PER_PAGE, offset)).fetchall(), args.repeat)
+
+            results = {}
+            for sort, order_by in (('id', 'id'), ('rating', 'IFNULL(rating, -1) DESC, id DESC')):
+                query = {'sort': sort}
+                if page > 1:
+                    last = conn.execute(
+                        f'SELECT id, rating FROM series ORDER BY {order_by} LIMIT 1 OFFSET ?', (offset - 1,)
+                    ).fetchone()
+                    query['cursor'] = _encode_cursor(sort, last)
+                results[sort] = timed(lambda: client.get('/series', query_string=query), args.repeat)
+            print(f"{page:>7} {offset_ms:>12.2f} {results['id']:>15.2f} {results['rating']:>19.2f}")
+
+        count_ms = timed(lambda: conn.execute('SELECT COUNT(*) FROM series').fetchone(), args.repeat * 10)
+        counter_ms = timed(lambda: database.count_rows(conn, 'series'), args.repeat * 10)
+        print(f"\ntotal: COUNT(*) {count_ms:.3f} ms vs contador {counter_ms:.3f} ms "
+              f"({database.count_rows(conn, 'series'):,} series)")
+
+
+if __name__ == '__main__':
+    main()
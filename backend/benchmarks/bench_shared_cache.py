@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scrapes duplicados entre workers según el backend de cache.
+
+Simula W procesos (workers de gunicorn) que reciben pedidos aleatorios
+sobre K temporadas. Cada miss cuenta como un scrape a ZonaHack. Con el
+backend memory cada worker scrapea por su cuenta; con sqlite/redis el
+primero que scrapea deja el resultado para todos.
+
+Uso: python benchmarks/bench_shared_cache.py [--workers 4] [--keys 200]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.cache import MemoryCache, SQLiteCache, RedisCache
+from fake_redis import FakeRedisServer
+
+
+def make_backend(kind, sqlite_path, redis_url):
+    if kind == 'sqlite':
+        return SQLiteCache(sqlite_path)
+    if kind == 'redis':
+        return RedisCache(redis_url)
+    return MemoryCache()
+
+
+def worker(kind, sqlite_path, redis_url, keys, requests_per_worker, seed, scrapes):
+    cache = make_backend(kind, sqlite_path, redis_url)
+    rng = random.Random(seed)
+    local_scrapes = 0
+    for _ in range(requests_per_worker):
+        key = f'series_{rng.randint(1, keys)}_s1'
+        if cache.get(key) is None:
+            local_scrapes += 1
+            time.sleep(0.001)  # "scrape"
+            cache.set(key, {'source': 'gist_zonahack', 'episodes': [{'episode': 1, 'links': []}]}, 1800)
+    with scrapes.get_lock():
+        scrapes.value += local_scrapes
+
+
+def run(kind, args, redis_url):
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = os.path.join(tmp, 'cache.db')
+        scrapes = multiprocessing.Value('i', 0)
+        start = time.perf_counter()
+        procs = [
+            multiprocessing.Process(
+                target=worker,
+                args=(kind, sqlite_path, redis_url, args.keys, args.requests, seed, scrapes)
+            )
+            for seed in range(args.workers)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return scrapes.value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='memory vs sqlite vs redis entre workers')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--keys', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000, help='pedidos por worker')
+    args = parser.parse_args()
+
+    server = FakeRedisServer().start_background()
+
+    print(f"{args.workers} workers x {args.requests} pedidos sobre {args.keys} temporadas\n")
+    print(f"{'backend':<8} {'scrapes':>8} {'por key':>8} {'tiempo (s)':>11}")
+    for kind in ('memory', 'sqlite', 'redis'):
+        scrapes, elapsed = run(kind, args, server.url)
+        print(f"{kind:<8} {scrapes:>8} {scrapes / args.keys:>8.2f} {elapsed:>11.2f}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
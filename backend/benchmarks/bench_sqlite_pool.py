@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lecturas concurrentes con un escritor, conexión nueva por
+pedido (journal por defecto, como antes) vs database.get_connection
+(conexión por hilo, WAL y PRAGMAs).
+
+Los lectores corren la consulta del listado de /series; el escritor
+inserta links y cambia estados como el admin. Cada modo usa su propio
+archivo (WAL queda grabado en el archivo).
+
+Uso: python benchmarks/bench_sqlite_pool.py [--readers 8] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database
+from config import config
+
+LIST_QUERY = '''
+    SELECT s.*, GROUP_CONCAT(l.url, '||') as links
+    FROM series s
+    LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
+    WHERE s.id BETWEEN ? AND ?
+    GROUP BY s.id
+'''
+
+
+def legacy_connection():
+    """El get_connection de antes: conexión nueva, journal por defecto"""
+    conn = sqlite3.connect(database.get_db_path())
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def seed(mode, series_count, links_per_series):
+    database.init_db()
+    conn = sqlite3.connect(database.get_db_path())
+    if mode == 'legacy':
+        # init_db deja el archivo en WAL; antes quedaba con el journal por defecto
+        conn.execute('PRAGMA journal_mode=DELETE')
+    conn.executemany(
+        'INSERT INTO series (tmdb_id, title, description, rating, year) VALUES (?, ?, ?, ?, ?)',
+        [(i, f'Serie {i}', 'Descripción ' * 10, random.uniform(5, 9), 2000 + i % 25)
+         for i in range(series_count)]
+    )
+    conn.executemany(
+        'INSERT INTO links (content_id, content_type, url, source, season, episode) VALUES (?, ?, ?, ?, ?, ?)',
+        [(sid, 'series', f'https://voe.sx/e/{sid}-{n}', 'zonahack', 1, n)
+         for sid in range(1, series_count + 1) for n in range(links_per_series)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(get_connection, readers, seconds, series_count):
+    stop = threading.Event()
+    reads = [0] * readers
+    read_errors = [0]
+    writes = [0]
+    read_latency = []
+    lock = threading.Lock()
+
+    def reader(index):
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn = get_connection()
+                first = random.randint(1, series_count - 20)
+                conn.execute(LIST_QUERY, (first, first + 19)).fetchall()
+                conn.close()
+                reads[index] += 1
+                with lock:
+                    read_latency.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                with lock:
+                    read_errors[0] += 1
+
+    def writer():
+        while not stop.is_set():
+            conn = get_connection()
+            try:
+                sid = random.randint(1, series_count)
+                conn.execute(
+                    "INSERT INTO links (content_id, content_type, url, source) VALUES (?, 'series', ?, 'admin')",
+                    (sid, f'https://voe.sx/e/w{time.time_ns()}')
+                )
+                conn.execute("UPDATE links SET status = 'broken' WHERE content_id = ?", (sid,))
+                conn.commit()
+                writes[0] += 1
+            except sqlite3.OperationalError:
+                pass
+            finally:
+                conn.close()
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    read_latency.sort()
+    p99 = read_latency[int(len(read_latency) * 0.99) - 1] if read_latency else 0
+    return sum(reads) / seconds, p99, writes[0] / seconds, read_errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite: conexión por pedido vs pool por hilo + WAL')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--series', type=int, default=2000)
+    parser.add_argument('--links', type=int, default=10, help='links por serie')
+    args = parser.parse_args()
+
+    print(f"{args.readers} lectores + 1 escritor, {args.seconds}s, "
+          f"{args.series} series x {args.links} links\n")
+    print(f"{'modo':<10} {'lecturas/s':>11} {'p99 lectura (ms)':>17} {'escrituras/s':>13} {'errores lock':>13}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for mode, get_connection in (('legacy', legacy_connection), ('pool', database.get_connection)):
+            config.DATABASE_PATH = os.path.join(tmpdir, f'{mode}.db')
+            seed(mode, args.series, args.links)
+            reads, p99, writes, errors = run(get_connection, args.readers, args.seconds, args.series)
+            print(f"{mode:<10} {reads:>11.0f} {p99 * 1000:>17.2f} {writes:>13.0f} {errors:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: leer el long-poll de Firestore completo + regex vs parser
+incremental que corta en el CURRENT vs lectura directa por batchGet.
+
+Levanta benchmarks/fake_firestore.py, que manda el snapshot y después
+mantiene la conexión abierta --hold segundos (como el canal real), y lo
+usa también como emulador para batchGet (FIRESTORE_EMULATOR_HOST).
+
+Uso: python benchmarks/bench_zonahack_stream.py [--hold 5] [--docs 24] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import requests
+
+from config import config
+from services.scrapers import ZonaHackScraper
+from fake_firestore import FakeFirestoreServer, document_names
+
+
+def legacy_fetch(scraper, listen_url):
+    """Lo que hacía _extract_firestore_data: esperar la respuesta entera y usar regex"""
+    r = requests.get(listen_url, timeout=25)
+    r.raise_for_status()
+    return scraper._parse_documents_regex(scraper._clean_text_response(r.text))
+
+
+def timed(fn, runs):
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ZonaHack: long-poll completo vs streaming vs batchGet')
+    parser.add_argument('--hold', type=float, default=5.0, help='segundos de long-poll tras el snapshot')
+    parser.add_argument('--docs', type=int, default=24, help='documentos (episodios) en el snapshot')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    server = FakeFirestoreServer(hold=args.hold).start_background()
+    listen_url = server.listen_url('Serie', args.docs)
+    config.FIRESTORE_EMULATOR_HOST = server.emulator_host
+    names = document_names('Serie', args.docs)
+    scraper = ZonaHackScraper()
+
+    old_s, old = timed(lambda: legacy_fetch(scraper, listen_url), args.runs)
+    new_s, new = timed(lambda: scraper._extract_firestore_data(listen_url), args.runs)
+    get_s, direct = timed(lambda: scraper._fetch_documents(names, listen_url), args.runs)
+
+    print(f"{args.docs} documentos, long-poll de {args.hold}s\n")
+    print(f"{'método':<26} {'mediana (s)':>11} {'docs':>5}")
+    print(f"{'respuesta completa+regex':<26} {old_s:>11.3f} {len(old):>5}")
+    print(f"{'stream hasta CURRENT':<26} {new_s:>11.3f} {len(new):>5}")
+    print(f"{'batchGet':<26} {get_s:>11.3f} {len(direct):>5}")
+    print(f"\nMismo resultado: {'sí' if old == new == direct else 'NO'}")
+
+    # extract_links: documentos aprendidos del Listen -> batchGet; si el
+    # batchGet falla (documentos inexistentes) vuelve al Listen
+    learned = scraper.extract_links('', listen_url=listen_url)
+    again = scraper.extract_links('', listen_url=listen_url, document_names=learned['documents'])
+    broken = scraper.extract_links('', listen_url=listen_url, document_names=['projects/x/databases/(default)/documents/otra/1'])
+    print(f"extract_links: {learned['mode']} -> {again['mode']} ({again['total']} links), "
+          f"documentos inválidos -> {broken['mode']} ({broken['total']} links)")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Servidor falso del canal Listen de Firestore (WebChannel), en memoria.
+
+GET /channel?doc=<nombre>&n=<documentos> responde como el long-poll real:
+prefijo XSSI, frames con largo (ADD, documentChange..., CURRENT) y después
+deja la conexión abierta mandando "noop" hasta completar --hold segundos.
+
+POST /v1/<database>/documents:batchGet responde como la API REST (o el
+emulador, ver FIRESTORE_EMULATOR_HOST) con los mismos documentos.
+
+Sirve para medir ZonaHackScraper sin depender de zonahack.com.ar.
+
+Uso: python benchmarks/fake_firestore.py [--port 8790] [--hold 10]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+
+HOSTS = ['streamwish', 'filemoon', 'voe', 'vidhide', 'hgplaycdn', 'filelions']
+DATABASE = 'projects/zonahack-demo/databases/(default)'
+PROJECT = f'{DATABASE}/documents'
+_DOC_NAME_RE = re.compile(r'/peliculas/(.+)-(\d+)$')
+
+
+def build_document(name, index):
+    """Documento con el mismo formato que los de ZonaHack"""
+    def servers(lang):
+        return {
+            'mapValue': {'fields': {
+                host: {'stringValue': f'https://{host}.example/e/{index}-{lang}'}
+                for host in HOSTS
+            }}
+        }
+    return {
+        'name': f'{PROJECT}/peliculas/{name}-{index}',
+        'fields': {
+            'NOMBRE': {'stringValue': f'{name} 1x{index:02d} 🎬'},
+            'IDIOMAS': servers('lat'),
+            'SERVERCASTELLANO': servers('cas'),
+            'SERVERSUB': servers('sub'),
+        },
+        'createTime': '2024-01-01T00:00:00Z',
+        'updateTime': '2024-01-01T00:00:00Z'
+    }
+
+
+def document_names(name, count):
+    return [f'{PROJECT}/peliculas/{name}-{i}' for i in range(1, count + 1)]
+
+
+def encode_frame(messages, seq):
+    """[[seq, [msg]], ...] con el largo en unidades UTF-16 adelante"""
+    payload = json.dumps([[seq + i, [msg]] for i, msg in enumerate(messages)], ensure_ascii=False)
+    size = len(payload.encode('utf-16-le')) // 2
+    return f'{size}\n{payload}'.encode('utf-8')
+
+
+def listen_frames(name, count, target_id=2):
+    """Frames de un snapshot inicial completo"""
+    frames = [encode_frame([{'targetChange': {'targetChangeType': 'ADD', 'targetIds': [target_id]}}], 1)]
+    seq = 2
+    for i in range(1, count + 1):
+        frames.append(encode_frame([{'documentChange': {
+            'document': build_document(name, i), 'targetIds': [target_id]
+        }}], seq))
+        seq += 1
+    frames.append(encode_frame([
+        {'targetChange': {'targetChangeType': 'CURRENT', 'targetIds': [target_id], 'resumeToken': 'CgkI'}},
+        {'targetChange': {'resumeToken': 'CgkI', 'readTime': '2024-01-01T00:00:00Z'}}
+    ], seq))
+    return frames
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        if not parsed.path.endswith('/documents:batchGet'):
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(self.server.latency)
+
+        response = []
+        for doc_name in body.get('documents', []):
+            match = _DOC_NAME_RE.search(doc_name)
+            if match:
+                response.append({'found': build_document(match.group(1), int(match.group(2))),
+                                 'readTime': '2024-01-01T00:00:00Z'})
+            else:
+                response.append({'missing': doc_name, 'readTime': '2024-01-01T00:00:00Z'})
+
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != '/channel':
+            self.send_error(404)
+            return
+        qs = parse_qs(parsed.query)
+        name = qs.get('doc', ['Serie'])[0]
+        count = int(qs.get('n', ['10'])[0])
+        time.sleep(self.server.latency)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/javascript; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        try:
+            self._chunk(b")]}'\n")
+            for frame in listen_frames(name, count):
+                time.sleep(self.server.frame_delay)
+                self._chunk(frame)
+            # Long-poll: el servidor real no cierra hasta que vence el hanging GET
+            end = time.monotonic() + self.server.hold
+            seq = count + 10
+            while time.monotonic() < end:
+                time.sleep(min(1.0, max(0.0, end - time.monotonic())))
+                self._chunk(encode_frame(['noop'], seq))
+                seq += 1
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # el cliente cortó apenas tuvo el CURRENT
+
+    def _chunk(self, data):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+
+class FakeFirestoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, hold=10.0, frame_delay=0.005, latency=0.05):
+        super().__init__((host, port), _Handler)
+        self.hold = hold
+        self.frame_delay = frame_delay
+        self.latency = latency
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def emulator_host(self):
+        """Valor para FIRESTORE_EMULATOR_HOST"""
+        host, port = self.server_address
+        return f'{host}:{port}'
+
+    def listen_url(self, name='Serie', count=10):
+        return f"{self.url}/channel?database={quote(DATABASE, safe='')}&doc={name}&n={count}"
+
+    def start_background(self):
+        """Arranca el servidor en un hilo daemon y devuelve self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Canal Listen de Firestore falso')
+    parser.add_argument('--port', type=int, default=8790)
+    parser.add_argument('--hold', type=float, default=10.0, help='segundos que se mantiene el long-poll')
+    args = parser.parse_args()
+    server = FakeFirestoreServer(port=args.port, hold=args.hold)
+    print(f"Fake Firestore escuchando en {server.listen_url()}")
+    print(f"FIRESTORE_EMULATOR_HOST={server.emulator_host}")
+    server.serve_forever()
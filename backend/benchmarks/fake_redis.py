@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Servidor falso que habla el protocolo de Redis (RESP), en memoria.
+Implementa lo que usa services/cache/redis.py: PING, AUTH, SELECT, GET,
+SET [PX|EX], DEL y PTTL. Sirve para probar RedisCache sin un Redis real.
+
+Uso: python benchmarks/fake_redis.py [--port 6390]
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self.data[key]
+                return None
+            return value
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            self.wfile.write(self._dispatch(args))
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if line[:1] != b'*':
+            raise ValueError('Se esperaba un array RESP')
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = self.rfile.readline()
+            length = int(header[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _dispatch(self, args):
+        store = self.server.store
+        command = args[0].upper()
+
+        if command in (b'PING', b'AUTH', b'SELECT'):
+            return b'+OK\r\n' if command != b'PING' else b'+PONG\r\n'
+
+        if command == b'GET':
+            value = store.get(args[1])
+            if value is None:
+                return b'$-1\r\n'
+            return b'$%d\r\n%s\r\n' % (len(value), value)
+
+        if command == b'SET':
+            expires_at = None
+            if len(args) >= 5:
+                unit = args[3].upper()
+                amount = int(args[4])
+                seconds = amount / 1000 if unit == b'PX' else amount
+                expires_at = time.monotonic() + seconds
+            with store.lock:
+                store.data[args[1]] = (args[2], expires_at)
+            return b'+OK\r\n'
+
+        if command == b'DEL':
+            with store.lock:
+                removed = sum(1 for key in args[1:] if store.data.pop(key, None) is not None)
+            return b':%d\r\n' % removed
+
+        if command == b'PTTL':
+            if store.get(args[1]) is None:
+                return b':-2\r\n'
+            _, expires_at = store.data.get(args[1], (None, None))
+            if expires_at is None:
+                return b':-1\r\n'
+            return b':%d\r\n' % int((expires_at - time.monotonic()) * 1000)
+
+        return b'-ERR unknown command\r\n'
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _Handler)
+        self.store = _Store()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'redis://{host}:{port}/0'
+
+    def start_background(self):
+        """Arranca el servidor en un hilo daemon y devuelve self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Redis falso en memoria')
+    parser.add_argument('--port', type=int, default=6390)
+    args = parser.parse_args()
+    server = FakeRedisServer(port=args.port)
+    print(f"Fake Redis escuchando en {server.url}")
+    server.serve_forever()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,14 +8,58 @@ class Config:
     TMDB_API_KEY = os.getenv('TMDB_API_KEY')
     TMDB_BASE_URL = "https://api.themoviedb.org/3"
     TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
+    # Cache persistente de respuestas de TMDB (TTL por endpoint)
+    TMDB_CACHE_ENABLED = os.getenv('TMDB_CACHE_ENABLED', 'True') == 'True'
+    TMDB_CACHE_PATH = os.getenv(
+        'TMDB_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'data', 'tmdb_cache.db')
+    )
+    # Concurrencia de TMDBService.get_many_details
+    TMDB_BULK_WORKERS = int(os.getenv('TMDB_BULK_WORKERS', 8))
     
     DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'content.db')
     
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     DEBUG = os.getenv('DEBUG', 'False') == 'True'
     
+    # Cache de links/temporadas: memory (por worker), sqlite (compartido
+    # en el host, sobrevive reinicios) o redis
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_MAX_MB = int(os.getenv('CACHE_MAX_MB', 64))
+    CACHE_COMPRESS_MIN_KB = int(os.getenv('CACHE_COMPRESS_MIN_KB', 32))
+    CACHE_SQLITE_PATH = os.getenv(
+        'CACHE_SQLITE_PATH', os.path.join(os.path.dirname(__file__), 'data', 'cache.db')
+    )
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    # Locks de single-flight entre workers (solo con backend compartido)
+    SINGLEFLIGHT_LOCK_DIR = os.getenv(
+        'SINGLEFLIGHT_LOCK_DIR', os.path.join(tempfile.gettempdir(), 'yuubi-locks')
+    )
+    
+    # Lectura directa de documentos de ZonaHack (REST batchGet). Con
+    # FIRESTORE_EMULATOR_HOST (host:puerto) se apunta al emulador local.
+    FIRESTORE_API_KEY = os.getenv('FIRESTORE_API_KEY')
+    FIRESTORE_EMULATOR_HOST = os.getenv('FIRESTORE_EMULATOR_HOST')
+    
     SCRAPER_TIMEOUT = 10
     SCRAPER_RETRY_DAYS = 7
+    # Verificación periódica de links de la BD (0 = desactivada, solo a mano
+    # con el CLI)
+    LINK_VALIDATOR_INTERVAL_MINUTES = int(os.getenv('LINK_VALIDATOR_INTERVAL_MINUTES', 0))
+    LINK_VALIDATOR_LIMIT = int(os.getenv('LINK_VALIDATOR_LIMIT', 2000))
+    LINK_VALIDATOR_WORKERS = int(os.getenv('LINK_VALIDATOR_WORKERS', 16))
+    LINK_VALIDATOR_PER_HOST = int(os.getenv('LINK_VALIDATOR_PER_HOST', 4))
+    # Sin respuesta clara (timeout, 429/5xx): se reintenta a las N horas.
+    # Tras N fallos de conexión seguidos (DNS, host caído) el link es roto
+    LINK_VALIDATOR_RETRY_HOURS = int(os.getenv('LINK_VALIDATOR_RETRY_HOURS', 6))
+    LINK_VALIDATOR_MAX_CONNECT_FAILURES = int(os.getenv('LINK_VALIDATOR_MAX_CONNECT_FAILURES', 3))
+    
+    # Pre-calentado del cache de links del Gist (0 = desactivado). Corre en
+    # un solo worker: conviene con CACHE_BACKEND sqlite o redis
+    PREWARM_INTERVAL_MINUTES = int(os.getenv('PREWARM_INTERVAL_MINUTES', 0))
+    PREWARM_BUDGET_SECONDS = int(os.getenv('PREWARM_BUDGET_SECONDS', 120))
+    PREWARM_MAX_REFRESHES = int(os.getenv('PREWARM_MAX_REFRESHES', 50))
+    PREWARM_REFRESH_BEFORE_SECONDS = int(os.getenv('PREWARM_REFRESH_BEFORE_SECONDS', 600))
+    PREWARM_RATE_PER_SECOND = float(os.getenv('PREWARM_RATE_PER_SECOND', 1))
     
     LANGUAGE = 'es-ES'
     REGION = 'ES'
@@ -1,16 +1,42 @@
 import sqlite3
 import os
+import re
+import threading
 from config import config
 
+# PRAGMAs de cada conexión. WAL: los lectores no se bloquean mientras el
+# admin escribe; NORMAL es seguro con WAL (solo se puede perder la última
+# transacción ante un corte de luz, nunca corromper)
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -int(os.getenv('SQLITE_CACHE_KB', 16384))),         # KiB (negativo = tamaño, no páginas)
+    ('mmap_size', int(os.getenv('SQLITE_MMAP_MB', 128)) * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+)
+BUSY_TIMEOUT = 5            # segundos esperando un lock de escritura
+CACHED_STATEMENTS = 256     # sentencias preparadas que guarda cada conexión
+
 def get_db_path():
     db_dir = os.path.dirname(config.DATABASE_PATH)
     os.makedirs(db_dir, exist_ok=True)
     return config.DATABASE_PATH
 
 def init_db():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    
+    conn = connect()
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+
+# === Migraciones ===
+# La versión del esquema vive en PRAGMA user_version. Cada migración corre
+# una sola vez, en orden, dentro de su propia transacción (BEGIN IMMEDIATE:
+# si dos workers arrancan a la vez, el segundo espera y ya no la repite).
+# Para cambiar el esquema se AGREGA una migración al final, nunca se edita
+# una existente.
+
+def _create_base_tables(cursor):
     # Tabla de películas
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS movies (
@@ -70,15 +96,329 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+
+def _add_link_columns(cursor):
+    # BDs creadas antes de guardar la latencia del chequeo, y el idioma
+    # que /admin/add-link ya intentaba insertar
+    _add_column(cursor, 'links', 'check_latency_ms', 'INTEGER')
+    _add_column(cursor, 'links', 'language', 'TEXT')
+
+def _create_link_indexes(cursor):
+    # Links de un contenido (JOIN de /series, episodio puntual)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_links_content
+        ON links (content_type, content_id, season, episode)
+    ''')
+    # Conteos por estado (/admin/get-stats) y links a re-verificar
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_links_status
+        ON links (status, checked_at)
+    ''')
+
+# Tablas con búsqueda de texto: título pesa más que la descripción en bm25
+SEARCHABLE = {
+    'movies': {'columns': ('title', 'description'), 'weights': (10.0, 1.0)},
+    'series': {'columns': ('title', 'description'), 'weights': (10.0, 1.0)},
+}
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def _create_search_indexes(cursor):
+    # Índice FTS5 "external content": no duplica el texto, lo lee de la
+    # tabla original; los triggers lo mantienen al día. remove_diacritics 2
+    # hace que "pelicula" encuentre "película" (y al revés)
+    if not fts5_available(cursor.connection):
+        print("SQLite sin FTS5: la búsqueda local sigue con LIKE")
+        return
+    for table, spec in SEARCHABLE.items():
+        fts = f'{table}_fts'
+        columns = ', '.join(spec['columns'])
+        new_values = ', '.join(f'new.{c}' for c in spec['columns'])
+        old_values = ', '.join(f'old.{c}' for c in spec['columns'])
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {columns}, content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        # Indexar lo que ya estaba cargado
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+# Tablas cuyo total se mantiene por triggers (COUNT(*) recorre la tabla)
+COUNTED_TABLES = ('movies', 'series')
+
+def _create_counters_and_keyset_indexes(cursor):
+    # Ojo: INSERT OR REPLACE no dispara el trigger de DELETE (sin
+    # recursive_triggers) y descuadraría el contador; usar UPDATE o IGNORE
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_counts (
+            name TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table in COUNTED_TABLES:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO table_counts (name, total) VALUES (?, (SELECT COUNT(*) FROM {table}))',
+            (table,)
+        )
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table} BEGIN
+                UPDATE table_counts SET total = total + 1 WHERE name = '{table}';
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table} BEGIN
+                UPDATE table_counts SET total = total - 1 WHERE name = '{table}';
+            END
+        ''')
+    # Listado de /series por rating (keyset): las series sin rating van al final
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_series_rating
+        ON series (IFNULL(rating, -1), id)
+    ''')
+
+def _add_link_attempts(cursor):
+    # Último intento de chequeo (concluyente o no) y fallos de conexión
+    # seguidos; checked_at queda solo para resultados concluyentes
+    _add_column(cursor, 'links', 'last_attempt_at', 'TIMESTAMP')
+    _add_column(cursor, 'links', 'failed_checks', 'INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('UPDATE links SET last_attempt_at = checked_at WHERE last_attempt_at IS NULL')
+    # Links a re-verificar: del intento más viejo al más nuevo
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_links_last_attempt
+        ON links (last_attempt_at)
+    ''')
+
+MIGRATIONS = [
+    (1, 'tablas base', _create_base_tables),
+    (2, 'links: check_latency_ms y language', _add_link_columns),
+    (3, 'índices de links', _create_link_indexes),
+    (4, 'búsqueda FTS5 en movies y series', _create_search_indexes),
+    (5, 'contadores por trigger e índice de rating', _create_counters_and_keyset_indexes),
+    (6, 'links: último intento y fallos de conexión', _add_link_attempts),
+]
+
+# Consultas calientes y el índice que tienen que usar. check_query_plans()
+# avisa si alguna vuelve a recorrer la tabla entera (p. ej. porque se
+# reescribió la consulta o se cambió el índice)
+HOT_QUERIES = {
+    'series_links_join': ('''
+        SELECT s.id, GROUP_CONCAT(l.url, '||') FROM series s
+        LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
+        GROUP BY s.id LIMIT 20
+    ''', 'idx_links_content'),
+    'episode_links': ('''
+        SELECT url FROM links
+        WHERE content_type = 'series' AND content_id = 1 AND season = 1 AND episode = 1
+    ''', 'idx_links_content'),
+    'count_by_status': (
+        "SELECT COUNT(*) FROM links WHERE status = 'active'", 'idx_links_status'
+    ),
+    'links_due': ('''
+        SELECT id, url FROM links
+        WHERE last_attempt_at < datetime('now', '-6 hours')
+          AND (checked_at IS NULL OR checked_at < datetime('now', '-7 days'))
+        ORDER BY last_attempt_at LIMIT 500
+    ''', 'idx_links_last_attempt'),
+    'series_page_by_rating': ('''
+        SELECT id FROM series
+        WHERE IFNULL(rating, -1) <= 7.5 AND (IFNULL(rating, -1) < 7.5 OR id < 100)
+        ORDER BY IFNULL(rating, -1) DESC, id DESC LIMIT 21
+    ''', 'idx_series_rating'),
+}
+
+def explain(conn, sql):
+    """Detalle de EXPLAIN QUERY PLAN, un paso por línea"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+def check_query_plans(conn):
+    """
+    Returns:
+        dict: consulta -> plan, solo las que no BUSCAN por su índice
+        (recorrerlo entero con SCAN ... USING INDEX también es regresión)
+    """
+    problems = {}
+    for name, (sql, index) in HOT_QUERIES.items():
+        plan = explain(conn, sql)
+        if not any(step.startswith('SEARCH') and index in step for step in plan):
+            problems[name] = plan
+    return problems
+
+def count_rows(conn, table):
+    """Total de filas de una tabla de COUNTED_TABLES (O(1), del contador)"""
+    try:
+        row = conn.execute('SELECT total FROM table_counts WHERE name = ?', (table,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # BD sin la migración 5
+    if row is None:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    return row[0]
+
+# === Búsqueda ===
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+def fts_query(text):
+    """
+    Texto del usuario -> consulta FTS5 segura: cada palabra entre comillas
+    (así no se interpretan operadores como OR, NEAR o '-') y como prefijo,
+    para que "brea bad" encuentre "Breaking Bad". None si no hay palabras.
+    """
+    words = _WORD_RE.findall(text or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search(conn, table, text, limit=20):
+    """
+    Filas de `table` (movies | series) que coinciden con el texto, las más
+    relevantes primero (bm25). Sin FTS5 cae al LIKE de siempre.
+    """
+    spec = SEARCHABLE[table]
+    fts = f'{table}_fts'
+    if _has_table(conn, fts):
+        query = fts_query(text)
+        if query is None:
+            return []
+        weights = ', '.join(str(w) for w in spec['weights'])
+        return conn.execute(f'''
+            SELECT t.* FROM {fts}
+            JOIN {table} t ON t.id = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY bm25({fts}, {weights})
+            LIMIT ?
+        ''', (query, limit)).fetchall()
     
-    conn.commit()
-    conn.close()
+    conditions = ' OR '.join(f'{c} LIKE ?' for c in spec['columns'])
+    return conn.execute(
+        f'SELECT * FROM {table} WHERE {conditions} LIMIT ?',
+        [f'%{text}%'] * len(spec['columns']) + [limit]
+    ).fetchall()
 
-def get_connection():
-    conn = sqlite3.connect(get_db_path())
+def _has_table(conn, name):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+def _add_column(cursor, table, column, declaration):
+    columns = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    if column not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn, target=None):
+    """
+    Aplica las migraciones pendientes (hasta `target`, por defecto todas)
+    
+    Returns:
+        int: versión del esquema al terminar
+    """
+    for version, description, apply in MIGRATIONS:
+        if target is not None and version > target:
+            break
+        if schema_version(conn) >= version:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Otro proceso pudo aplicarla mientras esperábamos el lock
+            if schema_version(conn) < version:
+                apply(conn.cursor())
+                conn.execute(f'PRAGMA user_version = {version}')
+                print(f"Migración {version} aplicada: {description}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return schema_version(conn)
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Conexión que vive en el pool del hilo: close() la devuelve al pool
+    (deshaciendo lo que no se commiteó) en vez de cerrarla, así las rutas
+    que hacen conn.close() siguen funcionando igual.
+    """
+    
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+    
+    def discard(self):
+        super().close()
+
+_local = threading.local()
+_pid = os.getpid()
+
+def connect(factory=sqlite3.Connection):
+    """Conexión nueva con los PRAGMAs de rendimiento aplicados"""
+    conn = sqlite3.connect(
+        get_db_path(),
+        timeout=BUSY_TIMEOUT,
+        cached_statements=CACHED_STATEMENTS,
+        factory=factory
+    )
     conn.row_factory = sqlite3.Row
+    for pragma, value in PRAGMAS:
+        conn.execute(f'PRAGMA {pragma}={value}')
     return conn
 
+def get_connection():
+    """
+    Conexión del hilo actual (se abre una vez y se reutiliza entre
+    pedidos, con su cache de páginas y de sentencias preparadas)
+    """
+    global _local, _pid
+    if os.getpid() != _pid:
+        # Proceso hijo (fork de gunicorn): no usar las conexiones del padre
+        _local = threading.local()
+        _pid = os.getpid()
+    
+    conn = getattr(_local, 'conn', None)
+    if conn is None or getattr(_local, 'path', None) != config.DATABASE_PATH:
+        conn = _local.conn = connect(factory=PooledConnection)
+        _local.path = config.DATABASE_PATH
+    return conn
+
+def release_connection(exception=None):
+    """Fin del app context: si la ruta dejó una transacción abierta se deshace"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and os.getpid() == _pid:
+        conn.close()
+
+def init_app(app):
+    app.teardown_appcontext(release_connection)
+
 if __name__ == '__main__':
+    import sys
     init_db()
     print("Base de datos inicializada")
+    if '--check-plans' in sys.argv:
+        problems = check_query_plans(get_connection())
+        for name, plan in problems.items():
+            print(f"✗ {name} no usa su índice: {plan}")
+        if problems:
+            sys.exit(1)
+        print(f"✓ {len(HOT_QUERIES)} consultas usan sus índices")
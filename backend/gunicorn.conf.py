@@ -0,0 +1,8 @@
+# gunicorn.conf.py - gunicorn lo lee solo si se arranca desde backend/
+
+
+def post_fork(server, worker):
+    # Los jobs en segundo plano arrancan en cada worker, no en el master:
+    # con --preload el hilo del scheduler no sobreviviría al fork
+    from services.scheduler import scheduler
+    scheduler.start()
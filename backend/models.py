@@ -30,7 +30,7 @@ class Series:
 
 class Link:
     def __init__(self, content_id, content_type, url, source, 
-                 season=None, episode=None):
+                 season=None, episode=None, language=None):
         self.content_id = content_id
         self.content_type = content_type  # 'movie' o 'series'
         self.url = url
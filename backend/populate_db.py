@@ -37,59 +37,80 @@ def populate_database():
     cursor = conn.cursor()
     
     print("Agregando películas...")
-    for movie_query in movies_to_add:
+    movie_ids = _first_result_ids(tmdb_service.search_movies, movies_to_add)
+    movie_details, movie_errors = tmdb_service.get_many_details(list(movie_ids.values()), 'movie')
+    
+    for movie_query, tmdb_id in movie_ids.items():
+        if tmdb_id in movie_errors:
+            print(f"  ❌ {movie_query}: {movie_errors[tmdb_id]}")
+    
+    for details in movie_details:
+        if not details:
+            continue
         try:
-            results = tmdb_service.search_movies(movie_query)
-            if results:
-                details = tmdb_service.get_movie_details(results[0]['id'])
-                if details:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO movies 
-                        (tmdb_id, title, description, genre, rating, duration, poster, year)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        details['tmdb_id'],
-                        details['title'],
-                        details['description'],
-                        details['genre'],
-                        details['rating'],
-                        details['duration'],
-                        details['poster'],
-                        details['year']
-                    ))
-                    print(f"  ✅ {details['title']}")
+            cursor.execute('''
+                INSERT OR IGNORE INTO movies 
+                (tmdb_id, title, description, genre, rating, duration, poster, year)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                details['tmdb_id'],
+                details['title'],
+                details['description'],
+                details['genre'],
+                details['rating'],
+                details['duration'],
+                details['poster'],
+                details['year']
+            ))
+            print(f"  ✅ {details['title']}")
         except Exception as e:
-            print(f"  ❌ {movie_query}: {e}")
+            print(f"  ❌ {details['title']}: {e}")
     
     print("\nAgregando series...")
-    for series_query in series_to_add:
+    series_ids = _first_result_ids(tmdb_service.search_series, series_to_add)
+    series_details, series_errors = tmdb_service.get_many_details(list(series_ids.values()), 'tv')
+    
+    for series_query, tmdb_id in series_ids.items():
+        if tmdb_id in series_errors:
+            print(f"  ❌ {series_query}: {series_errors[tmdb_id]}")
+    
+    for details in series_details:
+        if not details:
+            continue
         try:
-            results = tmdb_service.search_series(series_query)
-            if results:
-                details = tmdb_service.get_series_details(results[0]['id'])
-                if details:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO series 
-                        (tmdb_id, title, description, genre, rating, poster, year, seasons)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        details['tmdb_id'],
-                        details['title'],
-                        details['description'],
-                        details['genre'],
-                        details['rating'],
-                        details['poster'],
-                        details['year'],
-                        details['seasons']
-                    ))
-                    print(f"  ✅ {details['title']}")
+            cursor.execute('''
+                INSERT OR IGNORE INTO series 
+                (tmdb_id, title, description, genre, rating, poster, year, seasons)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                details['tmdb_id'],
+                details['title'],
+                details['description'],
+                details['genre'],
+                details['rating'],
+                details['poster'],
+                details['year'],
+                details['seasons']
+            ))
+            print(f"  ✅ {details['title']}")
         except Exception as e:
-            print(f"  ❌ {series_query}: {e}")
+            print(f"  ❌ {details['title']}: {e}")
     
     conn.commit()
     conn.close()
     
     print("\n✅ Base de datos poblada")
 
+def _first_result_ids(search, queries):
+    """Busca cada título y devuelve {query: tmdb_id del primer resultado}"""
+    ids = {}
+    for query in queries:
+        results = search(query)
+        if results:
+            ids[query] = results[0]['id']
+        else:
+            print(f"  ❌ {query}: sin resultados en TMDB")
+    return ids
+
 if __name__ == '__main__':
     populate_database()
@@ -1,8 +1,11 @@
 from flask import jsonify, request
 from routes import admin_bp
-from database import get_connection
+from database import get_connection, count_rows
 from services.tmdb_service import tmdb_service
 from services.scraper_service import scraper_service
+from services.scrapers.circuit import circuit_breakers
+from services.scrapers.latency import domain_latency
+from services.scheduler import scheduler
 import sqlite3
 
 @admin_bp.route('/admin/add-movie', methods=['POST'])
@@ -250,16 +253,14 @@ def get_stats():
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('SELECT COUNT(*) as count FROM movies')
-    total_movies = cursor.fetchone()['count']
+    # Totales mantenidos por triggers (sin recorrer las tablas)
+    total_movies = count_rows(conn, 'movies')
+    total_series = count_rows(conn, 'series')
     
-    cursor.execute('SELECT COUNT(*) as count FROM series')
-    total_series = cursor.fetchone()['count']
-    
-    cursor.execute('SELECT COUNT(*) as count FROM links WHERE status = "active"')
+    cursor.execute("SELECT COUNT(*) as count FROM links WHERE status = 'active'")
     active_links = cursor.fetchone()['count']
     
-    cursor.execute('SELECT COUNT(*) as count FROM links WHERE status = "broken"')
+    cursor.execute("SELECT COUNT(*) as count FROM links WHERE status = 'broken'")
     broken_links = cursor.fetchone()['count']
     
     conn.close()
@@ -272,6 +273,21 @@ def get_stats():
         'total_content': total_movies + total_series
     })
 
+@admin_bp.route('/admin/scrapers', methods=['GET'])
+def scrapers_health():
+    """Scoreboard de los dominios scrapeados: circuito, tasa de éxito y p95"""
+    domains = circuit_breakers.scoreboard()
+    return jsonify({
+        'domains': domains,
+        'open': sorted(d for d, row in domains.items() if row['state'] != 'closed'),
+        'hedges': domain_latency.stats()['hedges']
+    })
+
+@admin_bp.route('/admin/jobs', methods=['GET'])
+def jobs_status():
+    """Jobs en segundo plano: última corrida, duración y resultado"""
+    return jsonify(scheduler.stats())
+
 @admin_bp.route('/admin/delete-link/<int:link_id>', methods=['DELETE'])
 def delete_link(link_id):
     """Eliminar un link"""
@@ -297,7 +313,9 @@ def update_link_status(link_id):
     cursor = conn.cursor()
     
     cursor.execute('''
-        UPDATE links SET status = ?, checked_at = CURRENT_TIMESTAMP WHERE id = ?
+        UPDATE links SET status = ?, checked_at = CURRENT_TIMESTAMP,
+            last_attempt_at = CURRENT_TIMESTAMP, failed_checks = 0
+        WHERE id = ?
     ''', (status, link_id))
     
     conn.commit()
@@ -1,6 +1,6 @@
 from flask import jsonify, request
 from flask import Blueprint
-from database import get_connection
+from database import get_connection, search as search_table
 from services.tmdb_service import tmdb_service
 
 general_bp = Blueprint('general', __name__)
@@ -33,21 +33,10 @@ def search():
         return jsonify({'error': 'Búsqueda muy corta'}), 400
     
     conn = get_connection()
-    cursor = conn.cursor()
     
-    # Buscar en películas
-    cursor.execute('''
-        SELECT * FROM movies WHERE title LIKE ? OR description LIKE ?
-        LIMIT 10
-    ''', (f'%{query}%', f'%{query}%'))
-    movies = [dict(row) for row in cursor.fetchall()]
-    
-    # Buscar en series
-    cursor.execute('''
-        SELECT * FROM series WHERE title LIKE ? OR description LIKE ?
-        LIMIT 10
-    ''', (f'%{query}%', f'%{query}%'))
-    series = [dict(row) for row in cursor.fetchall()]
+    # Índice FTS5 sin acentos, ordenado por relevancia (bm25)
+    movies = [dict(row) for row in search_table(conn, 'movies', query, limit=10)]
+    series = [dict(row) for row in search_table(conn, 'series', query, limit=10)]
     
     conn.close()
     
@@ -63,17 +52,11 @@ def trending():
     trending_movies = tmdb_service.get_trending_movies('week')
     trending_series = tmdb_service.get_trending_series('week')
     
-    movies_list = []
-    for item in trending_movies[:10]:
-        details = tmdb_service.get_movie_details(item['id'])
-        if details:
-            movies_list.append(details)
+    movie_details, _ = tmdb_service.get_many_details([item['id'] for item in trending_movies[:10]], 'movie')
+    movies_list = [details for details in movie_details if details]
     
-    series_list = []
-    for item in trending_series[:10]:
-        details = tmdb_service.get_series_details(item['id'])
-        if details:
-            series_list.append(details)
+    series_details, _ = tmdb_service.get_many_details([item['id'] for item in trending_series[:10]], 'tv')
+    series_list = [details for details in series_details if details]
     
     return jsonify({
         'trending_movies': movies_list,
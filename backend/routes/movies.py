@@ -1,73 +1,139 @@
 # routes/movies.py - Sistema Híbrido Completo
 from flask import Blueprint, jsonify, request
-import requests
 import os
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
 from services.scrapers.zonahack import ZonaHackScraper
 from services.scrapers.pelisplushd import PelisPlusHDScraper
+from services.scrapers.circuit import circuit_breakers
+from services.scrapers.registry import scraper_registry
+from services.gist_service import gist_service
+from services.episode_index import build_season_index
+from services.link_extractor import link_extractor, source_executor, DEFAULT_DEADLINE as LINKS_DEADLINE
+from services.tmdb_client import tmdb_client
+from services.prewarmer import PreWarmer, WarmTarget
+from services.cache import create_cache_backend, SingleFlight
+from config import config
 
 movies_bp = Blueprint('movies', __name__)
 
 # Configuración
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
-GIST_URL = os.getenv('GIST_DB_URL')  # URL raw de tu Gist
 
-# Cache en memoria (se pierde al reiniciar pero eso está OK)
-memory_cache = {}
-gist_cache = {}
-gist_cache_expiry = None
+# Cache de links/temporadas. Backend según CACHE_BACKEND: memory (por
+# worker, LRU acotado), sqlite (compartido por los workers del host y
+# persistente) o redis. El Gist DB (GIST_DB_URL) vive en services/gist_service.py
+cache_backend = create_cache_backend()
+
+# Coalescencia de scrapes concurrentes (links_<id> / series_<id>_s<n>).
+# Entre workers solo tiene sentido si el cache es compartido.
+link_flight = SingleFlight(
+    lock_dir=config.SINGLEFLIGHT_LOCK_DIR if cache_backend.name != 'memory' else None
+)
+
+# Secciones de TMDB del HOME y su presupuesto en segundos.
+# Se piden en paralelo; si una no llega a tiempo se devuelve vacía
+# y se marca como degradada en la respuesta.
+HOME_SECTIONS = {
+    'trending': 'trending/all/week',
+    'popular_movies': 'movie/popular',
+    'popular_series': 'tv/popular'
+}
+HOME_SECTION_DEADLINES = {
+    'trending': float(os.getenv('HOME_TRENDING_DEADLINE', 4)),
+    'popular_movies': float(os.getenv('HOME_POPULAR_MOVIES_DEADLINE', 4)),
+    'popular_series': float(os.getenv('HOME_POPULAR_SERIES_DEADLINE', 4))
+}
+home_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('HOME_FANOUT_WORKERS', 12)),
+    thread_name_prefix='home-fanout'
+)
+
+# TMDB acepta como máximo 20 anexos en append_to_response
+MAX_APPENDED_SEASONS = 20
+
+# Cómo se combinan las fuentes de /api/links: first (la primera con links)
+# o merge (todas las que terminen antes del deadline)
+LINKS_MODE = os.getenv('LINKS_MODE', 'first')
+
+# Cuánto se recuerdan los documentos de Firestore aprendidos de un Listen
+ZONAHACK_DOCS_TTL_MINUTES = int(os.getenv('ZONAHACK_DOCS_TTL_MINUTES', 7 * 24 * 60))
+
+# Minutos que viven en el cache los links de una película / temporada
+LINKS_CACHE_MINUTES = 30
 
 # === FUNCIONES AUXILIARES ===
 
 def fetch_gist_db():
-    """Obtiene y cachea el Gist DB"""
-    global gist_cache, gist_cache_expiry
-    
-    if gist_cache and gist_cache_expiry and datetime.now() < gist_cache_expiry:
-        return gist_cache
-    
-    try:
-        response = requests.get(GIST_URL, timeout=10)
-        response.raise_for_status()
-        gist_cache = response.json()
-        gist_cache_expiry = datetime.now() + timedelta(minutes=30)
-        return gist_cache
-    except Exception as e:
-        print(f"Error fetching Gist: {e}")
-        return {}
+    """Obtiene el Gist DB (stale-while-revalidate, ver gist_service)"""
+    return gist_service.get_raw()
+
+def get_catalog():
+    """Devuelve el snapshot vigente del Gist"""
+    return gist_service.get_catalog()
 
 def check_availability_in_gist(tmdb_id):
     """Verifica si una película/serie está en el Gist"""
-    gist_db = fetch_gist_db()
-    return str(tmdb_id) in gist_db
+    return get_catalog().has(tmdb_id)
 
 def enrich_tmdb_results(tmdb_results):
     """Añade badge de disponibilidad a resultados de TMDB"""
-    gist_db = fetch_gist_db()
+    current_catalog = get_catalog()
     
     for item in tmdb_results:
-        tmdb_id = str(item['tmdb_id'])
-        item['has_links'] = tmdb_id in gist_db
+        item['has_links'] = current_catalog.has(item['tmdb_id'])
         item['source'] = 'verified' if item['has_links'] else 'tmdb_only'
     
     return tmdb_results
 
 def get_from_cache(cache_key):
-    """Obtiene datos del cache en memoria"""
-    if cache_key in memory_cache:
-        cache_data = memory_cache[cache_key]
-        if datetime.now() < cache_data['expires']:
-            return cache_data['data']
-        else:
-            del memory_cache[cache_key]
-    return None
+    """Obtiene datos del cache"""
+    return cache_backend.get(cache_key)
 
 def set_cache(cache_key, data, minutes=30):
-    """Guarda datos en cache en memoria"""
-    memory_cache[cache_key] = {
-        'data': data,
-        'expires': datetime.now() + timedelta(minutes=minutes)
-    }
+    """Guarda datos en el cache"""
+    cache_backend.set(cache_key, data, ttl_seconds=minutes * 60)
+
+def _fetch_tmdb_section(path, deadline):
+    """
+    Obtiene la lista de resultados de un endpoint de TMDB. El deadline
+    corta también los reintentos: el worker se libera aunque el handler
+    ya haya dejado de esperar la sección.
+    """
+    data = tmdb_client.get_json(
+        path,
+        params={'language': 'es-ES'},
+        timeout=deadline - time.monotonic(),
+        deadline=deadline
+    )
+    return data.get('results', [])
+
+def _collect_home_sections(futures, start):
+    """
+    Espera cada sección hasta su deadline (contado desde start).
+    Devuelve (resultados, degradadas); una sección que falla o no llega
+    a tiempo queda como lista vacía y degraded=True.
+    """
+    results = {}
+    degraded = {}
+    
+    for name, future in futures.items():
+        remaining = HOME_SECTION_DEADLINES[name] - (time.monotonic() - start)
+        try:
+            results[name] = future.result(timeout=max(remaining, 0))
+            degraded[name] = False
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"Home: sección '{name}' excedió su deadline")
+            results[name] = []
+            degraded[name] = True
+        except Exception as e:
+            print(f"Home: error en sección '{name}': {e}")
+            results[name] = []
+            degraded[name] = True
+    
+    return results, degraded
 
 # === ENDPOINTS ===
 
@@ -81,42 +147,25 @@ def get_home_data():
         return jsonify({'error': 'TMDB_API_KEY no configurada'}), 500
     
     try:
-        gist_db = fetch_gist_db()
+        # Lanzar las secciones de TMDB primero para que corran mientras
+        # armamos las secciones verificadas del Gist
+        start = time.monotonic()
+        futures = {
+            name: home_executor.submit(_fetch_tmdb_section, path, start + HOME_SECTION_DEADLINES[name])
+            for name, path in HOME_SECTIONS.items()
+        }
         
-        # 1. Películas verificadas (de tu Gist)
-        verified_movies = []
-        for tmdb_id, item in gist_db.items():
-            if item.get('type') == 'movie':
-                verified_movies.append({
-                    'tmdb_id': int(tmdb_id),
-                    'title': item['title'],
-                    'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}",
-                    'has_links': True,
-                    'source': 'verified'
-                })
+        current_catalog = get_catalog()
         
-        # 2. Series verificadas (de tu Gist)
-        verified_series = []
-        for tmdb_id, item in gist_db.items():
-            if item.get('type') == 'series':
-                verified_series.append({
-                    'tmdb_id': int(tmdb_id),
-                    'title': item['title'],
-                    'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}",
-                    'has_links': True,
-                    'source': 'verified'
-                })
+        # 1-2. Películas y series verificadas (de tu Gist, ya indexadas)
+        verified_movies = current_catalog.movies
+        verified_series = current_catalog.series
         
-        # 3. Trending (TMDB)
-        trending_response = requests.get(
-            'https://api.themoviedb.org/3/trending/all/week',
-            params={'api_key': TMDB_API_KEY, 'language': 'es-ES'},
-            timeout=10
-        )
-        trending_data = trending_response.json()
-        trending_items = []
+        # 3-5. Trending / Populares (TMDB) - ya se pidieron en paralelo
+        sections, degraded = _collect_home_sections(futures, start)
         
-        for item in trending_data.get('results', [])[:20]:
+        trending_items = []
+        for item in sections['trending'][:20]:
             media_type = item.get('media_type')
             trending_items.append({
                 'tmdb_id': item['id'],
@@ -124,58 +173,44 @@ def get_home_data():
                 'poster': f"https://image.tmdb.org/t/p/w500{item['poster_path']}" if item.get('poster_path') else None,
                 'type': 'movie' if media_type == 'movie' else 'series',
                 'rating': item.get('vote_average'),
-                'has_links': check_availability_in_gist(item['id']),
-                'source': 'verified' if check_availability_in_gist(item['id']) else 'tmdb_only'
+                'has_links': current_catalog.has(item['id']),
+                'source': 'verified' if current_catalog.has(item['id']) else 'tmdb_only'
             })
         
-        # 4. Películas populares (TMDB)
-        movies_response = requests.get(
-            'https://api.themoviedb.org/3/movie/popular',
-            params={'api_key': TMDB_API_KEY, 'language': 'es-ES'},
-            timeout=10
-        )
-        movies_data = movies_response.json()
         popular_movies = []
-        
-        for item in movies_data.get('results', [])[:20]:
+        for item in sections['popular_movies'][:20]:
             popular_movies.append({
                 'tmdb_id': item['id'],
                 'title': item['title'],
                 'poster': f"https://image.tmdb.org/t/p/w500{item['poster_path']}" if item.get('poster_path') else None,
                 'year': item.get('release_date', '')[:4] if item.get('release_date') else None,
                 'rating': item.get('vote_average'),
-                'has_links': check_availability_in_gist(item['id']),
-                'source': 'verified' if check_availability_in_gist(item['id']) else 'tmdb_only'
+                'has_links': current_catalog.has(item['id']),
+                'source': 'verified' if current_catalog.has(item['id']) else 'tmdb_only'
             })
         
-        # 5. Series populares (TMDB)
-        series_response = requests.get(
-            'https://api.themoviedb.org/3/tv/popular',
-            params={'api_key': TMDB_API_KEY, 'language': 'es-ES'},
-            timeout=10
-        )
-        series_data = series_response.json()
         popular_series = []
-        
-        for item in series_data.get('results', [])[:20]:
+        for item in sections['popular_series'][:20]:
             popular_series.append({
                 'tmdb_id': item['id'],
                 'title': item['name'],
                 'poster': f"https://image.tmdb.org/t/p/w500{item['poster_path']}" if item.get('poster_path') else None,
                 'year': item.get('first_air_date', '')[:4] if item.get('first_air_date') else None,
                 'rating': item.get('vote_average'),
-                'has_links': check_availability_in_gist(item['id']),
-                'source': 'verified' if check_availability_in_gist(item['id']) else 'tmdb_only'
+                'has_links': current_catalog.has(item['id']),
+                'source': 'verified' if current_catalog.has(item['id']) else 'tmdb_only'
             })
         
         return jsonify({
             'success': True,
-            'verified_movies': verified_movies[:8],
-            'verified_series': verified_series[:8],
+            'verified_movies': list(verified_movies[:8]),
+            'verified_series': list(verified_series[:8]),
             'trending': trending_items,
             'popular_movies': popular_movies,
             'popular_series': popular_series,
-            'total_verified': len(verified_movies) + len(verified_series)
+            'total_verified': len(verified_movies) + len(verified_series),
+            'degraded': degraded,
+            'partial': any(degraded.values())
         })
         
     except Exception as e:
@@ -206,20 +241,18 @@ def search_content():
         else:
             endpoint = 'search/multi'
         
-        response = requests.get(
-            f'https://api.themoviedb.org/3/{endpoint}',
+        data = tmdb_client.get_json(
+            endpoint,
             params={
-                'api_key': TMDB_API_KEY,
                 'query': query,
                 'language': 'es-ES',
                 'page': page
             },
             timeout=10
         )
-        response.raise_for_status()
-        data = response.json()
         
         # Formatear resultados
+        current_catalog = get_catalog()
         results = []
         for item in data.get('results', []):
             # Filtrar solo películas y series
@@ -236,8 +269,8 @@ def search_content():
                 'rating': item.get('vote_average'),
                 'poster': f"https://image.tmdb.org/t/p/w500{item['poster_path']}" if item.get('poster_path') else None,
                 'type': 'movie' if media_type == 'movie' else 'series',
-                'has_links': check_availability_in_gist(tmdb_id),
-                'source': 'verified' if check_availability_in_gist(tmdb_id) else 'tmdb_only'
+                'has_links': current_catalog.has(tmdb_id),
+                'source': 'verified' if current_catalog.has(tmdb_id) else 'tmdb_only'
             })
         
         return jsonify({
@@ -256,21 +289,30 @@ def search_content():
 def get_content_details(tmdb_id):
     """
     Obtiene detalles completos de una película/serie
+    Query params (solo series): seasons=1,2 o seasons=all para embeber
+    los episodios de esas temporadas en la misma respuesta
     """
     content_type = request.args.get('type', 'movie')  # movie o tv
+    seasons_param = request.args.get('seasons', '').strip()
     
     if not TMDB_API_KEY:
         return jsonify({'error': 'TMDB_API_KEY no configurada'}), 500
     
     try:
         endpoint = 'movie' if content_type == 'movie' else 'tv'
-        response = requests.get(
-            f'https://api.themoviedb.org/3/{endpoint}/{tmdb_id}',
-            params={'api_key': TMDB_API_KEY, 'language': 'es-ES'},
+        params = {'language': 'es-ES'}
+        season_numbers = []
+        if endpoint == 'tv' and seasons_param:
+            season_numbers = _requested_seasons(tmdb_id, seasons_param)
+            if season_numbers:
+                # Una sola llamada a TMDB: detalles + temporadas
+                params['append_to_response'] = ','.join(f'season/{n}' for n in season_numbers)
+        
+        data = tmdb_client.get_json(
+            f'{endpoint}/{tmdb_id}',
+            params=params,
             timeout=10
         )
-        response.raise_for_status()
-        data = response.json()
         
         details = {
             'tmdb_id': tmdb_id,
@@ -291,6 +333,13 @@ def get_content_details(tmdb_id):
         else:
             details['seasons'] = data.get('number_of_seasons')
             details['episodes'] = data.get('number_of_episodes')
+            if seasons_param:
+                catalog = get_catalog()
+                details['available_seasons'] = catalog.available_seasons(tmdb_id)
+                details['season_details'] = [
+                    _build_season(tmdb_id, n, data[f'season/{n}'], catalog)
+                    for n in season_numbers if f'season/{n}' in data
+                ]
         
         return jsonify({
             'success': True,
@@ -301,6 +350,46 @@ def get_content_details(tmdb_id):
         return jsonify({'error': str(e)}), 500
 
 
+def _requested_seasons(tmdb_id, seasons_param):
+    """
+    Traduce el query param seasons a números de temporada.
+    'all' necesita number_of_seasons: se toma de los detalles básicos
+    (normalmente ya están en el cache de TMDB).
+    """
+    if seasons_param == 'all':
+        base = tmdb_client.get_json(f'tv/{tmdb_id}', params={'language': 'es-ES'}, timeout=10)
+        numbers = range(1, (base.get('number_of_seasons') or 0) + 1)
+    else:
+        numbers = sorted({int(n) for n in seasons_param.split(',') if n.strip().isdigit()})
+    return [n for n in numbers if n > 0][:MAX_APPENDED_SEASONS]
+
+
+def _format_episodes(season_data):
+    """Episodios de una temporada de TMDB en el formato de la API"""
+    episodes = []
+    for ep in season_data.get('episodes', []):
+        episodes.append({
+            'episode_number': ep['episode_number'],
+            'name': ep['name'],
+            'overview': ep.get('overview'),
+            'still_path': f"https://image.tmdb.org/t/p/w300{ep['still_path']}" if ep.get('still_path') else None,
+            'air_date': ep.get('air_date')
+        })
+    return episodes
+
+
+def _build_season(tmdb_id, season, season_data, catalog):
+    """Temporada embebida en /api/details"""
+    episodes = _format_episodes(season_data)
+    return {
+        'season': season,
+        'name': season_data.get('name'),
+        'episodes': episodes,
+        'total_episodes': len(episodes),
+        'has_links': catalog.has_season(tmdb_id, season)
+    }
+
+
 @movies_bp.route('/api/links/<int:tmdb_id>', methods=['GET'])
 def get_streaming_links(tmdb_id):
     """
@@ -319,71 +408,21 @@ def get_streaming_links(tmdb_id):
     start_time = datetime.now()
     
     try:
-        gist_db = fetch_gist_db()
-        movie_data = gist_db.get(str(tmdb_id))
+        # Un solo scrape por película aunque lleguen muchos pedidos a la vez
+        # (auto_scrape cambia el resultado posible, por eso va en la key)
+        result, shared = link_flight.do(
+            f"{cache_key}|auto={auto_scrape}",
+            lambda: _resolve_movie_links(tmdb_id, cache_key, auto_scrape, start_time),
+            check=lambda: get_from_cache(cache_key)
+        )
         
-        # Estrategia 1: Película en Gist (ZonaHack verificado)
-        if movie_data and movie_data.get('listen_url'):
-            scraper = ZonaHackScraper()
-            result = scraper.extract_links(
-                url=movie_data.get('zonahack_url', ''),
-                listen_url=movie_data['listen_url']
-            )
-            
-            if result['success']:
-                response_data = {
-                    'success': True,
-                    'source': 'gist_zonahack',
-                    'links': result['links'],
-                    'total': len(result['links']),
-                    'cache_time': (datetime.now() - start_time).total_seconds(),
-                    'from_cache': False
-                }
-                set_cache(cache_key, response_data)
-                return jsonify(response_data)
-        
-        # Estrategia 2: Auto-scraping de PelisPlusHD (si está habilitado)
-        if auto_scrape:
-            # Necesitamos construir la URL de PelisPlusHD
-            # Para esto, necesitamos el título slug
-            # Lo obtenemos de TMDB
-            tmdb_response = requests.get(
-                f'https://api.themoviedb.org/3/movie/{tmdb_id}',
-                params={'api_key': TMDB_API_KEY},
-                timeout=5
-            )
-            
-            if tmdb_response.status_code == 200:
-                tmdb_data = tmdb_response.json()
-                title_slug = tmdb_data.get('title', '').lower().replace(' ', '-')
-                pelisplus_url = f"https://ww4.pelisplushd.to/pelicula/{title_slug}"
-                
-                scraper = PelisPlusHDScraper()
-                result = scraper.extract_links(pelisplus_url)
-                
-                if result['success']:
-                    response_data = {
-                        'success': True,
-                        'source': 'auto_pelisplushd',
-                        'links': result['links'],
-                        'total': len(result['links']),
-                        'cache_time': (datetime.now() - start_time).total_seconds(),
-                        'from_cache': False,
-                        'note': 'Scraped automatically, may not always work'
-                    }
-                    set_cache(cache_key, response_data, minutes=30)
-                    return jsonify(response_data)
+        if result.get('success'):
+            if shared:
+                result = dict(result, from_cache=True)
+            return jsonify(result)
         
         # Estrategia 3: No disponible
-        return jsonify({
-            'success': False,
-            'error': 'not_available',
-            'tmdb_id': tmdb_id,
-            'links': [],
-            'total': 0,
-            'suggestion': 'request_movie',
-            'cache_time': (datetime.now() - start_time).total_seconds()
-        })
+        return jsonify(dict(result, cache_time=(datetime.now() - start_time).total_seconds()))
         
     except Exception as e:
         return jsonify({
@@ -395,6 +434,65 @@ def get_streaming_links(tmdb_id):
         }), 500
 
 
+def _resolve_movie_links(tmdb_id, cache_key, auto_scrape, start_time):
+    """
+    Scrapea los links de una película y cachea el resultado si hubo éxito.
+    Las fuentes corren en paralelo bajo un único deadline (LINKS_DEADLINE),
+    en orden de prioridad: los links de PelisPlusHD solo ganan si ZonaHack
+    (verificado) no devuelve nada o no llega antes del deadline.
+    """
+    movie_data = get_catalog().get(tmdb_id)
+    # Un solo deadline para el pedido y para cada fuente: las que no
+    # llegan a tiempo cortan solas y liberan su hilo de source_executor
+    deadline = time.monotonic() + LINKS_DEADLINE
+    sources = []
+    
+    # Fuente 1: Película en Gist (ZonaHack verificado)
+    if movie_data and (movie_data.get('listen_url') or movie_data.get('firestore_docs')):
+        sources.append(('gist_zonahack', lambda: _extract_zonahack(movie_data, f"zonahack_docs_{tmdb_id}", deadline)))
+    
+    # Fuente 2: Auto-scraping de PelisPlusHD (si está habilitado)
+    if auto_scrape:
+        sources.append(('auto_pelisplushd', lambda: _scrape_pelisplushd(tmdb_id, deadline)))
+    
+    result = link_extractor.run(sources, mode=LINKS_MODE, deadline=deadline) if sources else None
+    
+    if result and result['success']:
+        response_data = {
+            'success': True,
+            'source': result['source'] if isinstance(result['source'], str) else 'merged',
+            'links': result['links'],
+            'total': result['total'],
+            'sources': result['sources'],
+            'cache_time': (datetime.now() - start_time).total_seconds(),
+            'from_cache': False
+        }
+        if response_data['source'] == 'auto_pelisplushd':
+            response_data['note'] = 'Scraped automatically, may not always work'
+        set_cache(cache_key, response_data, minutes=LINKS_CACHE_MINUTES)
+        return response_data
+    
+    return {
+        'success': False,
+        'error': 'not_available',
+        'tmdb_id': tmdb_id,
+        'links': [],
+        'total': 0,
+        'sources': result['sources'] if result else {},
+        'suggestion': 'request_movie'
+    }
+
+
+def _scrape_pelisplushd(tmdb_id, deadline=None):
+    """PelisPlusHD a partir del título de TMDB (slug)"""
+    tmdb_data = tmdb_client.get_json(f'movie/{tmdb_id}', timeout=5, deadline=deadline)
+    title_slug = tmdb_data.get('title', '').lower().replace(' ', '-')
+    if not title_slug:
+        return None
+    pelisplus_url = f"https://ww4.pelisplushd.to/pelicula/{title_slug}"
+    return scraper_registry.get(PelisPlusHDScraper).extract_links(pelisplus_url, deadline=deadline)
+
+
 @movies_bp.route('/api/series/<int:tmdb_id>/season/<int:season>', methods=['GET'])
 def get_series_season_episodes(tmdb_id, season):
     """
@@ -404,31 +502,16 @@ def get_series_season_episodes(tmdb_id, season):
         return jsonify({'error': 'TMDB_API_KEY no configurada'}), 500
     
     try:
-        response = requests.get(
-            f'https://api.themoviedb.org/3/tv/{tmdb_id}/season/{season}',
-            params={'api_key': TMDB_API_KEY, 'language': 'es-ES'},
+        data = tmdb_client.get_json(
+            f'tv/{tmdb_id}/season/{season}',
+            params={'language': 'es-ES'},
             timeout=10
         )
-        response.raise_for_status()
-        data = response.json()
         
-        episodes = []
-        for ep in data.get('episodes', []):
-            episodes.append({
-                'episode_number': ep['episode_number'],
-                'name': ep['name'],
-                'overview': ep.get('overview'),
-                'still_path': f"https://image.tmdb.org/t/p/w300{ep['still_path']}" if ep.get('still_path') else None,
-                'air_date': ep.get('air_date')
-            })
+        episodes = _format_episodes(data)
         
         # Verificar si tenemos enlaces para esta temporada
-        gist_db = fetch_gist_db()
-        series_data = gist_db.get(str(tmdb_id))
-        has_links = False
-        
-        if series_data and series_data.get('seasons'):
-            has_links = str(season) in series_data.get('seasons', {})
+        has_links = get_catalog().has_season(tmdb_id, season)
         
         return jsonify({
             'success': True,
@@ -455,134 +538,37 @@ def get_series_episode_links(tmdb_id):
     if not season or not episode:
         return jsonify({'error': 'Parámetros season y episode son requeridos'}), 400
     
-    # Verificar cache para toda la temporada
-    cache_key = f"series_{tmdb_id}_s{season}"
-    cached_season = get_from_cache(cache_key)
-    
-    if cached_season:
-        # Buscar el episodio específico en el cache
-        for ep in cached_season.get('episodes', []):
-            if ep['episode'] == episode:
-                return jsonify({
-                    'success': True,
-                    'source': cached_season['source'],
-                    'episode': ep,
-                    'from_cache': True
-                })
-    
     start_time = datetime.now()
     
     try:
-        gist_db = fetch_gist_db()
-        series_data = gist_db.get(str(tmdb_id))
-        
-        # Verificar si tenemos la temporada en el Gist
-        if not series_data or not series_data.get('seasons'):
-            return jsonify({
-                'success': False,
-                'error': 'series_not_available',
-                'tmdb_id': tmdb_id,
-                'season': season,
-                'episode': episode,
-                'suggestion': 'request_series'
-            })
-        
-        season_data = series_data['seasons'].get(str(season))
-        
-        if not season_data or not season_data.get('listen_url'):
-            return jsonify({
-                'success': False,
-                'error': 'season_not_available',
-                'tmdb_id': tmdb_id,
-                'season': season,
-                'episode': episode,
-                'suggestion': 'request_season'
-            })
-        
-        # Hacer scraping de ZonaHack para TODA la temporada
-        scraper = ZonaHackScraper()
-        result = scraper.extract_links(
-            url=season_data.get('zonahack_url', ''),
-            listen_url=season_data['listen_url']
-        )
-        
-        if not result['success']:
-            return jsonify({
-                'success': False,
-                'error': 'scraping_failed',
-                'details': result.get('error'),
-                'tmdb_id': tmdb_id,
-                'season': season,
-                'episode': episode
-            })
-        
-        # Organizar enlaces por episodio
-        # ZonaHack devuelve enlaces con campo 'nombre' que incluye el episodio
-        episodes_links = {}
-        
-        for link in result['links']:
-            # Extraer número de episodio del nombre
-            # Ejemplo: "Breaking Bad 1x01" o "Episodio 1"
-            import re
-            ep_match = re.search(r'(?:x|episodio\s*)(\d+)', link.get('nombre', ''), re.IGNORECASE)
-            
-            if ep_match:
-                ep_num = int(ep_match.group(1))
-            else:
-                # Si no encuentra patrón, asumir orden secuencial
-                ep_num = len(episodes_links) + 1
-            
-            if ep_num not in episodes_links:
-                episodes_links[ep_num] = []
-            
-            episodes_links[ep_num].append({
-                'server': link['server'],
-                'url': link['url'],
-                'language': link['language']
-            })
+        season_index, from_cache, error = _get_season_index(tmdb_id, season, start_time)
+        if error:
+            return jsonify(dict(error, success=False, tmdb_id=tmdb_id, season=season, episode=episode))
         
-        # Cachear TODA la temporada (smart caching)
-        cache_data = {
-            'source': 'gist_zonahack',
-            'episodes': [
-                {
-                    'episode': ep_num,
-                    'links': links,
-                    'total': len(links)
-                }
-                for ep_num, links in episodes_links.items()
-            ],
-            'cache_time': (datetime.now() - start_time).total_seconds()
-        }
-        set_cache(cache_key, cache_data, minutes=30)
-        
-        # Devolver solo el episodio solicitado
-        if episode in episodes_links:
-            return jsonify({
-                'success': True,
-                'source': 'gist_zonahack',
-                'tmdb_id': tmdb_id,
-                'season': season,
-                'episode': {
-                    'episode': episode,
-                    'links': episodes_links[episode],
-                    'total': len(episodes_links[episode])
-                },
-                'all_episodes_cached': True,
-                'cached_episodes': list(episodes_links.keys()),
-                'cache_time': (datetime.now() - start_time).total_seconds(),
-                'from_cache': False
-            })
-        else:
+        # Índice por episodio: lookup directo
+        episode_links = season_index['episodes'].get(str(episode))
+        if not episode_links:
             return jsonify({
                 'success': False,
                 'error': 'episode_not_found',
                 'tmdb_id': tmdb_id,
                 'season': season,
                 'episode': episode,
-                'available_episodes': list(episodes_links.keys())
+                'available_episodes': season_index['episode_numbers']
             })
         
+        return jsonify({
+            'success': True,
+            'source': season_index['source'],
+            'tmdb_id': tmdb_id,
+            'season': season,
+            'episode': episode_links,
+            'all_episodes_cached': True,
+            'cached_episodes': season_index['episode_numbers'],
+            'cache_time': (datetime.now() - start_time).total_seconds(),
+            'from_cache': from_cache
+        })
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -593,6 +579,196 @@ def get_series_episode_links(tmdb_id):
         }), 500
 
 
+@movies_bp.route('/api/series/<int:tmdb_id>/season/<int:season>/links', methods=['GET'])
+def get_series_season_links(tmdb_id, season):
+    """
+    Enlaces de todos los episodios de una temporada en una sola respuesta
+    (la temporada se scrapea entera de todos modos)
+    """
+    start_time = datetime.now()
+    
+    try:
+        season_index, from_cache, error = _get_season_index(tmdb_id, season, start_time)
+        if error:
+            return jsonify(dict(error, success=False, tmdb_id=tmdb_id, season=season))
+        
+        return jsonify({
+            'success': True,
+            'source': season_index['source'],
+            'tmdb_id': tmdb_id,
+            'season': season,
+            'episodes': [season_index['episodes'][str(ep)] for ep in season_index['episode_numbers']],
+            'total_episodes': len(season_index['episode_numbers']),
+            'expected_episodes': season_index.get('expected_episodes'),
+            'cache_time': (datetime.now() - start_time).total_seconds(),
+            'from_cache': from_cache
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'tmdb_id': tmdb_id,
+            'season': season
+        }), 500
+
+
+def _get_season_index(tmdb_id, season, start_time):
+    """
+    Índice episodio -> links de una temporada, del cache o scrapeando
+    ZonaHack (una sola vez aunque muchos clientes pidan la misma temporada).
+    
+    Returns:
+        (season_index, from_cache, error): error es un dict con 'error'
+        (y 'suggestion'/'details') si no se pudo obtener
+    """
+    cache_key = f"season_index_{tmdb_id}_s{season}"
+    cached = get_from_cache(cache_key)
+    if cached:
+        return cached, True, None
+    
+    series_data = get_catalog().get(tmdb_id)
+    
+    # Verificar si tenemos la temporada en el Gist
+    if not series_data or not series_data.get('seasons'):
+        return None, False, {'error': 'series_not_available', 'suggestion': 'request_series'}
+    
+    season_data = series_data['seasons'].get(str(season))
+    
+    if not season_data or not (season_data.get('listen_url') or season_data.get('firestore_docs')):
+        return None, False, {'error': 'season_not_available', 'suggestion': 'request_season'}
+    
+    season_result, shared = link_flight.do(
+        cache_key,
+        lambda: _scrape_season(tmdb_id, season, season_data, cache_key, start_time),
+        check=lambda: get_from_cache(cache_key)
+    )
+    
+    if season_result.get('error'):
+        return None, False, {'error': 'scraping_failed', 'details': season_result['error']}
+    
+    return season_result, shared, None
+
+
+def _expected_episodes(tmdb_id, season, deadline):
+    """Cantidad de episodios de la temporada según TMDB (cacheado), o None"""
+    try:
+        data = tmdb_client.get_json(
+            f'tv/{tmdb_id}/season/{season}',
+            params={'language': 'es-ES'},
+            timeout=5,
+            deadline=deadline
+        )
+        return len(data.get('episodes', [])) or None
+    except Exception as e:
+        print(f"No se pudo obtener la temporada {season} de {tmdb_id} en TMDB: {e}")
+        return None
+
+
+def _extract_zonahack(entry, docs_key, deadline=None):
+    """
+    Links de ZonaHack para una entrada del Gist (película o temporada).
+    Si se conocen los documentos de Firestore (del Gist o aprendidos de un
+    Listen anterior) se leen directo por batchGet; si no, canal Listen.
+    """
+    document_names = entry.get('firestore_docs') or get_from_cache(docs_key)
+    result = scraper_registry.get(ZonaHackScraper).extract_links(
+        url=entry.get('zonahack_url', ''),
+        listen_url=entry.get('listen_url'),
+        document_names=document_names,
+        deadline=deadline
+    )
+    if result['success'] and result.get('mode') == 'listen' and result.get('documents'):
+        set_cache(docs_key, result['documents'], minutes=ZONAHACK_DOCS_TTL_MINUTES)
+    return result
+
+
+def _scrape_season(tmdb_id, season, season_data, cache_key, start_time):
+    """
+    Scrapea una temporada completa de ZonaHack y la cachea.
+    Devuelve los datos cacheados o {'error': ...} si falló el scraping.
+    """
+    # Mismo límite que las películas: el canal Listen no puede pasarse
+    deadline = time.monotonic() + LINKS_DEADLINE
+    
+    # Episodios esperados: del Gist o de TMDB, pedidos mientras se scrapea
+    expected = season_data.get('episodes')
+    expected_future = None
+    if not expected:
+        tmdb_deadline = min(deadline, time.monotonic() + 5)
+        expected_future = source_executor.submit(_expected_episodes, tmdb_id, season, tmdb_deadline)
+    
+    result = _extract_zonahack(season_data, f"zonahack_docs_{tmdb_id}_s{season}", deadline)
+    
+    if expected_future is not None:
+        try:
+            expected = expected_future.result(timeout=max(0, tmdb_deadline - time.monotonic()))
+        except FutureTimeoutError:
+            expected = None
+    
+    if not result['success']:
+        return {'error': result.get('error')}
+    
+    # Normalizar UNA vez: episodio -> links (cada documento de ZonaHack
+    # es un episodio y su 'nombre' trae el número)
+    season_index = build_season_index(result['links'], expected_episodes=expected)
+    season_index['source'] = 'gist_zonahack'
+    season_index['cache_time'] = (datetime.now() - start_time).total_seconds()
+    
+    # Cachear TODA la temporada (smart caching)
+    set_cache(cache_key, season_index, minutes=LINKS_CACHE_MINUTES)
+    
+    return season_index
+
+
+def prewarm_targets():
+    """
+    Películas y temporadas del Gist con fuente ZonaHack, para el
+    pre-calentado. Refrescan por el mismo single-flight que los pedidos
+    interactivos, así un usuario que llega durante el refresco lo espera
+    en vez de scrapear de nuevo.
+    """
+    targets = []
+    for tmdb_id, entry in get_catalog().raw.items():
+        if not isinstance(entry, dict):
+            continue
+        if entry.get('listen_url') or entry.get('firestore_docs'):
+            key = f"links_{tmdb_id}"
+            targets.append(WarmTarget(key, 'zonahack', _movie_refresher(tmdb_id, key)))
+        for season, season_data in (entry.get('seasons') or {}).items():
+            if not str(season).isdigit() or not isinstance(season_data, dict):
+                continue
+            if season_data.get('listen_url') or season_data.get('firestore_docs'):
+                key = f"season_index_{tmdb_id}_s{season}"
+                targets.append(WarmTarget(key, 'zonahack', _season_refresher(tmdb_id, int(season), season_data, key)))
+    return targets
+
+
+def _movie_refresher(tmdb_id, cache_key):
+    # Sin auto_scrape: solo se mantiene el contenido verificado
+    return lambda: link_flight.do(
+        f"{cache_key}|auto=False",
+        lambda: _resolve_movie_links(tmdb_id, cache_key, False, datetime.now())
+    )[0]
+
+
+def _season_refresher(tmdb_id, season, season_data, cache_key):
+    return lambda: link_flight.do(
+        cache_key,
+        lambda: _scrape_season(tmdb_id, season, season_data, cache_key, datetime.now())
+    )[0]
+
+
+prewarmer = PreWarmer(
+    cache_backend,
+    prewarm_targets,
+    budget_seconds=config.PREWARM_BUDGET_SECONDS,
+    max_refreshes=config.PREWARM_MAX_REFRESHES,
+    refresh_before=config.PREWARM_REFRESH_BEFORE_SECONDS,
+    rate_per_second=config.PREWARM_RATE_PER_SECOND
+)
+
+
 @movies_bp.route('/api/request', methods=['POST'])
 def request_content():
     """
@@ -633,26 +809,19 @@ def get_stats():
     Estadísticas generales del contenido disponible
     """
     try:
-        gist_db = fetch_gist_db()
-        
-        movies_count = sum(1 for item in gist_db.values() if item.get('type') == 'movie')
-        series_count = sum(1 for item in gist_db.values() if item.get('type') == 'series')
-        
-        # Contar temporadas totales
-        total_seasons = 0
-        for item in gist_db.values():
-            if item.get('type') == 'series' and item.get('seasons'):
-                total_seasons += len(item['seasons'])
+        # Estadísticas precalculadas al cargar el Gist
+        stats = dict(get_catalog().stats)
+        stats['last_updated'] = gist_service.loaded_at.isoformat() if gist_service.loaded_at else None
         
         return jsonify({
             'success': True,
-            'stats': {
-                'total_movies': movies_count,
-                'total_series': series_count,
-                'total_seasons': total_seasons,
-                'total_content': movies_count + series_count,
-                'last_updated': gist_cache_expiry.isoformat() if gist_cache_expiry else None
-            }
+            'stats': stats,
+            'gist': gist_service.status(),
+            'cache': cache_backend.stats(),
+            'single_flight': link_flight.stats(),
+            'prewarm': prewarmer.last_report,
+            'scrapers': circuit_breakers.scoreboard(),
+            'tmdb_cache': tmdb_client.cache.stats() if tmdb_client.cache else None
         })
         
     except Exception as e:
@@ -1,41 +1,112 @@
 from flask import jsonify, request
 from routes import series_bp
-from database import get_connection
+from database import get_connection, count_rows, search as search_table
+import base64
+import json
 from services.tmdb_service import tmdb_service
 
+# Orden del listado: clave de cada fila (values), condición "después de
+# esta clave" (after) y orden, todo sobre el índice que lo cubre. La de
+# rating no usa (a, b) < (?, ?): SQLite no la convierte en rango sobre un
+# índice de expresión y terminaría recorriéndolo desde el principio
+SERIES_SORTS = {
+    'id': {
+        'size': 1,
+        'values': lambda row: [row['id']],
+        'after': 's.id > ?',
+        'after_params': lambda last_id: [last_id],
+        'order_by': 's.id'
+    },
+    'rating': {
+        'size': 2,
+        'values': lambda row: [row['rating'] if row['rating'] is not None else -1, row['id']],
+        'after': 'IFNULL(s.rating, -1) <= ? AND (IFNULL(s.rating, -1) < ? OR s.id < ?)',
+        'after_params': lambda rating, last_id: [rating, rating, last_id],
+        'order_by': 'IFNULL(s.rating, -1) DESC, s.id DESC'
+    },
+}
+
+def _encode_cursor(sort, last_row):
+    """Cursor opaco: orden + clave de la última fila, en base64 url-safe"""
+    payload = json.dumps([sort] + SERIES_SORTS[sort]['values'](last_row), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor, sort):
+    """Clave del cursor, o None si no es válido (o es de otro orden)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        return None
+    expected = SERIES_SORTS[sort]['size']
+    if (not isinstance(values, list) or len(values) != expected + 1 or values[0] != sort
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values[1:])):
+        return None
+    return values[1:]
+
 @series_bp.route('/series', methods=['GET'])
 def get_all_series():
-    """Obtener todas las series"""
-    page = request.args.get('page', 1, type=int)
+    """
+    Obtener todas las series, paginadas por cursor
+    
+    ?sort=id|rating  orden (rating: mejor puntuadas primero)
+    ?cursor=...      next_cursor de la página anterior
+    ?page=N          paginación vieja por OFFSET (más lenta en páginas altas)
+    """
     limit = 20
-    offset = (page - 1) * limit
+    sort = request.args.get('sort', 'id')
+    if sort not in SERIES_SORTS:
+        return jsonify({'error': 'sort debe ser id o rating'}), 400
     
-    conn = get_connection()
-    cursor = conn.cursor()
+    cursor_param = request.args.get('cursor')
+    after = None
+    if cursor_param:
+        after = _decode_cursor(cursor_param, sort)
+        if after is None:
+            return jsonify({'error': 'Cursor inválido'}), 400
     
-    cursor.execute('''
-        SELECT s.*, GROUP_CONCAT(l.url, '||') as links
+    page = request.args.get('page', type=int)
+    offset = (page - 1) * limit if page and page > 1 and not cursor_param else 0
+    
+    conn = get_connection()
+    order = SERIES_SORTS[sort]
+    where, params = '', []
+    if after is not None:
+        # Keyset: seguir desde la última fila vista (usa el índice, no
+        # recorre las páginas anteriores como OFFSET)
+        where = f"WHERE {order['after']}"
+        params = order['after_params'](*after)
+    
+    # Primero la página de series y después los links de ESAS series
+    # (por idx_links_content), no un GROUP BY sobre todo el JOIN
+    rows = conn.execute(f'''
+        SELECT s.*, (
+            SELECT GROUP_CONCAT(l.url, '||') FROM links l
+            WHERE l.content_type = 'series' AND l.content_id = s.id
+        ) as links
         FROM series s
-        LEFT JOIN links l ON s.id = l.content_id AND l.content_type = 'series'
-        GROUP BY s.id
+        {where}
+        ORDER BY {order['order_by']}
         LIMIT ? OFFSET ?
-    ''', (limit, offset))
-    
-    series_list = []
-    for row in cursor.fetchall():
-        series_list.append(dict(row))
-    
-    cursor.execute('SELECT COUNT(*) as total FROM series')
-    total = cursor.fetchone()['total']
+    ''', params + [limit + 1, offset]).fetchall()
     
+    total = count_rows(conn, 'series')
     conn.close()
     
-    return jsonify({
+    has_more = len(rows) > limit
+    series_list = [dict(row) for row in rows[:limit]]
+    next_cursor = _encode_cursor(sort, series_list[-1]) if has_more else None
+    
+    response = {
         'series': series_list,
         'total': total,
-        'page': page,
-        'per_page': limit
-    })
+        'per_page': limit,
+        'sort': sort,
+        'next_cursor': next_cursor
+    }
+    if page and not cursor_param:
+        response['page'] = page
+    return jsonify(response)
 
 @series_bp.route('/series/<int:series_id>', methods=['GET'])
 def get_series(series_id):
@@ -68,15 +139,7 @@ def search_series():
         return jsonify({'error': 'Búsqueda muy corta'}), 400
     
     conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM series
-        WHERE title LIKE ? OR description LIKE ?
-        LIMIT 20
-    ''', (f'%{query}%', f'%{query}%'))
-    
-    series_list = [dict(row) for row in cursor.fetchall()]
+    series_list = [dict(row) for row in search_table(conn, 'series', query, limit=20)]
     conn.close()
     
     return jsonify(series_list)
@@ -86,11 +149,8 @@ def get_trending_series():
     """Obtener series tendencia"""
     results = tmdb_service.get_trending_series('week')
     
-    series_list = []
-    for item in results:
-        series_details = tmdb_service.get_series_details(item['id'])
-        if series_details:
-            series_list.append(series_details)
+    details, _ = tmdb_service.get_many_details([item['id'] for item in results], 'tv')
+    series_list = [series_details for series_details in details if series_details]
     
     return jsonify(series_list)
 
@@ -99,10 +159,7 @@ def get_popular_series():
     """Obtener series más populares"""
     results = tmdb_service.get_popular_series()
     
-    series_list = []
-    for item in results:
-        series_details = tmdb_service.get_series_details(item['id'])
-        if series_details:
-            series_list.append(series_details)
+    details, _ = tmdb_service.get_many_details([item['id'] for item in results], 'tv')
+    series_list = [series_details for series_details in details if series_details]
     
     return jsonify(series_list)
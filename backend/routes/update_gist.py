@@ -7,6 +7,7 @@ Uso: python update_gist.py
 import requests
 import json
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -49,6 +50,28 @@ def update_gist_content(content, filename='movies.json'):
     response.raise_for_status()
     return response.json()
 
+def capture_firestore_docs(listen_url):
+    """
+    Lee el canal Listen una vez para guardar los nombres de los documentos
+    de Firestore. Con ellos la API los lee directo (batchGet) y no depende
+    de que el listen_url siga vivo.
+    """
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+        from services.scrapers import ZonaHackScraper, scraper_registry
+        result = scraper_registry.get(ZonaHackScraper).extract_links(url='', listen_url=listen_url)
+    except Exception as e:
+        print(f"⚠️  No se pudieron leer los documentos de Firestore: {e}")
+        return []
+    
+    if not result['success']:
+        print(f"⚠️  No se pudieron leer los documentos de Firestore: {result.get('error')}")
+        return []
+    
+    docs = result.get('documents', [])
+    print(f"🔗 {len(docs)} documentos de Firestore ({result['total']} links)")
+    return docs
+
 def get_tmdb_movie_info(tmdb_id):
     """Obtiene información de una película desde TMDB"""
     response = requests.get(
@@ -113,6 +136,8 @@ def add_movie():
         print("❌ listen_url es requerido")
         return
     
+    firestore_docs = capture_firestore_docs(listen_url)
+    
     # Paso 4: Crear entrada
     entry = {
         'tmdb_id': tmdb_id,
@@ -122,6 +147,7 @@ def add_movie():
         'poster_path': movie_info.get('poster_path'),
         'zonahack_url': zonahack_url,
         'listen_url': listen_url,
+        'firestore_docs': firestore_docs,
         'status': 'verified',
         'added_at': datetime.now().isoformat(),
         'updated_at': datetime.now().isoformat()
@@ -197,6 +223,8 @@ def add_series_season():
         print("❌ listen_url es requerido")
         return
     
+    firestore_docs = capture_firestore_docs(listen_url)
+    
     # Paso 4: Crear/actualizar entrada
     print("\n📥 Cargando Gist actual...")
     content, filename = get_gist_content()
@@ -225,6 +253,7 @@ def add_series_season():
         'episodes': len(season_info['episodes']),
         'zonahack_url': zonahack_url,
         'listen_url': listen_url,
+        'firestore_docs': firestore_docs,
         'added_at': datetime.now().isoformat()
     }
     
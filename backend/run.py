@@ -1,7 +1,9 @@
 import os
 import sys
 from app import app
+from services.scheduler import scheduler
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
+    scheduler.start()
     app.run(host='0.0.0.0', port=port)
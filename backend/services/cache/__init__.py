@@ -0,0 +1,33 @@
+from config import config
+from .base import CacheBackend
+from .memory import MemoryCache
+from .sqlite import SQLiteCache
+from .redis import RedisCache
+from .singleflight import SingleFlight
+
+__all__ = [
+    'CacheBackend',
+    'MemoryCache',
+    'SQLiteCache',
+    'RedisCache',
+    'SingleFlight',
+    'create_cache_backend'
+]
+
+
+def create_cache_backend(kind=None) -> CacheBackend:
+    """Crea el backend configurado en CACHE_BACKEND (memory | sqlite | redis)"""
+    kind = (kind or config.CACHE_BACKEND).lower()
+    compress_min_bytes = config.CACHE_COMPRESS_MIN_KB * 1024
+
+    if kind == 'sqlite':
+        return SQLiteCache(config.CACHE_SQLITE_PATH, compress_min_bytes=compress_min_bytes)
+    if kind == 'redis':
+        return RedisCache(config.REDIS_URL, compress_min_bytes=compress_min_bytes)
+    if kind != 'memory':
+        print(f"CACHE_BACKEND desconocido '{kind}', usando memory")
+
+    return MemoryCache(
+        max_bytes=config.CACHE_MAX_MB * 1024 * 1024,
+        compress_min_bytes=compress_min_bytes
+    )
@@ -0,0 +1,55 @@
+import json
+import zlib
+from abc import ABC, abstractmethod
+
+# Prefijos del formato serializado (backends compartidos)
+_RAW = b'j'
+_ZLIB = b'z'
+
+# Lo que puede tirar encode_value/decode_value (valor no serializable,
+# fila corrupta o truncada): los backends lo tratan como miss / no-op
+SERIALIZATION_ERRORS = (TypeError, ValueError, zlib.error)
+
+
+class CacheBackend(ABC):
+    """Interfaz común para los backends de cache de get_from_cache/set_cache"""
+
+    name = 'base'
+
+    @abstractmethod
+    def get(self, key):
+        """Devuelve el valor o None si no existe / expiró"""
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl_seconds):
+        """Guarda un valor JSON-serializable durante ttl_seconds"""
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        pass
+
+    @abstractmethod
+    def ttl_remaining(self, key):
+        """Segundos de vida que le quedan a una entrada (None si no existe)"""
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+def encode_value(value, compress_min_bytes=0) -> bytes:
+    """Serializa a JSON y comprime con zlib si supera compress_min_bytes"""
+    raw = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+    if compress_min_bytes and len(raw) >= compress_min_bytes:
+        return _ZLIB + zlib.compress(raw, 6)
+    return _RAW + raw
+
+
+def decode_value(data: bytes):
+    """Inverso de encode_value"""
+    if data[:1] == _ZLIB:
+        return json.loads(zlib.decompress(data[1:]))
+    return json.loads(data[1:])
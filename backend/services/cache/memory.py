@@ -0,0 +1,205 @@
+"""
+Cache en memoria acotado por tamaño (LRU + TTL).
+
+- Presupuesto en bytes repartido entre N "stripes", cada una con su propio
+  lock, así los hilos de gunicorn no se pisan entre sí.
+- Expulsión LRU cuando una stripe supera su presupuesto.
+- Barrido de expirados amortizado (cada sweep_interval segundos por stripe).
+- Las entradas grandes que llevan un rato sin leerse se comprimen con zlib
+  (p. ej. mapas de links de una temporada completa).
+"""
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from .base import CacheBackend
+
+# Factor aproximado entre el tamaño en memoria de un valor y su JSON
+PY_OBJECT_OVERHEAD = 3
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'size', 'compressed', 'last_access')
+
+    def __init__(self, value, expires_at, size):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.compressed = False
+        self.last_access = time.monotonic()
+
+
+class _Stripe:
+    def __init__(self, max_bytes):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.last_sweep = time.monotonic()
+        # Contadores por stripe (se suman en stats()) para no compartir un lock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.compressions = 0
+
+
+class MemoryCache(CacheBackend):
+    """Backend en proceso: rápido pero propio de cada worker"""
+
+    name = 'memory'
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, stripes=16,
+                 compress_min_bytes=32 * 1024, cold_seconds=120, sweep_interval=30):
+        self.max_bytes = max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.cold_seconds = cold_seconds
+        self.sweep_interval = sweep_interval
+        self._stripes = [_Stripe(max_bytes // stripes) for _ in range(stripes)]
+
+    # === API pública ===
+
+    def get(self, key):
+        """Devuelve el valor o None si no existe / expiró"""
+        stripe = self._stripe_for(key)
+        now = time.monotonic()
+
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                stripe.misses += 1
+                return None
+            if now >= entry.expires_at:
+                self._remove(stripe, key)
+                stripe.misses += 1
+                stripe.expirations += 1
+                return None
+
+            stripe.entries.move_to_end(key)
+            entry.last_access = now
+            stripe.hits += 1
+            value = entry.value
+            compressed = entry.compressed
+
+        if compressed:
+            return json.loads(zlib.decompress(value))
+        return value
+
+    def set(self, key, value, ttl_seconds):
+        """Guarda un valor JSON-serializable durante ttl_seconds"""
+        size = self._estimate_size(key, value)
+        stripe = self._stripe_for(key)
+        now = time.monotonic()
+
+        with stripe.lock:
+            if key in stripe.entries:
+                self._remove(stripe, key)
+
+            # Un valor más grande que la stripe entera no se cachea
+            if size > stripe.max_bytes:
+                return False
+
+            stripe.entries[key] = _Entry(value, now + ttl_seconds, size)
+            stripe.used_bytes += size
+
+            if now - stripe.last_sweep >= self.sweep_interval:
+                self._sweep(stripe, now)
+            self._evict(stripe)
+        return True
+
+    def delete(self, key):
+        stripe = self._stripe_for(key)
+        with stripe.lock:
+            if key in stripe.entries:
+                self._remove(stripe, key)
+
+    def ttl_remaining(self, key):
+        """Segundos de vida que le quedan a una entrada (None si no existe)"""
+        stripe = self._stripe_for(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                return None
+            remaining = entry.expires_at - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def clear(self):
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.used_bytes = 0
+
+    def sweep(self):
+        """Barre expirados en todas las stripes (y comprime entradas frías)"""
+        now = time.monotonic()
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._sweep(stripe, now)
+
+    def stats(self) -> dict:
+        totals = dict.fromkeys(
+            ('entries', 'used_bytes', 'hits', 'misses', 'evictions', 'expirations', 'compressions'), 0
+        )
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals['entries'] += len(stripe.entries)
+                totals['used_bytes'] += stripe.used_bytes
+                for name in ('hits', 'misses', 'evictions', 'expirations', 'compressions'):
+                    totals[name] += getattr(stripe, name)
+
+        lookups = totals['hits'] + totals['misses']
+        totals['backend'] = self.name
+        totals['max_bytes'] = self.max_bytes
+        totals['hit_rate'] = round(totals['hits'] / lookups, 3) if lookups else None
+        return totals
+
+    # === Internos (se llaman con el lock de la stripe tomado) ===
+
+    def _stripe_for(self, key):
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    @staticmethod
+    def _estimate_size(key, value):
+        try:
+            payload = len(json.dumps(value, separators=(',', ':'), default=str))
+        except (TypeError, ValueError):
+            payload = len(repr(value))
+        # Los dicts/listas de Python ocupan ~3x su JSON (medido con
+        # benchmarks/bench_memory_cache.py), + overhead de entrada y clave
+        return payload * PY_OBJECT_OVERHEAD + len(key) + 120
+
+    def _remove(self, stripe, key):
+        entry = stripe.entries.pop(key)
+        stripe.used_bytes -= entry.size
+
+    def _evict(self, stripe):
+        while stripe.used_bytes > stripe.max_bytes and stripe.entries:
+            _, entry = stripe.entries.popitem(last=False)
+            stripe.used_bytes -= entry.size
+            stripe.evictions += 1
+
+    def _sweep(self, stripe, now):
+        stripe.last_sweep = now
+        expired = [k for k, e in stripe.entries.items() if now >= e.expires_at]
+        for key in expired:
+            self._remove(stripe, key)
+        stripe.expirations += len(expired)
+
+        if not self.compress_min_bytes:
+            return
+        for entry in stripe.entries.values():
+            if (not entry.compressed and entry.size >= self.compress_min_bytes
+                    and now - entry.last_access >= self.cold_seconds):
+                self._compress(stripe, entry)
+
+    def _compress(self, stripe, entry):
+        raw = json.dumps(entry.value, separators=(',', ':'), default=str).encode('utf-8')
+        packed = zlib.compress(raw, 6)
+        new_size = entry.size - len(raw) * PY_OBJECT_OVERHEAD + len(packed)
+        entry.value = packed
+        entry.compressed = True
+        stripe.used_bytes += new_size - entry.size
+        entry.size = new_size
+        stripe.compressions += 1
@@ -0,0 +1,214 @@
+"""
+Backend de cache sobre el protocolo de Redis (RESP).
+
+Cliente mínimo sin dependencias: solo usa GET / SET PX / DEL / PTTL, así
+funciona contra Redis, Valkey, KeyDB o el servidor falso de
+benchmarks/fake_redis.py. Mantiene un pool pequeño de sockets; tras un
+fork el pool se descarta. Cualquier error de red se trata como miss para
+que una caída de Redis no tumbe la API.
+"""
+import os
+import queue
+import socket
+import threading
+from urllib.parse import urlparse, unquote
+
+from .base import CacheBackend, encode_value, decode_value, SERIALIZATION_ERRORS
+
+
+class RedisError(Exception):
+    """Respuesta de error (-ERR ...) del servidor"""
+    pass
+
+
+class _Connection:
+    def __init__(self, host, port, timeout):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.sock.makefile('rb')
+
+    def close(self):
+        try:
+            self.rfile.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+    def send(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.sock.sendall(b''.join(parts))
+
+    def read_reply(self):
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError('Conexión cerrada por el servidor')
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self.rfile.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            if count == -1:
+                return None
+            return [self.read_reply() for _ in range(count)]
+        raise ConnectionError(f'Respuesta RESP inválida: {line!r}')
+
+
+class RedisCache(CacheBackend):
+    name = 'redis'
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='yuubi:',
+                 timeout=2, pool_size=8, compress_min_bytes=32 * 1024):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.prefix = prefix
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.compress_min_bytes = compress_min_bytes
+
+        self._pool = queue.LifoQueue()
+        self._pid = os.getpid()
+
+        self._counters_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    # === Conexiones ===
+
+    def _acquire(self):
+        if os.getpid() != self._pid:
+            # Los sockets heredados del padre no se comparten entre procesos
+            self._pool = queue.LifoQueue()
+            self._pid = os.getpid()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._open()
+
+    def _release(self, conn):
+        if self._pool.qsize() < self.pool_size:
+            self._pool.put(conn)
+        else:
+            conn.close()
+
+    def _open(self):
+        conn = _Connection(self.host, self.port, self.timeout)
+        try:
+            if self.password:
+                if self.username:
+                    conn.send('AUTH', self.username, self.password)
+                else:
+                    conn.send('AUTH', self.password)
+                conn.read_reply()
+            if self.db:
+                conn.send('SELECT', self.db)
+                conn.read_reply()
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def execute(self, *args):
+        """Ejecuta un comando y devuelve la respuesta"""
+        conn = self._acquire()
+        try:
+            conn.send(*args)
+            reply = conn.read_reply()
+        except RedisError:
+            self._release(conn)
+            raise
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn)
+        return reply
+
+    # === API ===
+
+    def get(self, key):
+        try:
+            data = self.execute('GET', self.prefix + key)
+        except (OSError, ConnectionError, RedisError) as e:
+            self._count('errors')
+            print(f"RedisCache get error: {e}")
+            return None
+
+        if data is None:
+            self._count('misses')
+            return None
+        try:
+            value = decode_value(data)
+        except SERIALIZATION_ERRORS as e:
+            self._count('errors')
+            print(f"RedisCache: entrada corrupta en '{key}', se descarta: {e}")
+            self.delete(key)
+            return None
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl_seconds):
+        try:
+            data = encode_value(value, self.compress_min_bytes)
+            self.execute('SET', self.prefix + key, data, 'PX', max(int(ttl_seconds * 1000), 1))
+        except (OSError, ConnectionError, RedisError) + SERIALIZATION_ERRORS as e:
+            self._count('errors')
+            print(f"RedisCache set error: {e}")
+            return False
+        self._count('writes')
+        return True
+
+    def delete(self, key):
+        try:
+            self.execute('DEL', self.prefix + key)
+        except (OSError, ConnectionError, RedisError) as e:
+            self._count('errors')
+            print(f"RedisCache delete error: {e}")
+
+    def ttl_remaining(self, key):
+        try:
+            ms = self.execute('PTTL', self.prefix + key)
+        except (OSError, ConnectionError, RedisError):
+            return None
+        # -2: no existe, -1: sin expiración
+        if ms is None or ms == -2:
+            return None
+        if ms == -1:
+            return float('inf')
+        return ms / 1000
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.name,
+            'server': f'{self.host}:{self.port}/{self.db}',
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'writes': self.writes,
+            'errors': self.errors,
+            'pooled_connections': self._pool.qsize()
+        }
+
+    def _count(self, name):
+        with self._counters_lock:
+            setattr(self, name, getattr(self, name) + 1)
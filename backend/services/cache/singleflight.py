@@ -0,0 +1,146 @@
+"""
+Single-flight: coalescencia de misses concurrentes sobre la misma key.
+
+Dentro del proceso, el primer hilo que pide una key ejecuta la función y
+el resto espera y recibe el mismo resultado. Entre workers se usa un lock
+de archivo (fcntl.flock): el worker que consigue el lock vuelve a mirar el
+cache compartido antes de ejecutar, así si otro worker acaba de llenarlo
+no se scrapea de nuevo. Las keys se reparten en `lock_stripes` archivos
+fijos (no uno por key, que nunca se borraban): dos keys del mismo stripe
+se esperan entre sí, nada más. Sin fcntl (Windows) solo se coalesce en
+proceso.
+"""
+import hashlib
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, lock_dir=None, lock_timeout=30, poll_interval=0.05, lock_stripes=256):
+        self.lock_dir = lock_dir
+        self.lock_stripes = lock_stripes
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        self.executions = 0
+        self.coalesced = 0
+        self.recheck_hits = 0
+
+        if self.lock_dir and fcntl:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn, check=None):
+        """
+        Ejecuta fn() una sola vez para todas las llamadas concurrentes con key.
+
+        Args:
+            key: identificador de la operación (p. ej. la cache key)
+            fn: función sin argumentos que hace el trabajo caro
+            check: función opcional que devuelve el resultado si otro worker
+                   ya lo dejó en el cache compartido (o None)
+
+        Returns:
+            (resultado, shared): shared es True si el resultado lo produjo
+            otra llamada (otro hilo u otro worker)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            with self._lock:
+                self.coalesced += 1
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        shared = False
+        try:
+            call.result, shared = self._run_leader(key, fn, check)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, shared
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'recheck_hits': self.recheck_hits,
+                'in_flight': len(self._calls),
+                'cross_worker': bool(self.lock_dir and fcntl)
+            }
+
+    # === Internos ===
+
+    def _run_leader(self, key, fn, check):
+        lock_file = None
+        if self.lock_dir and fcntl:
+            lock_file = self._acquire_file_lock(key)
+        try:
+            # Volver a mirar el cache: otro worker (o un hilo que terminó
+            # justo antes de que llegáramos) pudo haberlo llenado
+            if check is not None:
+                existing = check()
+                if existing is not None:
+                    with self._lock:
+                        self.recheck_hits += 1
+                    return existing, True
+            return self._execute(fn), False
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+    def _execute(self, fn):
+        with self._lock:
+            self.executions += 1
+        return fn()
+
+    def _acquire_file_lock(self, key):
+        """Lock exclusivo del stripe de la key; si no llega en lock_timeout se sigue sin él"""
+        # sha1 y no hash(): tiene que dar el mismo stripe en todos los workers
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        stripe = int.from_bytes(digest[:4], 'big') % self.lock_stripes
+        path = os.path.join(self.lock_dir, f'flight-{stripe:03d}.lock')
+        lock_file = open(path, 'a+')
+
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    print(f"SingleFlight: timeout esperando lock de '{key}', se ejecuta igual")
+                    lock_file.close()
+                    return None
+                time.sleep(self.poll_interval)
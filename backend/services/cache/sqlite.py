@@ -0,0 +1,164 @@
+"""
+Backend de cache en un archivo SQLite (modo WAL).
+
+Lo comparten todos los workers de gunicorn del mismo host y sobrevive a
+reinicios. Una conexión por hilo (y por proceso: tras un fork se abre una
+nueva). Los expirados se borran de a lotes cada sweep_every escrituras.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from .base import CacheBackend, encode_value, decode_value, SERIALIZATION_ERRORS
+
+# Errores de la BD o del archivo (directorio sin permisos, disco lleno...):
+# el cache nunca le tira un error al pedido, cuenta como miss
+STORAGE_ERRORS = (sqlite3.Error, OSError)
+
+
+class SQLiteCache(CacheBackend):
+    name = 'sqlite'
+
+    def __init__(self, path, compress_min_bytes=32 * 1024, sweep_every=500, busy_timeout=5):
+        self.path = path
+        self.compress_min_bytes = compress_min_bytes
+        self.sweep_every = sweep_every
+        self.busy_timeout = busy_timeout
+
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+        self._counters_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    # === Conexiones ===
+
+    def _connection(self):
+        if os.getpid() != self._pid:
+            # Proceso hijo (fork de gunicorn): no reutilizar conexiones del padre
+            self._local = threading.local()
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._ensure_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self, conn):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at)')
+            self._schema_ready = True
+
+    # === API ===
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+        except STORAGE_ERRORS as e:
+            self._count('errors')
+            print(f"SQLiteCache get error: {e}")
+            return None
+
+        if row is None or row[1] <= time.time():
+            self._count('misses')
+            return None
+
+        try:
+            value = decode_value(row[0])
+        except SERIALIZATION_ERRORS as e:
+            self._count('errors')
+            print(f"SQLiteCache: entrada corrupta en '{key}', se descarta: {e}")
+            self.delete(key)
+            return None
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl_seconds):
+        try:
+            data = encode_value(value, self.compress_min_bytes)
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, data, time.time() + ttl_seconds)
+            )
+        except STORAGE_ERRORS + SERIALIZATION_ERRORS as e:
+            self._count('errors')
+            print(f"SQLiteCache set error: {e}")
+            return False
+
+        self._count('writes')
+        if self.writes % self.sweep_every == 0:
+            self.sweep()
+        return True
+
+    def delete(self, key):
+        try:
+            self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        except STORAGE_ERRORS as e:
+            self._count('errors')
+            print(f"SQLiteCache delete error: {e}")
+
+    def ttl_remaining(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+        except STORAGE_ERRORS:
+            return None
+        if row is None:
+            return None
+        remaining = row[0] - time.time()
+        return remaining if remaining > 0 else None
+
+    def sweep(self):
+        """Borra las entradas expiradas"""
+        try:
+            self._connection().execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+        except STORAGE_ERRORS as e:
+            print(f"SQLiteCache sweep error: {e}")
+
+    def stats(self) -> dict:
+        entries = None
+        try:
+            entries = self._connection().execute(
+                'SELECT COUNT(*) FROM cache WHERE expires_at > ?', (time.time(),)
+            ).fetchone()[0]
+        except STORAGE_ERRORS:
+            pass
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'writes': self.writes,
+            'errors': self.errors
+        }
+
+    def _count(self, name):
+        with self._counters_lock:
+            setattr(self, name, getattr(self, name) + 1)
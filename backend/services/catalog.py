@@ -0,0 +1,96 @@
+"""
+Snapshot indexado del Gist DB.
+
+Se construye UNA vez cada vez que el Gist se (re)carga y después solo se
+lee, así los endpoints hacen búsquedas O(1) en lugar de recorrer todo el
+catálogo en cada request. Nunca se modifica: para actualizar se crea uno
+nuevo y se reemplaza la referencia (asignación atómica en CPython).
+"""
+from datetime import datetime
+
+POSTER_BASE_URL = "https://image.tmdb.org/t/p/w500"
+
+
+class CatalogSnapshot:
+    """Vista de solo lectura del Gist DB con índices precalculados"""
+
+    def __init__(self, gist_db: dict, loaded_at: datetime = None):
+        self.raw = gist_db or {}
+        self.loaded_at = loaded_at or datetime.now()
+
+        # Índice de ids disponibles (siempre como string, igual que el Gist).
+        # El Gist se edita a mano: una entrada que no es un dict se ignora
+        # en vez de tirar abajo todo el snapshot
+        self.tmdb_ids = frozenset(str(k) for k, item in self.raw.items() if isinstance(item, dict))
+
+        movies = []
+        series = []
+        season_counts = {}
+        available_seasons = {}
+
+        for tmdb_id, item in self.raw.items():
+            if not isinstance(item, dict):
+                continue
+            item_type = item.get('type')
+            if item_type == 'movie':
+                movies.append((tmdb_id, item))
+            elif item_type == 'series':
+                series.append((tmdb_id, item))
+                seasons = item.get('seasons') or {}
+                season_counts[str(tmdb_id)] = len(seasons)
+                available_seasons[str(tmdb_id)] = frozenset(str(s) for s in seasons.keys())
+
+        # Más recientes primero, igual que list_content() en update_gist.py
+        movies.sort(key=lambda pair: pair[1].get('added_at', ''), reverse=True)
+        series.sort(key=lambda pair: pair[1].get('added_at', ''), reverse=True)
+
+        self.movies = tuple(self._build_card(tmdb_id, item) for tmdb_id, item in movies)
+        self.series = tuple(self._build_card(tmdb_id, item) for tmdb_id, item in series)
+        self.season_counts = season_counts
+        self._available_seasons = available_seasons
+
+        total_seasons = sum(season_counts.values())
+        self.stats = {
+            'total_movies': len(self.movies),
+            'total_series': len(self.series),
+            'total_seasons': total_seasons,
+            'total_content': len(self.movies) + len(self.series)
+        }
+
+    @staticmethod
+    def _build_card(tmdb_id, item):
+        """Tarjeta lista para devolver en /api/home"""
+        return {
+            'tmdb_id': int(tmdb_id),
+            'title': item['title'],
+            'poster': f"{POSTER_BASE_URL}{item.get('poster_path', '')}",
+            'has_links': True,
+            'source': 'verified'
+        }
+
+    def __len__(self):
+        return len(self.tmdb_ids)
+
+    def __bool__(self):
+        return bool(self.tmdb_ids)
+
+    def has(self, tmdb_id) -> bool:
+        """True si el título está en el Gist"""
+        return str(tmdb_id) in self.tmdb_ids
+
+    def get(self, tmdb_id):
+        """Entrada cruda del Gist (o None)"""
+        item = self.raw.get(str(tmdb_id))
+        return item if isinstance(item, dict) else None
+
+    def has_season(self, tmdb_id, season) -> bool:
+        """True si la temporada de la serie está en el Gist"""
+        return str(season) in self._available_seasons.get(str(tmdb_id), ())
+
+    def available_seasons(self, tmdb_id):
+        """Números de temporada con links en el Gist, ordenados"""
+        seasons = self._available_seasons.get(str(tmdb_id), ())
+        return sorted(int(s) for s in seasons if s.isdigit())
+
+
+EMPTY_CATALOG = CatalogSnapshot({})
@@ -0,0 +1,103 @@
+"""
+Índice episodio -> links de una temporada.
+
+Se arma UNA vez por scrape de temporada y se guarda así en el cache:
+después cualquier episodio es un dict lookup. El número de episodio sale
+del nombre del documento de ZonaHack ("Serie 1x05", "S01E05",
+"Episodio 5"...) con patrones precompilados, validado contra la cantidad
+de episodios de la temporada en TMDB cuando se conoce. Cada documento es
+un episodio: se agrupa por documento, no por nombre.
+"""
+import re
+
+# En orden de confianza: el primero que da un número válido gana
+EPISODE_PATTERNS = [
+    re.compile(r'(?<!\d)(\d{1,2})\s*x\s*(\d{1,4})(?!\d)', re.IGNORECASE),          # 1x05 (no 1080x720)
+    re.compile(r's(\d{1,2})\s*e(\d{1,4})', re.IGNORECASE),                       # S01E05
+    re.compile(r'(?:episodio|cap[ií]tulo|cap\.?|ep\.?)\s*(\d{1,4})', re.IGNORECASE),  # Episodio 5
+]
+# "... 5": solo si se sabe cuántos episodios tiene la temporada (si no,
+# un año como "2019" pasaría por episodio)
+TRAILING_NUMBER = re.compile(r'(?<!\d)(\d{1,3})\s*$')
+
+
+def resolve_episode(name, expected_episodes=None):
+    """
+    Número de episodio a partir del nombre del documento, o None.
+    Con expected_episodes se descartan números fuera de rango (p. ej. un
+    "1x100" mal cargado), se prueba el siguiente patrón y, como último
+    recurso, el número al final del nombre.
+    """
+    if not name:
+        return None
+    patterns = EPISODE_PATTERNS + [TRAILING_NUMBER] if expected_episodes else EPISODE_PATTERNS
+    for pattern in patterns:
+        match = pattern.search(name)
+        if not match:
+            continue
+        episode = int(match.group(match.lastindex))
+        if episode < 1:
+            continue
+        if expected_episodes and episode > expected_episodes:
+            continue
+        return episode
+    return None
+
+
+def build_season_index(links, expected_episodes=None):
+    """
+    Agrupa los links de una temporada por episodio.
+
+    Args:
+        links: links de ZonaHackScraper (con 'document' y 'nombre')
+        expected_episodes: episodios de la temporada según TMDB/Gist
+
+    Returns:
+        dict: {'episodes': {"5": {'episode', 'links', 'total'}},
+               'episode_numbers', 'expected_episodes', 'unresolved'}
+    """
+    # documento -> (nombre, links), en el orden en que llegaron
+    by_document = {}
+    anonymous = 0
+    previous = None
+    for link in links:
+        key = link.get('document')
+        if key is None:
+            # Sin nombre de documento: los links de un mismo documento
+            # vienen seguidos, un cambio de nombre es otro documento
+            if not (isinstance(previous, tuple) and previous[1] == link.get('nombre')):
+                anonymous += 1
+            key = (anonymous, link.get('nombre'))
+        previous = key
+        by_document.setdefault(key, (link.get('nombre'), []))[1].append({
+            'server': link['server'],
+            'url': link['url'],
+            'language': link['language']
+        })
+
+    episodes = {}
+    unresolved = []
+    for name, document_links in by_document.values():
+        episode = resolve_episode(name, expected_episodes)
+        if episode is None:
+            unresolved.append(document_links)
+        else:
+            episodes.setdefault(episode, []).extend(document_links)
+
+    # Sin número reconocible: se asignan en orden a los episodios libres
+    next_episode = 1
+    for document_links in unresolved:
+        while next_episode in episodes:
+            next_episode += 1
+        episodes[next_episode] = document_links
+
+    numbers = sorted(episodes)
+    return {
+        'episodes': {
+            str(ep): {'episode': ep, 'links': episodes[ep], 'total': len(episodes[ep])}
+            for ep in numbers
+        },
+        'episode_numbers': numbers,
+        'expected_episodes': expected_episodes,
+        'unresolved': len(unresolved)
+    }
@@ -0,0 +1,166 @@
+"""
+Gist DB con stale-while-revalidate.
+
+Cuando el snapshot vence se sigue sirviendo el anterior mientras UN solo
+hilo en segundo plano lo refresca (con If-None-Match, así un Gist sin
+cambios cuesta un 304). Si el refresco falla se mantiene el último
+snapshot bueno, hasta un máximo de antigüedad (max_stale). Si falla la
+carga inicial se responde con el catálogo vacío y se reintenta en segundo
+plano cada retry_seconds, sin bloquear cada pedido con el timeout.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from services.catalog import CatalogSnapshot, EMPTY_CATALOG
+
+
+class GistService:
+    def __init__(self, url, ttl_minutes=30, max_stale_minutes=360,
+                 timeout=10, retry_seconds=60):
+        self.url = url
+        self.ttl = ttl_minutes * 60
+        self.max_stale = max_stale_minutes * 60
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+
+        self.catalog = EMPTY_CATALOG
+        self.etag = None
+        self.loaded_at = None        # datetime del último 200/304 (para mostrar)
+        self._fresh_at = None        # time.monotonic() del último 200/304
+        self._last_attempt = None    # time.monotonic() del último intento
+        self._failed_at = None       # time.monotonic() del último intento fallido
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    # === API pública ===
+
+    def get_catalog(self) -> CatalogSnapshot:
+        """Devuelve el snapshot vigente sin bloquear salvo en frío"""
+        if self._fresh_at is None:
+            if self._failed_at is None:
+                # Arranque en frío: no hay nada que servir, hay que esperar
+                self._refresh_sync()
+            else:
+                # La carga inicial falló: reintentar en segundo plano (con
+                # backoff) y responder ya con el catálogo vacío
+                self._refresh_async()
+            return self.catalog
+
+        age = time.monotonic() - self._fresh_at
+        if age < self.ttl:
+            return self.catalog
+
+        if age < self.max_stale:
+            self._refresh_async()
+            return self.catalog
+
+        # Más viejo que max_stale: intentar en línea y, si no hay
+        # suerte, no servir datos fuera del límite
+        self._refresh_sync()
+        if time.monotonic() - self._fresh_at < self.max_stale:
+            return self.catalog
+        return EMPTY_CATALOG
+
+    def get_raw(self) -> dict:
+        """Gist crudo (dict tmdb_id -> entrada)"""
+        return self.get_catalog().raw
+
+    def status(self) -> dict:
+        """Estado del cache para diagnóstico"""
+        age = time.monotonic() - self._fresh_at if self._fresh_at is not None else None
+        return {
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'age_seconds': round(age, 1) if age is not None else None,
+            'stale': age is not None and age >= self.ttl,
+            'refreshing': self._refreshing,
+            'failing': self._failed_at is not None,
+            'etag': self.etag,
+            'entries': len(self.catalog)
+        }
+
+    # === Refresco ===
+
+    def _refresh_async(self):
+        """Lanza un refresco en segundo plano si no hay otro en curso"""
+        with self._lock:
+            if self._refreshing or not self._can_retry():
+                return
+            self._refreshing = True
+            self._last_attempt = time.monotonic()
+
+        thread = threading.Thread(target=self._run_refresh, name='gist-refresh', daemon=True)
+        thread.start()
+
+    def _refresh_sync(self):
+        """Refresca en el hilo actual; si ya hay uno en curso, lo espera"""
+        with self._lock:
+            if self._refreshing:
+                owner = False
+            elif not self._can_retry():
+                return
+            else:
+                self._refreshing = True
+                self._last_attempt = time.monotonic()
+                owner = True
+
+        if owner:
+            self._run_refresh()
+            return
+
+        # Otro hilo ya está pidiendo el Gist: esperar su resultado
+        deadline = time.monotonic() + self.timeout + 1
+        while self._refreshing and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _can_retry(self):
+        """Evita martillar GitHub tras un fallo"""
+        if self._last_attempt is None:
+            return True
+        return time.monotonic() - self._last_attempt >= self.retry_seconds
+
+    def _run_refresh(self):
+        try:
+            self._fetch()
+            self._failed_at = None
+        except Exception as e:
+            self._failed_at = time.monotonic()
+            print(f"Error fetching Gist (se mantiene el snapshot anterior): {e}")
+        finally:
+            self._refreshing = False
+
+    def _fetch(self):
+        headers = {}
+        if self.etag and self._fresh_at is not None:
+            headers['If-None-Match'] = self.etag
+
+        response = requests.get(self.url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304:
+            self._mark_fresh()
+            return
+
+        response.raise_for_status()
+        data = response.json()
+
+        # Construir antes de publicar: los lectores ven el snapshot viejo
+        # o el nuevo, nunca uno a medias
+        new_catalog = CatalogSnapshot(data)
+        etag = response.headers.get('ETag')
+        self.catalog = new_catalog
+        self.etag = etag
+        self._mark_fresh()
+
+    def _mark_fresh(self):
+        self._fresh_at = time.monotonic()
+        self.loaded_at = datetime.now()
+
+
+gist_service = GistService(
+    url=os.getenv('GIST_DB_URL'),
+    ttl_minutes=int(os.getenv('GIST_TTL_MINUTES', 30)),
+    max_stale_minutes=int(os.getenv('GIST_MAX_STALE_MINUTES', 360))
+)
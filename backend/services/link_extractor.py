@@ -1,18 +1,39 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 from .scrapers.pelisplushd import PelisPlusHDScraper
 from .scrapers.pelicinehd import PeliCineHDScraper
 from .scrapers.cuevana import CuevanaScraper
 from .scrapers.zonahack import ZonaHackScraper
+from .scrapers.registry import scraper_registry
+
+MODE_FIRST = 'first'    # devolver la fuente con links de mayor prioridad
+MODE_MERGE = 'merge'    # juntar los links de todas las que terminen a tiempo
+
+DEFAULT_DEADLINE = float(os.getenv('LINKS_DEADLINE', 25))  # Render corta a los ~30s
+
+# Pool compartido: las fuentes de un mismo pedido corren en paralelo
+source_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('LINK_EXTRACTOR_WORKERS', 16)),
+    thread_name_prefix='link-source'
+)
+
 
 class LinkExtractor:
     """Orquestador de scrapers"""
     
-    def __init__(self):
-        self.scrapers = [
-            PelisPlusHDScraper(),
-            PeliCineHDScraper(),
-            CuevanaScraper(),
-            ZonaHackScraper()
-        ]
+    scraper_classes = [
+        PelisPlusHDScraper,
+        PeliCineHDScraper,
+        CuevanaScraper,
+        ZonaHackScraper
+    ]
+    
+    @property
+    def scrapers(self):
+        # Del registro: mismas instancias (y sesiones) que usan las rutas
+        return [scraper_registry.get(cls) for cls in self.scraper_classes]
     
     def extract(self, url: str, listen_url: str = None) -> dict:
         """
@@ -38,5 +59,129 @@ class LinkExtractor:
             'links': [],
             'total': 0
         }
+    
+    def run(self, sources, mode: str = MODE_FIRST, deadline: float = None) -> dict:
+        """
+        Corre varias fuentes en paralelo bajo un único deadline
+        
+        Args:
+            sources: lista de (nombre, función sin argumentos que devuelve
+                     el dict de un scraper: success/links/total/error),
+                     de la más confiable a la menos
+            mode: MODE_FIRST (gana la de mayor prioridad con links: la de
+                  una fuente posterior se retiene hasta que todas las
+                  anteriores fallen o venza el deadline) o MODE_MERGE (se
+                  juntan los links de todas las que terminan antes del deadline)
+            deadline: límite (time.monotonic()) para todo el pedido; None =
+                      DEFAULT_DEADLINE segundos desde ahora. Las fuentes
+                      tienen que recibir el mismo deadline para cortar solas
+        
+        Returns:
+            dict: success, links, total, source (la ganadora o las que
+            aportaron), sources (estado y tiempo de cada una), elapsed
+        """
+        start = time.monotonic()
+        deadline = start + DEFAULT_DEADLINE if deadline is None else deadline
+        status = {name: {'status': 'pending'} for name, _ in sources}
+        futures = {
+            source_executor.submit(self._timed, fn): name
+            for name, fn in sources
+        }
+        
+        results = {}
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                result, elapsed, error = future.result()
+                status[name] = self._source_status(result, elapsed, error)
+                if status[name]['status'] == 'ok':
+                    results[name] = result
+            if mode == MODE_FIRST:
+                winner = self._first_by_priority(sources, status)
+        
+        if mode == MODE_FIRST and winner is None and results:
+            # Venció el deadline con fuentes mejores sin terminar: la mejor
+            # de las que sí devolvieron links
+            winner = next(name for name, _ in sources if name in results)
+        
+        # Lo que sigue corriendo se descarta; termina solo al vencer el
+        # deadline que recibió la fuente
+        expired = time.monotonic() >= deadline
+        for future in pending:
+            name = futures[future]
+            status[name] = {'status': 'timeout' if expired or not winner else 'abandoned'}
+        
+        elapsed = round(time.monotonic() - start, 3)
+        if winner:
+            links = results[winner]['links']
+            contributors = [winner]
+        else:
+            # Merge en el orden de las fuentes (la primera es la preferida)
+            contributors = [name for name, _ in sources if name in results]
+            links = self._merge([results[name]['links'] for name in contributors])
+        
+        response = {
+            'success': bool(links),
+            'links': links,
+            'total': len(links),
+            'source': contributors[0] if len(contributors) == 1 else contributors,
+            'sources': status,
+            'elapsed': elapsed
+        }
+        if not links:
+            response['error'] = 'Ninguna fuente devolvió links'
+        return response
+    
+    @staticmethod
+    def _first_by_priority(sources, status):
+        """
+        La primera fuente con links, si todas las anteriores ya terminaron
+        sin links; None mientras alguna mejor siga corriendo
+        """
+        for name, _ in sources:
+            if status[name]['status'] == 'ok':
+                return name
+            if status[name]['status'] == 'pending':
+                return None
+        return None
+    
+    @staticmethod
+    def _timed(fn):
+        start = time.monotonic()
+        try:
+            return fn(), time.monotonic() - start, None
+        except Exception as e:
+            return None, time.monotonic() - start, e
+    
+    @staticmethod
+    def _source_status(result, elapsed, error):
+        entry = {'elapsed': round(elapsed, 3)}
+        if error is not None:
+            entry.update(status='error', error=str(error))
+        elif result is None:
+            entry['status'] = 'skipped'
+        elif result.get('success') and result.get('links'):
+            entry.update(status='ok', total=len(result['links']))
+        else:
+            entry.update(status='empty', error=result.get('error'))
+        return entry
+    
+    @staticmethod
+    def _merge(link_lists):
+        """Une listas de links sin repetir URLs"""
+        seen = set()
+        merged = []
+        for links in link_lists:
+            for link in links:
+                if link['url'] not in seen:
+                    seen.add(link['url'])
+                    merged.append(link)
+        return merged
 
 link_extractor = LinkExtractor()
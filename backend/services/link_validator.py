@@ -0,0 +1,240 @@
+"""
+Verificación en lote de los links guardados en la BD.
+
+Toma los links vencidos (SCRAPER_RETRY_DAYS días sin un resultado claro, o
+nunca chequeados), los verifica en paralelo con la misma regla que
+ScraperService.validate_link (utils.helpers.check_link) y un tope de
+requests simultáneos por host (los hosters cortan o rate-limitean si les
+llegan muchos juntos), y escribe los resultados en transacciones de
+`batch_size` filas con executemany.
+
+Cada intento queda en last_attempt_at, también los que no dan respuesta
+clara (timeout, 429/5xx): esos se reintentan a las retry_hours en vez de
+quedar primeros en todas las pasadas. Un link que falla la conexión
+(DNS, host caído) max_connect_failures veces seguidas pasa a roto.
+
+Uso (desde backend/):
+    python -m services.link_validator [--limit 500] [--dry-run]
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from config import config
+from database import get_connection, init_db
+from services.scraper_service import scraper_service
+from utils.helpers import LINK_ACTIVE as ACTIVE, LINK_BROKEN as BROKEN, LINK_UNKNOWN as UNKNOWN
+
+
+class LinkValidator:
+    def __init__(self, workers=16, per_host=4, batch_size=200, timeout=5, retry_days=None,
+                 retry_hours=None, max_connect_failures=None):
+        self.workers = workers
+        self.per_host = per_host
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.retry_days = config.SCRAPER_RETRY_DAYS if retry_days is None else retry_days
+        self.retry_hours = config.LINK_VALIDATOR_RETRY_HOURS if retry_hours is None else retry_hours
+        self.max_connect_failures = (config.LINK_VALIDATOR_MAX_CONNECT_FAILURES
+                                     if max_connect_failures is None else max_connect_failures)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def due_links(self, limit=None):
+        """
+        (id, url) de los links a re-verificar: primero los nunca intentados
+        y después del intento más viejo al más nuevo. Filtra en SQL, por
+        idx_links_last_attempt, sin traer la tabla entera.
+        """
+        conn = get_connection()
+        try:
+            never = conn.execute(
+                'SELECT id, url FROM links WHERE last_attempt_at IS NULL ORDER BY id LIMIT ?',
+                (limit or -1,)
+            ).fetchall()
+            remaining = limit - len(never) if limit else -1
+            if remaining == 0:
+                return [tuple(row) for row in never]
+            retried = conn.execute('''
+                SELECT id, url FROM links
+                WHERE last_attempt_at < datetime('now', ?)
+                  AND (checked_at IS NULL OR checked_at < datetime('now', ?))
+                ORDER BY last_attempt_at LIMIT ?
+            ''', (f'-{self.retry_hours} hours', f'-{self.retry_days} days', remaining)).fetchall()
+            return [tuple(row) for row in never + retried]
+        finally:
+            conn.close()
+
+    def check(self, url) -> dict:
+        """
+        Verifica un link (ScraperService.link_status)
+
+        Returns:
+            dict: status (active/broken/unknown), http_status, latency_ms, error
+        """
+        with self._slot(urlsplit(url).hostname or ''):
+            start = time.monotonic()    # sin contar la espera por el cupo del host
+            status, http_status, error = scraper_service.link_status(url, timeout=self.timeout)
+        return self._result(status, http_status, start, error)
+
+    def run(self, limit=None, dry_run=False) -> dict:
+        """
+        Verifica los links vencidos y escribe los resultados
+
+        Args:
+            limit: máximo de links en esta pasada (None = todos los vencidos)
+            dry_run: hace los requests pero no escribe nada (para medir)
+
+        Returns:
+            dict: reporte con conteos, throughput y latencias
+        """
+        links = self.due_links(limit)
+        start = time.monotonic()
+        counts = defaultdict(int)
+        latencies = []
+        by_host = defaultdict(list)
+        pending = []
+        written = 0
+
+        conn = None if dry_run else get_connection()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='link-check') as pool:
+                futures = {
+                    pool.submit(self.check, url): (link_id, url)
+                    for link_id, url in _interleave_hosts(links)
+                }
+                for future in as_completed(futures):
+                    link_id, url = futures[future]
+                    result = future.result()
+                    counts[result['status']] += 1
+                    latencies.append(result['latency_ms'])
+                    by_host[urlsplit(url).hostname or ''].append(result['latency_ms'])
+                    pending.append((result, link_id))
+                    if conn is not None and len(pending) >= self.batch_size:
+                        written += self._write(conn, pending)
+                        pending = []
+            if conn is not None and pending:
+                written += self._write(conn, pending)
+        finally:
+            if conn is not None:
+                conn.close()
+
+        elapsed = time.monotonic() - start
+        return {
+            'dry_run': dry_run,
+            'checked': len(links),
+            'active': counts[ACTIVE],
+            'broken': counts[BROKEN],
+            'unknown': counts[UNKNOWN],
+            'written': written,
+            'elapsed': round(elapsed, 3),
+            'checks_per_second': round(len(links) / elapsed, 1) if elapsed > 0 else None,
+            'latency_ms': {'p50': _percentile(latencies, 50), 'p95': _percentile(latencies, 95)},
+            'hosts': {
+                host: {'checked': len(values), 'p95_ms': _percentile(values, 95)}
+                for host, values in sorted(by_host.items(), key=lambda item: -len(item[1]))
+            }
+        }
+
+    def _write(self, conn, results):
+        """Una transacción por lote"""
+        checked, connect_failed, inconclusive = [], [], []
+        for result, link_id in results:
+            if result['status'] != UNKNOWN:
+                checked.append((result['status'], result['latency_ms'], link_id))
+            elif result['error'] == 'ConnectionError':
+                connect_failed.append((self.max_connect_failures, BROKEN, link_id))
+            else:
+                inconclusive.append((link_id,))
+        with conn:
+            conn.executemany('''
+                UPDATE links SET status = ?, checked_at = CURRENT_TIMESTAMP,
+                    last_attempt_at = CURRENT_TIMESTAMP, check_latency_ms = ?, failed_checks = 0
+                WHERE id = ?
+            ''', checked)
+            # El N-ésimo fallo de conexión seguido lo da por roto
+            conn.executemany('''
+                UPDATE links SET failed_checks = failed_checks + 1, last_attempt_at = CURRENT_TIMESTAMP,
+                    status = CASE WHEN failed_checks + 1 >= ?1 THEN ?2 ELSE status END,
+                    checked_at = CASE WHEN failed_checks + 1 >= ?1 THEN CURRENT_TIMESTAMP ELSE checked_at END
+                WHERE id = ?3
+            ''', connect_failed)
+            conn.executemany(
+                'UPDATE links SET last_attempt_at = CURRENT_TIMESTAMP WHERE id = ?', inconclusive
+            )
+        return len(results)
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+        return slot
+
+    @staticmethod
+    def _result(status, http_status, start, error=None):
+        return {
+            'status': status,
+            'http_status': http_status,
+            'latency_ms': int((time.monotonic() - start) * 1000),
+            'error': error
+        }
+
+
+def _interleave_hosts(links):
+    """
+    Reparte los links por host en ronda: así los workers no se quedan
+    todos esperando el cupo del mismo hoster mientras otros están libres
+    """
+    queues = defaultdict(deque)
+    for link_id, url in links:
+        queues[urlsplit(url).hostname or ''].append((link_id, url))
+    rounds = deque(queues.values())
+    while rounds:
+        queue = rounds.popleft()
+        yield queue.popleft()
+        if queue:
+            rounds.append(queue)
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+link_validator = LinkValidator(
+    workers=config.LINK_VALIDATOR_WORKERS,
+    per_host=config.LINK_VALIDATOR_PER_HOST
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica los links vencidos de la BD')
+    parser.add_argument('--limit', type=int, default=None, help='máximo de links a verificar')
+    parser.add_argument('--workers', type=int, default=link_validator.workers)
+    parser.add_argument('--per-host', type=int, default=link_validator.per_host)
+    parser.add_argument('--dry-run', action='store_true', help='no escribe, solo reporta throughput')
+    args = parser.parse_args()
+
+    init_db()
+    validator = LinkValidator(workers=args.workers, per_host=args.per_host)
+    report = validator.run(limit=args.limit, dry_run=args.dry_run)
+
+    print(f"{'(dry-run) ' if report['dry_run'] else ''}{report['checked']} links en {report['elapsed']}s "
+          f"({report['checks_per_second'] or 0} checks/s)")
+    print(f"  activos: {report['active']}  rotos: {report['broken']}  "
+          f"sin respuesta clara: {report['unknown']}  escritos: {report['written']}")
+    print(f"  latencia p50: {report['latency_ms']['p50']} ms  p95: {report['latency_ms']['p95']} ms")
+    if report['hosts']:
+        print(f"\n  {'host':<32} {'links':>6} {'p95 (ms)':>9}")
+        for host, row in report['hosts'].items():
+            print(f"  {host:<32} {row['checked']:>6} {row['p95_ms']:>9}")
+
+
+if __name__ == '__main__':
+    main()
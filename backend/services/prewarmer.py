@@ -0,0 +1,117 @@
+"""
+Pre-calentado del cache de links del catálogo verificado.
+
+Sin esto el primer usuario que abre un título del Gist paga el scrape
+completo de ZonaHack. El job recorre los objetivos (cada película y cada
+temporada del Gist), mira cuánto le queda a su entrada en el cache y
+refresca las que faltan o vencen dentro de `refresh_before` segundos,
+las más urgentes primero.
+
+Cada corrida tiene un presupuesto (segundos y cantidad de refrescos) y
+cada upstream un ritmo máximo, para no competir con el tráfico real ni
+llamar la atención del sitio. El RateLimiter es del proceso: el job se
+programa como exclusivo (ver services/scheduler.py) para que corra en un
+solo worker y el ritmo no se multiplique por la cantidad de workers.
+"""
+import threading
+import time
+from collections import namedtuple
+
+# key: cache key a mantener; upstream: a quién se le pega (para el ritmo);
+# refresh: función sin argumentos que scrapea y guarda en el cache
+WarmTarget = namedtuple('WarmTarget', ['key', 'upstream', 'refresh'])
+
+
+class RateLimiter:
+    """Un request cada 1/rate segundos por upstream"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1 / rate_per_second if rate_per_second else 0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, upstream, deadline=None) -> bool:
+        """Espera el turno; False si el turno cae después del deadline"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(upstream, now))
+            if deadline is not None and slot > deadline:
+                return False
+            self._next[upstream] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return True
+
+
+class PreWarmer:
+    def __init__(self, cache, targets, budget_seconds=120, max_refreshes=50,
+                 refresh_before=600, rate_per_second=1.0, failure_cooldown=1800):
+        """
+        Args:
+            cache: backend de cache (con ttl_remaining)
+            targets: función que devuelve la lista de WarmTarget vigente
+            budget_seconds: tiempo máximo por corrida
+            max_refreshes: refrescos máximos por corrida
+            refresh_before: refrescar si a la entrada le quedan menos segundos
+            rate_per_second: requests por segundo a cada upstream
+            failure_cooldown: segundos sin reintentar un objetivo que falló
+                              (si no, los rotos se comen el presupuesto)
+        """
+        self.cache = cache
+        self.targets = targets
+        self.budget_seconds = budget_seconds
+        self.max_refreshes = max_refreshes
+        self.refresh_before = refresh_before
+        self.limiter = RateLimiter(rate_per_second)
+        self.failure_cooldown = failure_cooldown
+        self._failed_at = {}
+        self.last_report = None
+
+    def due(self):
+        """Objetivos a refrescar, los que faltan o vencen antes primero"""
+        due = []
+        now = time.monotonic()
+        for target in self.targets():
+            failed_at = self._failed_at.get(target.key)
+            if failed_at is not None and now - failed_at < self.failure_cooldown:
+                continue
+            remaining = self.cache.ttl_remaining(target.key)
+            if remaining is None:
+                due.append((0, target))
+            elif remaining < self.refresh_before:
+                due.append((remaining, target))
+        due.sort(key=lambda item: item[0])
+        return [target for _, target in due]
+
+    def run(self) -> dict:
+        start = time.monotonic()
+        deadline = start + self.budget_seconds
+        due = self.due()
+        refreshed, failed = 0, 0
+        errors = {}
+
+        for target in due:
+            if refreshed + failed >= self.max_refreshes or time.monotonic() >= deadline:
+                break
+            if not self.limiter.wait(target.upstream, deadline):
+                break
+            try:
+                result = target.refresh()
+                if isinstance(result, dict) and (result.get('error') or result.get('success') is False):
+                    raise Exception(result.get('error') or 'sin links')
+                refreshed += 1
+                self._failed_at.pop(target.key, None)
+            except Exception as e:
+                failed += 1
+                errors[target.key] = str(e)
+                self._failed_at[target.key] = time.monotonic()
+
+        self.last_report = {
+            'due': len(due),
+            'refreshed': refreshed,
+            'failed': failed,
+            'remaining': len(due) - refreshed - failed,
+            'elapsed': round(time.monotonic() - start, 3),
+            'errors': dict(list(errors.items())[:10])
+        }
+        return self.last_report
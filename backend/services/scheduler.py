@@ -0,0 +1,126 @@
+"""
+Jobs periódicos en segundo plano (APScheduler).
+
+Con gunicorn cada worker importa la app y arma su propio scheduler. Para
+que un job exclusivo corra en un solo proceso, el primer worker que toma
+su lock de archivo (fcntl.flock, no bloqueante) se lo queda mientras
+viva; en los demás cada ejecución se saltea. Si ese worker muere el lock
+se libera y lo toma otro en su próxima vuelta.
+
+El scheduler se arranca en cada worker después del fork (post_fork en
+gunicorn.conf.py): un hilo arrancado en el master con --preload no
+sobrevive al fork. Sin apscheduler instalado los jobs no se programan y
+solo se pueden correr a mano (CLI).
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+try:
+    from apscheduler.schedulers.background import BackgroundScheduler
+except ImportError:  # pragma: no cover - dependencia opcional en desarrollo
+    BackgroundScheduler = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from config import config
+
+
+class JobScheduler:
+    def __init__(self, lock_dir=None):
+        self.lock_dir = lock_dir
+        self._scheduler = None
+        self._pid = None
+        self._jobs = {}
+        self._held = {}     # job_id -> archivo con el lock que tiene este proceso
+        self._lock = threading.Lock()
+
+    def add_job(self, job_id, fn, minutes, first_run_seconds=60, exclusive=True):
+        """
+        Programa fn() cada `minutes` minutos (la primera a los
+        first_run_seconds, para no competir con el arranque del worker).
+        exclusive=False deja que cada worker lo corra (p. ej. si trabaja
+        sobre algo propio del worker y barato).
+        """
+        with self._lock:
+            self._jobs[job_id] = {
+                'fn': fn, 'minutes': minutes, 'exclusive': exclusive, 'runs': 0, 'skipped': 0,
+                'last_run': None, 'last_elapsed': None, 'last_result': None, 'last_error': None
+            }
+            if self._scheduler is not None:
+                self._schedule(job_id, minutes, first_run_seconds)
+
+    def start(self):
+        if BackgroundScheduler is None:
+            print("apscheduler no está instalado: jobs en segundo plano desactivados")
+            return
+        with self._lock:
+            if self._scheduler is not None and self._pid == os.getpid():
+                return
+            # Heredado del padre por un fork: su hilo y sus locks no son nuestros
+            self._held = {}
+            self._pid = os.getpid()
+            self._scheduler = BackgroundScheduler(daemon=True)
+            for job_id, job in self._jobs.items():
+                self._schedule(job_id, job['minutes'], 60)
+            self._scheduler.start()
+
+    def _schedule(self, job_id, minutes, first_run_seconds):
+        self._scheduler.add_job(
+            self.run_job, 'interval', args=[job_id], id=job_id, minutes=minutes,
+            next_run_time=datetime.now() + timedelta(seconds=first_run_seconds),
+            max_instances=1, coalesce=True, replace_existing=True
+        )
+
+    def run_job(self, job_id):
+        """Corre un job ya registrado si le toca a este proceso"""
+        job = self._jobs[job_id]
+        if job['exclusive'] and not self._is_leader(job_id):
+            job['skipped'] += 1
+            return None
+        start = time.monotonic()
+        try:
+            job['last_result'] = job['fn']()
+            job['last_error'] = None
+            return job['last_result']
+        except Exception as e:
+            job['last_error'] = str(e)
+            print(f"Job '{job_id}' falló: {e}")
+        finally:
+            job['runs'] += 1
+            job['last_run'] = datetime.now().isoformat()
+            job['last_elapsed'] = round(time.monotonic() - start, 3)
+
+    def _is_leader(self, job_id):
+        """True si este proceso tiene (o acaba de tomar) el lock del job"""
+        if job_id in self._held:
+            return True
+        if not (self.lock_dir and fcntl):
+            return True
+        os.makedirs(self.lock_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.lock_dir, f'job-{job_id}.lock'), 'a+')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # Se mantiene abierto: el lock dura lo que dure el proceso
+        self._held[job_id] = lock_file
+        return True
+
+    def stats(self) -> dict:
+        return {
+            'running': self._scheduler is not None and self._pid == os.getpid(),
+            'leader_of': sorted(self._held),
+            'jobs': {
+                job_id: {key: value for key, value in job.items() if key != 'fn'}
+                for job_id, job in self._jobs.items()
+            }
+        }
+
+
+scheduler = JobScheduler(config.SINGLEFLIGHT_LOCK_DIR)
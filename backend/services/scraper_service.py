@@ -1,4 +1,5 @@
-import requests
+from services.scrapers.registry import scraper_registry
+from utils.helpers import check_link, LINK_ACTIVE
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin, urlparse
@@ -10,12 +11,17 @@ class ScraperService:
         }
         self.timeout = 10
     
+    @property
+    def session(self):
+        # Sesión compartida del proceso (conexiones reutilizadas entre búsquedas)
+        return scraper_registry.session()
+    
     def scrape_pelisplushd(self, query):
         """Scrappear pelisplushd.mx"""
         links = []
         try:
             search_url = f"https://pelisplushd.mx/?s={query}"
-            response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(search_url, headers=self.headers, timeout=self.timeout)
             response.encoding = 'utf-8'
             # Cambio aquí: usa html.parser en lugar de lxml
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -39,7 +45,7 @@ class ScraperService:
         links = []
         try:
             search_url = f"https://pelicinehd.com/?s={query}"
-            response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(search_url, headers=self.headers, timeout=self.timeout)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -62,7 +68,7 @@ class ScraperService:
         links = []
         try:
             search_url = f"https://www.cuevana.is/?s={query}"
-            response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(search_url, headers=self.headers, timeout=self.timeout)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -99,10 +105,10 @@ class ScraperService:
     
     def validate_link(self, url):
         """Validar si un link sigue siendo válido"""
-        try:
-            response = requests.head(url, headers=self.headers, timeout=5, allow_redirects=True)
-            return response.status_code < 400
-        except:
-            return False
+        return self.link_status(url)[0] == LINK_ACTIVE
+
+    def link_status(self, url, headers=None, timeout=5):
+        """(estado, código HTTP, error) del link, con la sesión compartida (ver check_link)"""
+        return check_link(url, self.session, headers or self.headers, timeout)
 
 scraper_service = ScraperService()
@@ -2,10 +2,12 @@ from .pelisplushd import PelisPlusHDScraper
 from .pelicinehd import PeliCineHDScraper
 from .cuevana import CuevanaScraper
 from .zonahack import ZonaHackScraper
+from .registry import scraper_registry
 
 __all__ = [
     'PelisPlusHDScraper',
     'PeliCineHDScraper',
     'CuevanaScraper',
-    'ZonaHackScraper'
+    'ZonaHackScraper',
+    'scraper_registry'
 ]
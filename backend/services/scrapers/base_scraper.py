@@ -1,13 +1,48 @@
 import requests
 from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse
+import os
+import threading
 import time
 import random
+from .latency import domain_latency
+from .circuit import circuit_breakers, is_domain_failure
+from .registry import mount_pool
+
+try:
+    import lxml  # noqa: F401 - solo para saber si está instalado
+    FAST_PARSER = 'lxml'
+except ImportError:
+    FAST_PARSER = 'html.parser'
+
+# Hilos para los requests de respaldo (hedge) de get_html; el request
+# principal corre siempre en el hilo que llama
+hedge_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('SCRAPER_HEDGE_WORKERS', 8)),
+    thread_name_prefix='scraper-hedge'
+)
 
 class BaseScraper(ABC):
     """Clase base para todos los scrapers - Compatible con Render.com"""
     
+    backoff_base = 0.5          # segundos, se duplica por reintento (con jitter)
+    backoff_max = 4
+    min_attempt_seconds = 1     # no arrancar un intento con menos tiempo que esto
+    hedge_requests = os.getenv('SCRAPER_HEDGE', 'True') == 'True'
+    hedge_percentile = 95
+    # Con hedge, el principal se da por colgado si no lee nada en
+    # hedge_stall_factor x p95 (para entonces el respaldo ya salió)
+    hedge_stall_factor = 2
+    # Fallar al instante con dominios que vienen devolviendo 403/5xx/timeouts
+    circuit_breaker = os.getenv('SCRAPER_CIRCUIT_BREAKER', 'True') == 'True'
+    pool_maxsize = None         # conexiones por host (None = SCRAPER_POOL_MAXSIZE)
+    
     def __init__(self):
-        self.session = requests.Session()
+        # Una instancia por proceso (ver registry.py): la sesión y su pool
+        # de conexiones se reutilizan entre pedidos
+        self.session = mount_pool(requests.Session(), self.pool_maxsize)
         self._setup_session()
         self.timeout = 20  # Render tiene timeout de ~30s
     
@@ -41,53 +76,56 @@ class BaseScraper(ABC):
         """Extrae los links de la URL"""
         pass
     
-    def get_html(self, url: str, referer: str = None, retry: int = 2) -> str:
+    def get_html(self, url: str, referer: str = None, retry: int = 2,
+                 deadline: float = None, hedge: bool = None) -> str:
         """
         Obtiene el HTML de una URL con reintentos
         
         Args:
             url: URL a obtener
             referer: URL de referencia (opcional)
-            retry: Número de reintentos
+            retry: Número de intentos
+            deadline: límite para todo el pedido, reintentos incluidos
+                      (valor de time.monotonic()); None = sin límite
+            hedge: lanzar un segundo request si el primero supera el p95
+                   del dominio (None = self.hedge_requests)
         
         Returns:
             str: Contenido HTML
         """
-        headers = self.session.headers.copy()
-        
-        # Agregar referer si se proporciona
-        if referer:
-            headers['Referer'] = referer
-        else:
-            # Usar el dominio base como referer
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            headers['Referer'] = f"{parsed.scheme}://{parsed.netloc}/"
-        
-        headers['Sec-Fetch-Site'] = 'same-origin'
+        parsed = urlparse(url)
+        hedge = self.hedge_requests if hedge is None else hedge
+        user_agent = None
         
         last_error = None
         for attempt in range(retry):
+            if attempt > 0:
+                # Backoff exponencial con jitter, sin pasarse del deadline
+                delay = self._backoff_delay(attempt)
+                remaining = self._remaining(deadline)
+                if remaining is not None and remaining - delay < self.min_attempt_seconds:
+                    break
+                time.sleep(delay)
+            
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                break
+            
+            if self.circuit_breaker and not circuit_breakers.allow(parsed.netloc):
+                raise circuit_breakers.rejection(parsed.netloc)
+            
             try:
-                if attempt > 0:
-                    time.sleep(1)  # Pequeño delay entre reintentos
-                
-                response = self.session.get(
-                    url, 
-                    headers=headers,
-                    timeout=self.timeout,
-                    allow_redirects=True,
-                    verify=True  # Importante para Render
-                )
-                
+                headers = self._request_headers(parsed, referer, user_agent)
+                response = self._fetch(url, headers, timeout, parsed.netloc, hedge)
                 response.raise_for_status()
                 return response.text
                 
             except requests.exceptions.HTTPError as e:
                 last_error = e
                 if e.response.status_code == 403 and attempt < retry - 1:
-                    # Intentar con un User-Agent diferente
-                    self._rotate_user_agent()
+                    # Intentar con un User-Agent diferente (solo en este
+                    # pedido: la sesión es compartida entre hilos)
+                    user_agent = self._rotate_user_agent()
                     continue
                     
             except requests.exceptions.RequestException as e:
@@ -97,30 +135,171 @@ class BaseScraper(ABC):
         
         if last_error:
             raise Exception(f"Error obteniendo HTML: {last_error}")
+        if deadline is not None:
+            raise Exception("Error obteniendo HTML: sin tiempo antes del deadline")
         raise Exception("Error desconocido obteniendo HTML")
     
+    def _request_headers(self, parsed, referer=None, user_agent=None):
+        """Headers de un intento: los de la sesión más Referer y, si se rotó, el User-Agent"""
+        headers = self.session.headers.copy()
+        # Sin referer explícito se usa el dominio base
+        headers['Referer'] = referer or f"{parsed.scheme}://{parsed.netloc}/"
+        headers['Sec-Fetch-Site'] = 'same-origin'
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        return headers
+    
+    def _fetch(self, url, headers, timeout, domain, hedge):
+        """Un intento; con hedge si el dominio ya tiene latencias registradas"""
+        start = time.monotonic()
+        threshold = domain_latency.percentile(domain, self.hedge_percentile) if hedge else None
+        try:
+            if threshold is not None and threshold < timeout - self.min_attempt_seconds:
+                response = self._hedged_get(url, headers, timeout, threshold)
+            else:
+                response = self._get(url, headers, timeout)
+        except requests.exceptions.RequestException as e:
+            if self.circuit_breaker:
+                circuit_breakers.record(domain, False, error=type(e).__name__)
+            raise
+        elapsed = time.monotonic() - start
+        # Un 403/5xx rápido no es una latencia del sitio: solo las exitosas
+        # alimentan el umbral del hedge
+        if response.status_code < 400:
+            domain_latency.record(domain, elapsed)
+        if self.circuit_breaker:
+            failed = is_domain_failure(response.status_code)
+            circuit_breakers.record(domain, not failed, elapsed,
+                                    error=f"HTTP {response.status_code}" if failed else None)
+        return response
+    
+    def _get(self, url, headers, timeout):
+        return self.session.get(
+            url, 
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=True,
+            verify=True  # Importante para Render
+        )
+    
+    def _hedged_get(self, url, headers, timeout, threshold):
+        """
+        Lanza el request en este hilo; si no volvió en `threshold` segundos
+        lanza otro igual en hedge_executor. El principal usa un read timeout
+        de hedge_stall_factor x threshold: si quedó colgado se corta ahí y
+        se usa el respaldo.
+        """
+        start = time.monotonic()
+        state = {'done': False, 'hedge': None}
+        lock = threading.Lock()
+        
+        def launch_hedge():
+            with lock:
+                if not state['done']:
+                    state['hedge'] = hedge_executor.submit(self._get, url, headers, timeout - threshold)
+                    domain_latency.count_hedge()
+        
+        timer = threading.Timer(threshold, launch_hedge)
+        timer.daemon = True
+        timer.start()
+        primary_error = None
+        try:
+            response = self._get(url, headers, (timeout, min(timeout, threshold * self.hedge_stall_factor)))
+        except requests.exceptions.RequestException as e:
+            response, primary_error = None, e
+        finally:
+            timer.cancel()
+            with lock:
+                state['done'] = True
+                hedge = state['hedge']
+        
+        if primary_error is None:
+            if hedge is not None:
+                hedge.add_done_callback(_close_response)
+            return response
+        if hedge is None:
+            raise primary_error
+        
+        try:
+            response = hedge.result(timeout=max(0, start + timeout - time.monotonic()))
+        except FutureTimeoutError:
+            hedge.add_done_callback(_close_response)
+            raise requests.exceptions.Timeout(f"Sin respuesta de {url} en {timeout:.1f}s (con hedge)")
+        domain_latency.count_hedge(won=True)
+        return response
+    
+    def _remaining(self, deadline):
+        return None if deadline is None else deadline - time.monotonic()
+    
+    def _attempt_timeout(self, deadline):
+        """Timeout de un intento: el del scraper, recortado por el deadline (None = sin tiempo)"""
+        remaining = self._remaining(deadline)
+        if remaining is None:
+            return self.timeout
+        if remaining < self.min_attempt_seconds:
+            return None
+        return min(self.timeout, remaining)
+    
+    def _backoff_delay(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def parse_targets(self, html: str, strainer: SoupStrainer) -> BeautifulSoup:
+        """
+        Parsea solo los elementos que le interesan al scraper
+        
+        Con lxml + SoupStrainer no se construye el árbol de toda la página
+        (menús, tarjetas, scripts), solo el de los nodos que pasan el filtro.
+        Si no queda ninguno (HTML roto, lxml sin instalar, cambió el markup)
+        se vuelve al parseo completo con html.parser, como antes.
+        
+        Args:
+            html: HTML de la página
+            strainer: SoupStrainer con los elementos objetivo
+        
+        Returns:
+            BeautifulSoup: documento (parcial o completo)
+        """
+        if FAST_PARSER != 'html.parser':
+            try:
+                soup = BeautifulSoup(html, FAST_PARSER, parse_only=strainer)
+                if soup.find(True) is not None:
+                    return soup
+            except Exception as e:
+                print(f"Parseo parcial falló, se usa el completo: {e}")
+        return BeautifulSoup(html, 'html.parser')
+    
     def _rotate_user_agent(self):
-        """Rota entre diferentes User-Agents"""
+        """Elige otro User-Agent (no toca la sesión compartida)"""
         user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
         ]
-        self.session.headers['User-Agent'] = random.choice(user_agents)
+        return random.choice(user_agents)
     
-    def make_request(self, url: str, method: str = 'GET', **kwargs):
+    def make_request(self, url: str, method: str = 'GET', deadline: float = None, **kwargs):
         """
         Hace una petición HTTP con la sesión configurada
         
         Args:
             url: URL a solicitar
             method: Método HTTP (GET, POST, etc.)
+            deadline: límite (time.monotonic()) que recorta el timeout
             **kwargs: Argumentos adicionales para requests
         
         Returns:
             Response: Respuesta de la petición
         """
         if 'timeout' not in kwargs:
-            kwargs['timeout'] = self.timeout
-        return self.session.request(method, url, **kwargs)
\ No newline at end of file
+            kwargs['timeout'] = self._attempt_timeout(deadline)
+            if kwargs['timeout'] is None:
+                raise requests.exceptions.Timeout(f"Sin tiempo para pedir {url} antes del deadline")
+        return self.session.request(method, url, **kwargs)
+
+
+def _close_response(future):
+    """Libera la conexión del request que perdió el hedge"""
+    if future.exception() is None:
+        future.result().close()
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Circuit breaker por dominio para los scrapers.
+
+Cada dominio guarda el resultado de sus últimos requests. Si la tasa de
+error (403/429/5xx, timeouts, conexiones caídas o respuestas más lentas
+que `slow_seconds`) pasa el umbral, el circuito se ABRE y get_html falla
+al instante sin tocar la red. Pasado el enfriamiento queda MEDIO ABIERTO:
+se deja pasar un único request de prueba; si sale bien se CIERRA, si no
+se vuelve a abrir con el doble de espera (hasta `max_cooldown`).
+"""
+import threading
+import time
+from collections import deque
+
+from .latency import domain_latency
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Códigos que indican que el sitio (o su bloqueo a nuestra IP) está mal;
+# un 404 u otro 4xx es un problema de la URL, no del dominio
+FAILURE_STATUS = {403, 429}
+
+
+def is_domain_failure(status_code):
+    return status_code in FAILURE_STATUS or status_code >= 500
+
+
+class CircuitOpenError(Exception):
+    """El dominio tiene el circuito abierto: no se hizo ningún request"""
+
+    def __init__(self, domain, retry_in, last_error=None):
+        self.domain = domain
+        self.retry_in = retry_in
+        self.last_error = last_error
+        message = f"Error obteniendo HTML: circuito abierto para {domain} (reintento en {retry_in:.0f}s)"
+        if last_error:
+            message += f"; último error: {last_error}"
+        super().__init__(message)
+
+
+class _Circuit:
+    def __init__(self, window):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)    # True = falla
+        self.opened_at = None
+        self.trips = 0                          # aperturas seguidas (para el backoff)
+        self.probe_started = None
+        self.last_error = None
+        self.rejected = 0
+
+
+class CircuitBreakers:
+    def __init__(self, window=20, min_calls=5, error_rate=0.5, slow_seconds=10,
+                 cooldown=30, max_cooldown=300):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, domain):
+        circuit = self._circuits.get(domain)
+        if circuit is None:
+            circuit = self._circuits[domain] = _Circuit(self.window)
+        return circuit
+
+    def _cooldown(self, circuit):
+        return min(self.max_cooldown, self.cooldown * 2 ** max(0, circuit.trips - 1))
+
+    def _retry_in(self, circuit, now):
+        if circuit.state != OPEN:
+            return 0
+        return max(0, circuit.opened_at + self._cooldown(circuit) - now)
+
+    def allow(self, domain) -> bool:
+        """¿Se puede hacer un request a este dominio ahora?"""
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(domain)
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == OPEN and self._retry_in(circuit, now) > 0:
+                circuit.rejected += 1
+                return False
+            # Medio abierto: una sola prueba a la vez (si la anterior nunca
+            # reportó, se da por perdida después de un enfriamiento)
+            if (circuit.state == HALF_OPEN and circuit.probe_started is not None
+                    and now - circuit.probe_started < self._cooldown(circuit)):
+                circuit.rejected += 1
+                return False
+            circuit.state = HALF_OPEN
+            circuit.probe_started = now
+            return True
+
+    def record(self, domain, ok, seconds=None, error=None):
+        """
+        Resultado de un request al dominio
+
+        Args:
+            ok: respondió sin error de dominio (ver is_domain_failure)
+            seconds: latencia; más de slow_seconds cuenta como falla
+            error: descripción para el scoreboard
+        """
+        failed = not ok or (seconds is not None and seconds > self.slow_seconds)
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(domain)
+            if failed:
+                circuit.last_error = error or f'lento ({seconds:.1f}s)'
+
+            if circuit.state == HALF_OPEN:
+                if failed:
+                    self._trip(circuit, now)
+                else:
+                    circuit.state = CLOSED
+                    circuit.outcomes.clear()
+                    circuit.trips = 0
+                    circuit.probe_started = None
+                return
+
+            circuit.outcomes.append(failed)
+            if circuit.state == CLOSED and len(circuit.outcomes) >= self.min_calls:
+                if sum(circuit.outcomes) / len(circuit.outcomes) >= self.error_rate:
+                    self._trip(circuit, now)
+
+    def _trip(self, circuit, now):
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.trips += 1
+        circuit.probe_started = None
+
+    def rejection(self, domain) -> CircuitOpenError:
+        """Error para devolver cuando allow() dijo que no"""
+        with self._lock:
+            circuit = self._circuit(domain)
+            retry_in = self._retry_in(circuit, time.monotonic())
+            return CircuitOpenError(domain, retry_in, circuit.last_error)
+
+    def state(self, domain):
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            return circuit.state if circuit else CLOSED
+
+    def reset(self, domain=None):
+        """Olvida el historial de un dominio (o de todos)"""
+        with self._lock:
+            if domain is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(domain, None)
+
+    def scoreboard(self) -> dict:
+        """Estado, tasa de éxito y p95 de cada dominio"""
+        now = time.monotonic()
+        with self._lock:
+            rows = {}
+            for domain, circuit in self._circuits.items():
+                calls = len(circuit.outcomes)
+                failures = sum(circuit.outcomes)
+                rows[domain] = {
+                    'state': circuit.state,
+                    'success_rate': round(1 - failures / calls, 3) if calls else None,
+                    'calls': calls,
+                    'failures': failures,
+                    'rejected': circuit.rejected,
+                    'trips': circuit.trips,
+                    'retry_in': round(self._retry_in(circuit, now), 1),
+                    'last_error': circuit.last_error
+                }
+        for domain, row in rows.items():
+            row['p95'] = domain_latency.percentile(domain, 95)
+        return rows
+
+
+circuit_breakers = CircuitBreakers()
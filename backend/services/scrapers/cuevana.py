@@ -1,5 +1,8 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .hosters import detect_hoster, is_known_hoster
+
+IFRAME_STRAINER = SoupStrainer('iframe', {'src': True})
 
 class CuevanaScraper(BaseScraper):
     """Scraper para cuevana.biz"""
@@ -7,18 +10,18 @@ class CuevanaScraper(BaseScraper):
     def can_handle(self, url: str) -> bool:
         return 'cuevana' in url.lower()
     
-    def extract_links(self, url: str) -> dict:
+    def extract_links(self, url: str, deadline: float = None) -> dict:
         try:
-            html = self.get_html(url)
-            soup = BeautifulSoup(html, 'html.parser')
+            html = self.get_html(url, deadline=deadline)
+            soup = self.parse_targets(html, IFRAME_STRAINER)
             
             links = []
             
             # Buscar iframes
             for iframe in soup.select('iframe[src]'):
                 link_url = iframe.get('src')
-                if link_url and any(s in link_url for s in ['voe', 'streamwish', 'filemoon', 'vidhide', 'streamtape']):
-                    server_name = self._detect_server(link_url)
+                if link_url and is_known_hoster(link_url):
+                    server_name = detect_hoster(link_url)
                     
                     links.append({
                         'server': server_name,
@@ -41,19 +44,3 @@ class CuevanaScraper(BaseScraper):
                 'links': [],
                 'total': 0
             }
-    
-    def _detect_server(self, url: str) -> str:
-        servers = {
-            'voe': 'voe',
-            'streamwish': 'streamwish',
-            'filemoon': 'filemoon',
-            'vidhide': 'vidhide',
-            'streamtape': 'streamtape'
-        }
-        
-        url_lower = url.lower()
-        for key, name in servers.items():
-            if key in url_lower:
-                return name
-        
-        return 'desconocido'
@@ -0,0 +1,112 @@
+"""
+Registro único de hosters de video.
+
+Todos los scrapers clasifican sus links con detect_hoster(), así el mismo
+hoster siempre sale con el mismo nombre ("StreamWish", nunca "streamwish"
+ni "hgplaycdn"). La clasificación mira solo el host de la URL (no el path
+ni el query, donde suelen aparecer otros dominios) y compara labels
+enteros: 'voe' reconoce voe.sx y www.voe.sx, no invoece.com.
+"""
+import re
+from functools import lru_cache
+
+UNKNOWN = 'Desconocido'
+
+# Nombre canónico -> nombre de dominio sin TLD ('voe' para voe.sx), o el
+# dominio completo si hace falta distinguirlo ('hqq.tv'); espejos incluidos
+HOSTERS = {
+    'StreamWish': ('streamwish', 'hgplaycdn', 'wishembed', 'swdyu', 'strwish'),
+    'VidHide': ('vidhide', 'filelions', 'vidhidepro'),
+    'Voe': ('voe',),
+    'StreamTape': ('streamtape', 'strtape', 'stape'),
+    'FileMoon': ('filemoon',),
+    'Waaw': ('waaw',),
+    'Netu': ('netu', 'hqq'),
+    'Fembed': ('fembed',),
+    'StreamSB': ('watchsb', 'streamsb'),
+    'StreamLare': ('streamlare',),
+    'DoodStream': ('doodstream', 'dood', 'd0000d', 'ds2play'),
+    'MixDrop': ('mixdrop',),
+    'UpStream': ('upstream',),
+}
+
+_ALIASES = {
+    alias: name
+    for name, aliases in HOSTERS.items()
+    for alias in aliases + (name.lower(),)
+}
+
+# Para etiquetas de la página ('StreamWish HD'): alternancia con los alias
+# más largos primero, 'doodstream' gana a 'dood'
+_LABEL_RE = re.compile('|'.join(
+    re.escape(alias) for alias in sorted(_ALIASES, key=len, reverse=True)
+))
+
+
+@lru_cache(maxsize=4096)
+def _match(host):
+    """
+    Hoster de un host: el alias tiene que ser el host entero, un sufijo de
+    dominio (host == alias o termina en '.' + alias) o un label completo
+    del host. Se recorre de derecha a izquierda, así manda el dominio
+    registrable y no un subdominio ('voe.dood.la' es DoodStream).
+    """
+    labels = host.split('.')
+    for i in range(len(labels) - 1, -1, -1):
+        name = _ALIASES.get('.'.join(labels[i:])) or _ALIASES.get(labels[i])
+        if name:
+            return name
+    return None
+
+
+def _match_label(text):
+    match = _LABEL_RE.search(text)
+    return _ALIASES[match.group(0)] if match else None
+
+
+# Authority de la URL: lo que sigue a "esquema://" o "//" (o el inicio si no hay)
+_AUTHORITY_RE = re.compile(r'\s*(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?(?://)?(?:[^/?#@]*@)?([^/?#:]*)')
+
+
+def host_of(url: str) -> str:
+    """
+    Host en minúsculas de una URL (acepta URLs sin esquema).
+    Un regex precompilado en lugar de urlsplit(): solo hace falta el host
+    y se llama una vez por link.
+    """
+    if not url:
+        return ''
+    return _AUTHORITY_RE.match(url).group(1).lower()
+
+
+def canonical_hoster(name: str):
+    """Nombre canónico para una etiqueta o key de hoster ('voe', 'HGPLAYCDN'...), o None"""
+    if not name:
+        return None
+    key = name.strip().lower()
+    return _ALIASES.get(key) or _match_label(key)
+
+
+def detect_hoster(url: str, label: str = None) -> str:
+    """
+    Clasifica un link.
+
+    Args:
+        url: URL del embed
+        label: nombre que trae la página (texto del botón, key de Firestore...)
+
+    Returns:
+        str: nombre canónico; si no se reconoce, la etiqueta tal cual
+        (capitalizada) o UNKNOWN
+    """
+    name = _match(host_of(url)) or canonical_hoster(label)
+    if name:
+        return name
+    if label and label.strip():
+        return label.strip().title()
+    return UNKNOWN
+
+
+def is_known_hoster(url: str) -> bool:
+    """True si el host de la URL es un hoster registrado"""
+    return _match(host_of(url)) is not None
@@ -0,0 +1,64 @@
+"""
+Latencias observadas por dominio.
+
+BaseScraper registra cuánto tardó cada request exitoso y usa el
+percentil (p95 por defecto) para decidir cuándo disparar un request de
+respaldo (hedge): si el primero ya tardó más que casi todos los
+anteriores al mismo dominio, probablemente quedó colgado.
+"""
+import threading
+from collections import deque
+
+
+class DomainLatency:
+    def __init__(self, window=100, min_samples=10):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def record(self, domain, seconds):
+        with self._lock:
+            samples = self._samples.get(domain)
+            if samples is None:
+                samples = self._samples[domain] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count_hedge(self, won=False):
+        """Un hedge lanzado (won=False) o ganado por el request de respaldo (won=True)"""
+        with self._lock:
+            if won:
+                self.hedges_won += 1
+            else:
+                self.hedges_fired += 1
+
+    def percentile(self, domain, pct=95):
+        """Percentil de las últimas `window` latencias, o None si hay pocas muestras"""
+        with self._lock:
+            samples = self._samples.get(domain)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        with self._lock:
+            domains = list(self._samples)
+            hedges = {'fired': self.hedges_fired, 'won': self.hedges_won}
+        return {
+            'hedges': hedges,
+            'domains': {
+                domain: {
+                    'samples': len(self._samples[domain]),
+                    'p50': self.percentile(domain, 50),
+                    'p95': self.percentile(domain, 95)
+                }
+                for domain in domains
+            }
+        }
+
+
+domain_latency = DomainLatency()
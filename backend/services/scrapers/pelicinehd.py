@@ -1,5 +1,22 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .hosters import detect_hoster, is_known_hoster
+
+
+def _is_player_node(name, attrs):
+    """<div class="Video"> (con su iframe adentro) o cualquier <iframe src>"""
+    if name == 'iframe':
+        return 'src' in attrs
+    if name == 'div':
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return 'Video' in classes
+    return False
+
+
+PLAYER_STRAINER = SoupStrainer(_is_player_node)
+
 
 class PeliCineHDScraper(BaseScraper):
     """Scraper para pelicinehd.com"""
@@ -7,10 +24,10 @@ class PeliCineHDScraper(BaseScraper):
     def can_handle(self, url: str) -> bool:
         return 'pelicinehd' in url.lower()
     
-    def extract_links(self, url: str) -> dict:
+    def extract_links(self, url: str, deadline: float = None) -> dict:
         try:
-            html = self.get_html(url)
-            soup = BeautifulSoup(html, 'html.parser')
+            html = self.get_html(url, deadline=deadline)
+            soup = self.parse_targets(html, PLAYER_STRAINER)
             
             links = []
             
@@ -19,7 +36,7 @@ class PeliCineHDScraper(BaseScraper):
                 iframe = video_div.find('iframe')
                 if iframe and iframe.get('src'):
                     link_url = iframe.get('src')
-                    server_name = self._detect_server(link_url)
+                    server_name = detect_hoster(link_url)
                     
                     links.append({
                         'server': server_name,
@@ -30,8 +47,8 @@ class PeliCineHDScraper(BaseScraper):
             # También buscar iframes fuera de .Video
             for iframe in soup.select('iframe[src]'):
                 link_url = iframe.get('src')
-                if any(s in link_url for s in ['voe', 'streamwish', 'filemoon', 'vidhide']):
-                    server_name = self._detect_server(link_url)
+                if is_known_hoster(link_url):
+                    server_name = detect_hoster(link_url)
                     
                     if not any(l['url'] == link_url for l in links):
                         links.append({
@@ -55,19 +72,3 @@ class PeliCineHDScraper(BaseScraper):
                 'links': [],
                 'total': 0
             }
-    
-    def _detect_server(self, url: str) -> str:
-        servers = {
-            'voe': 'voe',
-            'streamwish': 'streamwish',
-            'filemoon': 'filemoon',
-            'vidhide': 'vidhide',
-            'streamtape': 'streamtape'
-        }
-        
-        url_lower = url.lower()
-        for key, name in servers.items():
-            if key in url_lower:
-                return name
-        
-        return 'desconocido'
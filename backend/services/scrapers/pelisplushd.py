@@ -1,14 +1,19 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .hosters import detect_hoster
+from .registry import scraper_registry
 import os
 
+# Solo interesan los <li data-url> del reproductor (y su <a> con el nombre)
+PLAYURL_STRAINER = SoupStrainer('li', {'data-url': True})
+
 class PelisPlusHDScraper(BaseScraper):
     """Scraper para pelisplushd.to - Optimizado para Render.com"""
     
     def can_handle(self, url: str) -> bool:
         return 'pelisplushd' in url.lower()
     
-    def extract_links(self, url: str) -> dict:
+    def extract_links(self, url: str, deadline: float = None) -> dict:
         """
         Extrae links desde el HTML de pelisplushd.to
         Estrategia: Intentar múltiples métodos
@@ -16,13 +21,13 @@ class PelisPlusHDScraper(BaseScraper):
         try:
             # Método 1: Scraping directo (puede fallar en Render por 403)
             try:
-                return self._extract_from_html(url)
+                return self._extract_from_html(url, deadline)
             except Exception as e:
                 error_msg = str(e)
                 
                 # Si es 403, intentar método alternativo
                 if '403' in error_msg:
-                    return self._extract_alternative(url)
+                    return self._extract_alternative(url, deadline)
                 raise
                 
         except Exception as e:
@@ -35,10 +40,10 @@ class PelisPlusHDScraper(BaseScraper):
                 'suggestion': 'Intenta acceder directamente a la página en tu navegador y copiar los enlaces manualmente, o usa una VPN.'
             }
     
-    def _extract_from_html(self, url: str) -> dict:
+    def _extract_from_html(self, url: str, deadline: float = None) -> dict:
         """Método principal: Extrae desde HTML"""
-        html = self.get_html(url)
-        soup = BeautifulSoup(html, 'html.parser')
+        html = self.get_html(url, deadline=deadline)
+        soup = self.parse_targets(html, PLAYURL_STRAINER)
         
         # Buscar todos los <li class="playurl"> con data-url
         links = []
@@ -48,15 +53,9 @@ class PelisPlusHDScraper(BaseScraper):
             link_url = li.get('data-url')
             language = li.get('data-name', 'Desconocido')
             
-            # Detectar servidor desde el texto del <a> o desde la URL
-            server_name = 'Desconocido'
+            # Detectar servidor desde la URL o, si no, desde el texto del <a>
             a_tag = li.find('a')
-            if a_tag and a_tag.text:
-                server_name = a_tag.text.strip().title()
-            
-            # Si no se detectó del texto, detectar de la URL
-            if server_name == 'Desconocido':
-                server_name = self._detect_server(link_url)
+            server_name = detect_hoster(link_url, a_tag.text if a_tag else None)
             
             if link_url:
                 links.append({
@@ -82,7 +81,7 @@ class PelisPlusHDScraper(BaseScraper):
             'method': 'html'
         }
     
-    def _extract_alternative(self, url: str) -> dict:
+    def _extract_alternative(self, url: str, deadline: float = None) -> dict:
         """
         Método alternativo: Usa una API proxy si está configurada
         Esto permite bypassear el bloqueo 403 en Render
@@ -104,10 +103,14 @@ class PelisPlusHDScraper(BaseScraper):
         try:
             import requests
             proxy_url = f"{proxy_api}?url={url}&render=false"
-            response = requests.get(proxy_url, timeout=25)
+            remaining = self._remaining(deadline)
+            timeout = 25 if remaining is None else min(25, remaining)
+            if timeout < self.min_attempt_seconds:
+                raise requests.exceptions.Timeout('sin tiempo antes del deadline')
+            response = scraper_registry.session('proxy').get(proxy_url, timeout=timeout)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_targets(response.text, PLAYURL_STRAINER)
             
             # Mismo proceso de extracción
             links = []
@@ -115,12 +118,8 @@ class PelisPlusHDScraper(BaseScraper):
                 link_url = li.get('data-url')
                 language = li.get('data-name', 'Desconocido')
                 
-                server_name = 'Desconocido'
                 a_tag = li.find('a')
-                if a_tag and a_tag.text:
-                    server_name = a_tag.text.strip().title()
-                else:
-                    server_name = self._detect_server(link_url)
+                server_name = detect_hoster(link_url, a_tag.text if a_tag else None)
                 
                 if link_url:
                     links.append({
@@ -154,33 +153,3 @@ class PelisPlusHDScraper(BaseScraper):
                 'links': [],
                 'total': 0
             }
-    
-    def _detect_server(self, url: str) -> str:
-        """Detecta el nombre del servidor desde la URL"""
-        servers = {
-            'streamwish': 'StreamWish',
-            'hgplaycdn': 'StreamWish',
-            'vidhide': 'VidHide',
-            'filelions': 'VidHide',
-            'voe.sx': 'Voe',
-            'voe': 'Voe',
-            'streamtape': 'StreamTape',
-            'filemoon': 'FileMoon',
-            'waaw': 'Waaw',
-            'netu': 'Netu',
-            'fembed': 'Fembed',
-            'watchsb': 'StreamSB',
-            'streamsb': 'StreamSB',
-            'streamlare': 'StreamLare',
-            'doodstream': 'DoodStream',
-            'dood': 'DoodStream',
-            'mixdrop': 'MixDrop',
-            'upstream': 'UpStream'
-        }
-        
-        url_lower = url.lower()
-        for key, name in servers.items():
-            if key in url_lower:
-                return name
-        
-        return 'Desconocido'
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Scrapers y sesiones HTTP compartidos por todo el proceso.
+
+Antes cada pedido a /api/links creaba su propio scraper y con él una
+requests.Session nueva: ninguna conexión se reutilizaba y cada scrape
+pagaba DNS + TCP + TLS. Acá se crea una instancia por clase de scraper
+(y una sesión "plana" para proxies/validaciones) que vive lo que vive el
+worker, con el pool de conexiones dimensionado para los hilos que la usan.
+
+Después de un fork (gunicorn con --preload) el hijo no puede usar los
+sockets heredados del padre: se descartan las instancias y se crean de
+nuevo en el primer uso dentro del hijo.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Hosts distintos que guarda cada sesión (un pool por host) y conexiones
+# por host: alcanza para los hilos de LinkExtractor + los hedges
+POOL_CONNECTIONS = int(os.getenv('SCRAPER_POOL_CONNECTIONS', 16))
+POOL_MAXSIZE = int(os.getenv('SCRAPER_POOL_MAXSIZE', 24))
+
+
+def mount_pool(session, pool_maxsize=None, prefixes=('https://', 'http://')):
+    """Monta un HTTPAdapter con el pool ajustado (sin reintentos: los maneja el scraper)"""
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or POOL_MAXSIZE,
+        max_retries=0
+    )
+    for prefix in prefixes:
+        session.mount(prefix, adapter)
+    return session
+
+
+class ScraperRegistry:
+    def __init__(self):
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # Sin close(): en el hijo cerraría TLS sobre sockets que el padre sigue usando
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._scrapers = {}
+        self._sessions = {}
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get(self, scraper_class):
+        """Instancia compartida de un scraper (se crea en el primer uso)"""
+        self._check_fork()
+        scraper = self._scrapers.get(scraper_class)
+        if scraper is None:
+            with self._lock:
+                scraper = self._scrapers.get(scraper_class)
+                if scraper is None:
+                    scraper = self._scrapers[scraper_class] = scraper_class()
+        return scraper
+
+    def session(self, name='default') -> requests.Session:
+        """Sesión compartida sin headers de navegador (proxies, HEAD de validación)"""
+        self._check_fork()
+        session = self._sessions.get(name)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(name)
+                if session is None:
+                    session = self._sessions[name] = mount_pool(requests.Session())
+        return session
+
+    def stats(self) -> dict:
+        return {
+            'pid': self._pid,
+            'scrapers': sorted(cls.__name__ for cls in self._scrapers),
+            'sessions': sorted(self._sessions)
+        }
+
+
+scraper_registry = ScraperRegistry()
@@ -0,0 +1,129 @@
+"""
+Parser incremental del canal Listen de Firestore (protocolo WebChannel).
+
+La respuesta del GET "channel?...TYPE=xmlhttp" es un long-poll con frames
+precedidos por su largo:
+
+    )]}'
+    123
+    [[1,[{"targetChange":{"targetChangeType":"ADD","targetIds":[2]}}]]]
+    456
+    [[2,[{"documentChange":{"document":{...},"targetIds":[2]}}]]]
+    ...
+
+El largo está en unidades UTF-16 (largo de string en JS). Los frames se
+procesan a medida que llegan, así ZonaHackScraper puede cortar la conexión
+apenas llega el CURRENT del target en lugar de esperar a que el servidor
+cierre el long-poll.
+"""
+import codecs
+import json
+import re
+
+XSSI_PREFIX = ")]}'"
+
+# Caracteres fuera del BMP: ocupan 2 unidades UTF-16 pero 1 carácter en Python
+_ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+_DIGITS_RE = re.compile(r'\s*(\d+)\n')
+
+
+class WebChannelError(Exception):
+    """El stream no tiene el formato esperado"""
+    pass
+
+
+class WebChannelParser:
+    """
+    Recibe bytes con feed() y devuelve los frames completos (ya
+    decodificados como JSON). Lo que queda a medias se guarda hasta el
+    siguiente feed().
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._started = False
+        self.frames = 0
+        self.bytes = 0
+
+    def feed(self, data: bytes) -> list:
+        self.bytes += len(data)
+        self._buffer += self._decoder.decode(data)
+        if not self._started:
+            stripped = self._buffer.lstrip()
+            if len(stripped) < len(XSSI_PREFIX) and XSSI_PREFIX.startswith(stripped):
+                return []
+            if stripped.startswith(XSSI_PREFIX):
+                stripped = stripped[len(XSSI_PREFIX):]
+            self._buffer = stripped
+            self._started = True
+        return self._drain()
+
+    def _drain(self):
+        frames = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            header = _DIGITS_RE.match(buffer, pos)
+            if header is None:
+                if buffer[pos:].strip() and not buffer[pos:].lstrip()[:1].isdigit():
+                    raise WebChannelError(f"Frame sin largo: {buffer[pos:pos + 40]!r}")
+                break
+
+            size = int(header.group(1))
+            body_start = header.end()
+            available = len(buffer) - body_start
+            if available < size:
+                astral = len(_ASTRAL_RE.findall(buffer, body_start))
+                if available + astral < size:
+                    break
+
+            try:
+                frame, end = self._json.raw_decode(buffer, body_start)
+            except json.JSONDecodeError as e:
+                raise WebChannelError(f"Frame inválido ({size} unidades): {e}") from e
+
+            frames.append(frame)
+            pos = end
+
+        self._buffer = buffer[pos:]
+        self.frames += len(frames)
+        return frames
+
+
+def iter_messages(frame):
+    """
+    Mensajes de un frame: [[seq, [msg, ...]], ...]. Los msg de Firestore
+    son dicts (targetChange, documentChange, ...); WebChannel también manda
+    strings como "noop" o "close".
+    """
+    for entry in frame:
+        if not isinstance(entry, list) or len(entry) != 2:
+            continue
+        payload = entry[1]
+        if not isinstance(payload, list):
+            payload = [payload]
+        for msg in payload:
+            if isinstance(msg, list):
+                yield from msg
+            else:
+                yield msg
+
+
+def is_current(msg, target_ids=None) -> bool:
+    """True si el mensaje marca CURRENT (ya se mandaron todos los documentos)"""
+    change = msg.get('targetChange') if isinstance(msg, dict) else None
+    if not change or change.get('targetChangeType') != 'CURRENT':
+        return False
+    ids = change.get('targetIds')
+    # Sin targetIds aplica a todos los targets del stream
+    return not ids or not target_ids or bool(set(ids) & set(target_ids))
+
+
+def removed_cause(msg):
+    """Error del target si Firestore lo removió (p. ej. permisos), o None"""
+    change = msg.get('targetChange') if isinstance(msg, dict) else None
+    if change and change.get('targetChangeType') == 'REMOVE':
+        return (change.get('cause') or {}).get('message', 'target removido')
+    return None
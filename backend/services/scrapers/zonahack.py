@@ -1,24 +1,44 @@
 from .base_scraper import BaseScraper
+from .hosters import detect_hoster
+from .webchannel import WebChannelParser, WebChannelError, iter_messages, is_current, removed_cause
 import re
 import json
+import time
 import requests
-from urllib.parse import urlparse, parse_qs, unquote
+from urllib.parse import urlparse, parse_qs, unquote, quote
+from config import config
+
+FIRESTORE_URL = "https://firestore.googleapis.com"
+# batchGet acepta muchos documentos, pero mejor en tandas acotadas
+BATCH_GET_SIZE = 100
 
 class ZonaHackScraper(BaseScraper):
     """Scraper para zonahack.com.ar - Requiere LISTEN_URL manual"""
     
+    connect_timeout = 5
+    read_timeout = 15       # máximo sin recibir bytes
+    stream_deadline = 25    # máximo total esperando el CURRENT
+    
     def can_handle(self, url: str) -> bool:
         return 'zonahack' in url.lower()
     
-    def extract_links(self, url: str, listen_url: str = None) -> dict:
+    def extract_links(self, url: str, listen_url: str = None, document_names: list = None,
+                      deadline: float = None) -> dict:
         """
-        Extrae links de zonahack usando la URL de Firestore
+        Extrae links de zonahack usando Firestore
+        
+        Con document_names (nombres completos de los documentos, los devuelve
+        este mismo método en 'documents') se leen directo por REST batchGet:
+        un request/response normal que no expira. Si falla o no hay nombres,
+        se usa el canal Listen capturado (listen_url).
         
         Args:
             url: URL de la película (solo para referencia)
-            listen_url: URL completa de channel?... de Firestore (REQUERIDO)
+            listen_url: URL completa de channel?... de Firestore
+            document_names: documentos de Firestore conocidos (opcional)
+            deadline: límite (time.monotonic()) para todo el pedido
         """
-        if not listen_url:
+        if not listen_url and not document_names:
             return {
                 'success': False,
                 'source': 'zonahack',
@@ -28,7 +48,19 @@ class ZonaHackScraper(BaseScraper):
             }
         
         try:
-            data = self._extract_firestore_data(listen_url)
+            data = None
+            mode = 'batchGet'
+            if document_names:
+                try:
+                    data = self._fetch_documents(document_names, listen_url, deadline)
+                except Exception as e:
+                    if not listen_url:
+                        raise
+                    print(f"ZonaHack: batchGet falló ({e}), se usa el canal Listen")
+            
+            if not data:
+                mode = 'listen'
+                data = self._extract_firestore_data(listen_url, deadline) if listen_url else []
             
             if not data:
                 return {
@@ -45,9 +77,11 @@ class ZonaHackScraper(BaseScraper):
                 for idioma, hosts in movie.get('idiomas', {}).items():
                     for host, link_url in hosts.items():
                         all_links.append({
-                            'server': host,
+                            'server': detect_hoster(link_url, host),
                             'url': link_url,
-                            'language': idioma
+                            'language': idioma,
+                            'nombre': movie.get('nombre'),
+                            'document': movie.get('document')
                         })
             
             return {
@@ -55,7 +89,9 @@ class ZonaHackScraper(BaseScraper):
                 'source': 'zonahack',
                 'links': all_links,
                 'total': len(all_links),
-                'movies_found': len(data)
+                'movies_found': len(data),
+                'documents': [movie['document'] for movie in data if movie.get('document')],
+                'mode': mode
             }
             
         except Exception as e:
@@ -80,8 +116,13 @@ class ZonaHackScraper(BaseScraper):
         inner = qs.get("url", [None])[0]
         return unquote(inner) if inner else url
     
-    def _extract_firestore_data(self, listen_url):
-        """Extrae datos de la respuesta de Firestore"""
+    def _extract_firestore_data(self, listen_url, deadline=None):
+        """
+        Lee el canal Listen de Firestore como stream y devuelve las películas
+        apenas el target queda CURRENT (todos los documentos enviados), sin
+        esperar a que el servidor cierre el long-poll (ni pasarse de
+        stream_deadline o del deadline del pedido).
+        """
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/141.0.0.0 Safari/537.36",
             "Accept": "*/*",
@@ -89,44 +130,184 @@ class ZonaHackScraper(BaseScraper):
             "Referer": "https://zonahack.com.ar/",
         }
         
-        r = requests.get(listen_url, headers=headers, timeout=25)
-        r.raise_for_status()
+        parser = WebChannelParser()
+        documents = {}
+        raw = []
+        current = False
+        stream_deadline = time.monotonic() + self.stream_deadline
+        if deadline is not None:
+            stream_deadline = min(stream_deadline, deadline)
+        
+        with self.session.get(listen_url, headers=headers, stream=True,
+                              timeout=self._request_timeout(deadline)) as r:
+            r.raise_for_status()
+            
+            try:
+                self._bound_read_timeout(r, stream_deadline)
+                for chunk in r.iter_content(chunk_size=None):
+                    raw.append(chunk)
+                    if parser is not None:
+                        try:
+                            frames = parser.feed(chunk)
+                        except WebChannelError as e:
+                            # Formato desconocido: se termina de leer y se usa el regex
+                            print(f"ZonaHack: stream no parseable ({e}), se usa el parser por regex")
+                            parser = None
+                            frames = []
+                        
+                        for frame in frames:
+                            for msg in iter_messages(frame):
+                                cause = removed_cause(msg)
+                                if cause:
+                                    raise Exception(f"Firestore removió el target: {cause}")
+                                doc = (msg.get('documentChange') or {}).get('document') if isinstance(msg, dict) else None
+                                if doc:
+                                    documents[doc.get('name', len(documents))] = doc
+                                if is_current(msg):
+                                    current = True
+                        
+                        if current:
+                            break
+                    if time.monotonic() >= stream_deadline:
+                        print("ZonaHack: sin CURRENT antes del deadline, se usa lo recibido")
+                        break
+                    self._bound_read_timeout(r, stream_deadline)
+            
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # El long-poll se cortó, quedó mudo o llegó el deadline: sirve
+                # lo que ya llegó
+                if not (documents or (parser is None and raw)):
+                    raise
+                print(f"ZonaHack: stream cortado ({e}), se usa lo recibido")
+        
+        if parser is None:
+            text = b''.join(raw).decode('utf-8', errors='replace')
+            return self._parse_documents_regex(self._clean_text_response(text))
+        
+        movies = []
+        for doc in documents.values():
+            movie = self._parse_document(doc)
+            if movie:
+                movies.append(movie)
+        return movies
+    
+    def _fetch_documents(self, document_names, listen_url=None, deadline=None):
+        """
+        Lee los documentos con POST .../documents:batchGet (sin long-poll).
+        El proyecto y la base salen del propio nombre del documento.
+        """
+        database = document_names[0].split('/documents/', 1)[0]
+        endpoint = f"{self._firestore_base_url()}/v1/{quote(database, safe='/()')}/documents:batchGet"
+        params = {}
+        api_key = config.FIRESTORE_API_KEY or self._api_key_from_listen_url(listen_url)
+        if api_key:
+            params['key'] = api_key
+        
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if config.FIRESTORE_EMULATOR_HOST:
+            # El emulador saltea las reglas de seguridad con este token
+            headers['Authorization'] = 'Bearer owner'
         
-        text = self._clean_text_response(r.text)
+        found = {}
+        for i in range(0, len(document_names), BATCH_GET_SIZE):
+            batch = document_names[i:i + BATCH_GET_SIZE]
+            r = self.session.post(
+                endpoint,
+                params=params,
+                json={'documents': batch},
+                headers=headers,
+                timeout=self._request_timeout(deadline)
+            )
+            r.raise_for_status()
+            for item in r.json():
+                doc = item.get('found')
+                if doc:
+                    found[doc['name']] = doc
         
-        # Buscar bloques "document"
+        # batchGet no garantiza el orden: respetar el de document_names
+        movies = []
+        for name in document_names:
+            movie = self._parse_document(found[name]) if name in found else None
+            if movie:
+                movies.append(movie)
+        return movies
+    
+    def _bound_read_timeout(self, response, stream_deadline):
+        """
+        Recorta el timeout del socket a lo que queda del deadline: el chequeo
+        del loop solo corre cuando llega un chunk, un stream mudo se corta acá
+        """
+        connection = getattr(response.raw, 'connection', None)
+        sock = getattr(connection, 'sock', None)
+        if sock is not None:
+            remaining = stream_deadline - time.monotonic()
+            sock.settimeout(max(0.01, min(self.read_timeout, remaining)))
+    
+    def _request_timeout(self, deadline):
+        """(connect, read) recortados por el deadline del pedido"""
+        remaining = self._remaining(deadline)
+        if remaining is None:
+            return (self.connect_timeout, self.read_timeout)
+        if remaining < self.min_attempt_seconds:
+            raise requests.exceptions.Timeout("ZonaHack: sin tiempo antes del deadline")
+        return (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+    
+    def _firestore_base_url(self):
+        if config.FIRESTORE_EMULATOR_HOST:
+            return f"http://{config.FIRESTORE_EMULATOR_HOST}"
+        return FIRESTORE_URL
+    
+    def _api_key_from_listen_url(self, listen_url):
+        """API key del proyecto si viene en el listen_url (key=... o $httpHeaders)"""
+        if not listen_url:
+            return None
+        qs = parse_qs(urlparse(listen_url).query)
+        if qs.get('key'):
+            return qs['key'][0]
+        match = re.search(r'X-Goog-Api-Key:\s*([\w-]+)', qs.get('$httpHeaders', [''])[0], re.IGNORECASE)
+        return match.group(1) if match else None
+    
+    def _parse_document(self, doc):
+        """Documento de Firestore -> {'nombre', 'idiomas', 'document'} (o None si no tiene links)"""
+        fields = doc.get("fields", {})
+        nombre = fields.get("NOMBRE", {}).get("stringValue")
+        idiomas = {}
+        
+        # Extraer idiomas
+        for label, idioma_nombre in [
+            ("SERVERCASTELLANO", "Castellano"),
+            ("SERVERSUB", "Subtitulado"),
+            ("IDIOMAS", "Latino")
+        ]:
+            idioma_data = fields.get(label, {}).get("mapValue", {}).get("fields", {})
+            enlaces = {
+                host: self._decode_iframe_url(data["stringValue"])
+                for host, data in idioma_data.items()
+                if "stringValue" in data
+            }
+            if enlaces:
+                idiomas[idioma_nombre] = enlaces
+        
+        if not idiomas:
+            return None
+        return {
+            "nombre": nombre,
+            "idiomas": idiomas,
+            "document": doc.get("name")
+        }
+    
+    def _parse_documents_regex(self, text):
+        """Parser anterior: busca bloques "document" con regex sobre todo el texto"""
         docs = re.findall(r'"document"\s*:\s*\{(.*?)\}\s*,\s*"targetIds"', text, re.DOTALL)
         
         movies = []
         for doc_text in docs:
             try:
                 doc_json = json.loads("{" + doc_text + "}")
-            except:
+            except json.JSONDecodeError:
                 continue
-            
-            fields = doc_json.get("fields", {})
-            
-            nombre = fields.get("NOMBRE", {}).get("stringValue")
-            idiomas = {}
-            
-            # Extraer idiomas
-            for label, idioma_nombre in [
-                ("SERVERCASTELLANO", "Castellano"),
-                ("SERVERSUB", "Subtitulado"),
-                ("IDIOMAS", "Latino")
-            ]:
-                idioma_data = fields.get(label, {}).get("mapValue", {}).get("fields", {})
-                enlaces = {
-                    host: self._decode_iframe_url(data["stringValue"])
-                    for host, data in idioma_data.items()
-                }
-                if enlaces:
-                    idiomas[idioma_nombre] = enlaces
-            
-            if idiomas:
-                movies.append({
-                    "nombre": nombre,
-                    "idiomas": idiomas
-                })
+            movie = self._parse_document(doc_json)
+            if movie:
+                movies.append(movie)
         
         return movies
@@ -0,0 +1,99 @@
+"""
+Cache persistente de respuestas de TMDB con TTL por tipo de endpoint.
+
+Se guarda en SQLite (reutiliza SQLiteCache), así sobrevive reinicios y lo
+comparten los workers. La key es la ruta normalizada + los params
+ordenados (sin api_key). Cada entrada vive ttl + stale_seconds: pasado el
+ttl se vuelve a pedir a TMDB, pero si TMDB falla se sirve la copia vieja.
+"""
+import re
+import threading
+import time
+from urllib.parse import urlencode
+
+from services.cache import SQLiteCache
+
+SEASON_TTL = 12 * 60 * 60
+
+# (patrón sobre la ruta, TTL en segundos). Gana el primero que coincide.
+TTL_POLICIES = [
+    (re.compile(r'^search/'), 10 * 60),
+    (re.compile(r'^trending/'), 60 * 60),
+    (re.compile(r'^(movie|tv)/(popular|top_rated|now_playing|upcoming|on_the_air|airing_today)$'), 60 * 60),
+    (re.compile(r'^tv/\d+/season/\d+'), SEASON_TTL),
+    (re.compile(r'^(movie|tv)/\d+$'), 24 * 60 * 60),
+]
+DEFAULT_TTL = 60 * 60
+
+
+def ttl_for(path, params=None):
+    """TTL en segundos para una ruta de TMDB"""
+    ttl = DEFAULT_TTL
+    for pattern, policy_ttl in TTL_POLICIES:
+        if pattern.search(path):
+            ttl = policy_ttl
+            break
+    # Detalles con temporadas embebidas (append_to_response=season/N)
+    # duran lo que duran las temporadas
+    if 'season/' in str((params or {}).get('append_to_response', '')):
+        ttl = min(ttl, SEASON_TTL)
+    return ttl
+
+
+def make_key(path, params=None):
+    """Key normalizada: ruta sin barras sobrantes + params ordenados, sin api_key"""
+    path = path.strip('/')
+    items = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if k != 'api_key' and v is not None
+    )
+    return f"tmdb:{path}?{urlencode(items)}" if items else f"tmdb:{path}"
+
+
+class TMDBResponseCache:
+    def __init__(self, path, stale_seconds=7 * 24 * 60 * 60):
+        self.store = SQLiteCache(path)
+        self.stale_seconds = stale_seconds
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+
+    def lookup(self, path, params=None):
+        """
+        Devuelve (data, fresh). data es None si no hay nada guardado;
+        fresh es False si ya pasó el TTL (solo sirve como respaldo).
+        """
+        entry = self.store.get(make_key(path, params))
+        if entry is None:
+            self._count('misses')
+            return None, False
+        fresh = entry['fresh_until'] > time.time()
+        self._count('hits' if fresh else 'misses')
+        return entry['data'], fresh
+
+    def save(self, path, params, data):
+        ttl = ttl_for(path.strip('/'), params)
+        self.store.set(
+            make_key(path, params),
+            {'data': data, 'fresh_until': time.time() + ttl},
+            ttl_seconds=ttl + self.stale_seconds
+        )
+
+    def mark_stale_served(self):
+        self._count('stale_served')
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'stale_served': self.stale_served,
+            'path': self.store.path
+        }
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
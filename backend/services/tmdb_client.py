@@ -0,0 +1,226 @@
+"""
+Cliente HTTP compartido para TMDB.
+
+- Una sola requests.Session con pool de conexiones keep-alive (sin un
+  handshake TCP+TLS por request).
+- Reintentos con backoff exponencial + jitter en 429/5xx y errores de red,
+  respetando Retry-After y el deadline del que llama.
+- Token bucket global para no pasar el límite de TMDB en picos de tráfico:
+  sin token a tiempo se devuelve un 429 local en vez de salir a la red.
+- get_json() pasa por el cache persistente de services/tmdb_cache.py.
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+from services.tmdb_cache import TMDBResponseCache
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Tiempo mínimo que tiene que quedar para que valga la pena otro intento
+MIN_ATTEMPT_SECONDS = 0.5
+
+
+class TokenBucket:
+    """Limitador de tasa: `rate` tokens por segundo con ráfagas de hasta `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Bloquea hasta obtener un token; False si se agota el timeout"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class TMDBClient:
+    def __init__(self, api_key=None, base_url=None, pool_size=20, max_retries=3,
+                 backoff=0.5, max_retry_after=10, rate_limit=40, burst=40, cache=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.base_url = (base_url or config.TMDB_BASE_URL).rstrip('/')
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.bucket = TokenBucket(rate_limit, burst)
+
+        self._session = None
+        self._pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Sesión del proceso actual (se recrea tras un fork de gunicorn)"""
+        if self._session is None or self._pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._pid != os.getpid():
+                    self._session = self._build_session()
+                    self._pid = os.getpid()
+        return self._session
+
+    def _build_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'Accept': 'application/json', 'Connection': 'keep-alive'})
+        return session
+
+    def get(self, path, params=None, timeout=10, deadline=None):
+        """
+        GET a TMDB con reintentos.
+
+        Args:
+            path: ruta relativa (p. ej. 'movie/550') o URL absoluta
+            params: query params (api_key se agrega solo)
+            timeout: timeout por intento
+            deadline: límite (time.monotonic()) para todo el pedido, espera
+                      del token y reintentos incluidos
+
+        Returns:
+            Response: la última respuesta (puede ser un 4xx/5xx); un 429
+                      armado acá si el token bucket no dio turno a tiempo
+
+        Raises:
+            requests.exceptions.Timeout: si no queda tiempo antes del deadline
+        """
+        url = path if path.startswith('http') else f"{self.base_url}/{path.lstrip('/')}"
+        params = dict(params or {})
+        params.setdefault('api_key', self.api_key or config.TMDB_API_KEY)
+
+        attempt = 0
+        while True:
+            if not self.bucket.acquire(timeout=self._attempt_timeout(timeout, deadline)):
+                return self._rate_limited(url)
+            attempt_timeout = self._attempt_timeout(timeout, deadline)
+            if attempt_timeout <= 0:
+                raise requests.exceptions.Timeout(f"Sin tiempo para pedir {url} antes del deadline")
+            try:
+                response = self.session.get(url, params=params, timeout=attempt_timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries or not self._sleep_before_retry(self._backoff(attempt), deadline):
+                    raise
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                retry_after = self._retry_after(response)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if self._sleep_before_retry(delay, deadline):
+                    response.close()
+                    attempt += 1
+                    continue
+
+            return response
+
+    def get_json(self, path, params=None, timeout=10, use_cache=True, deadline=None):
+        """
+        Igual que get() pero valida el status y devuelve el JSON.
+        Con cache: sirve la copia fresca si existe y, si TMDB falla
+        (red, 429 o 5xx), la copia vencida antes que propagar el error.
+        """
+        cache = self.cache if use_cache else None
+        stale = None
+        if cache is not None:
+            data, fresh = cache.lookup(path, params)
+            if fresh:
+                return data
+            stale = data
+        return self._fetch_json(path, params, timeout, deadline, cache, stale)
+
+    def refresh_json(self, path, params=None, timeout=10, stale=None, deadline=None):
+        """
+        Como get_json() pero sin mirar el cache: para quien ya hizo el
+        lookup (y contó el miss). Guarda la respuesta y, si TMDB falla,
+        devuelve `stale` (la copia vencida de ese lookup) si hay.
+        """
+        return self._fetch_json(path, params, timeout, deadline, self.cache, stale)
+
+    def _fetch_json(self, path, params, timeout, deadline, cache, stale):
+        try:
+            response = self.get(path, params=params, timeout=timeout, deadline=deadline)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if stale is not None and status in RETRY_STATUS:
+                cache.mark_stale_served()
+                return stale
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if stale is not None:
+                cache.mark_stale_served()
+                return stale
+            raise
+
+        if cache is not None:
+            cache.save(path, params, data)
+        return data
+
+    def _backoff(self, attempt):
+        delay = self.backoff * (2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _sleep_before_retry(self, delay, deadline):
+        """Duerme antes de reintentar; False si el deadline no cubre la espera y otro intento"""
+        if deadline is not None and deadline - time.monotonic() < delay + MIN_ATTEMPT_SECONDS:
+            return False
+        time.sleep(delay)
+        return True
+
+    @staticmethod
+    def _attempt_timeout(timeout, deadline):
+        if deadline is None:
+            return timeout
+        return max(0, min(timeout, deadline - time.monotonic()))
+
+    @staticmethod
+    def _rate_limited(url):
+        """429 local: sin token a tiempo no se sale a la red"""
+        response = requests.models.Response()
+        response.status_code = 429
+        response.reason = 'Too Many Requests (límite local)'
+        response.url = url
+        return response
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return min(float(value), self.max_retry_after)
+        except ValueError:
+            return None
+
+
+tmdb_client = TMDBClient(
+    pool_size=int(os.getenv('TMDB_POOL_SIZE', 20)),
+    max_retries=int(os.getenv('TMDB_MAX_RETRIES', 3)),
+    rate_limit=float(os.getenv('TMDB_RATE_LIMIT', 40)),
+    burst=int(os.getenv('TMDB_RATE_BURST', 40)),
+    cache=TMDBResponseCache(config.TMDB_CACHE_PATH) if config.TMDB_CACHE_ENABLED else None
+)
@@ -1,6 +1,7 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import config
 from utils.helpers import clean_html
+from services.tmdb_client import tmdb_client
 import sqlite3
 from database import get_connection
 
@@ -21,13 +22,12 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/search/movie",
+            data = tmdb_client.get_json(
+                "search/movie",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])
+            return data.get('results', [])
         except Exception as e:
             print(f"Error buscando películas en TMDB: {e}")
             return []
@@ -42,77 +42,131 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/search/tv",
+            data = tmdb_client.get_json(
+                "search/tv",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])
+            return data.get('results', [])
         except Exception as e:
             print(f"Error buscando series en TMDB: {e}")
             return []
     
     def get_movie_details(self, tmdb_id):
         """Obtener detalles de una película"""
-        params = {
-            'api_key': self.api_key,
-            'language': self.language
-        }
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/movie/{tmdb_id}",
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'tmdb_id': data.get('id'),
-                'title': data.get('title'),
-                'description': clean_html(data.get('overview', '')),
-                'genre': ', '.join([g['name'] for g in data.get('genres', [])]),
-                'rating': data.get('vote_average'),
-                'duration': data.get('runtime'),
-                'poster': f"{self.image_base_url}{data.get('poster_path')}" if data.get('poster_path') else None,
-                'year': int(data.get('release_date', '2000')[:4])
-            }
+            return self._format_movie(self._fetch_details(tmdb_id, 'movie'))
         except Exception as e:
             print(f"Error obteniendo detalles de película {tmdb_id}: {e}")
             return None
     
     def get_series_details(self, tmdb_id):
         """Obtener detalles de una serie"""
-        params = {
-            'api_key': self.api_key,
-            'language': self.language
-        }
-        
         try:
-            response = requests.get(
-                f"{self.base_url}/tv/{tmdb_id}",
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'tmdb_id': data.get('id'),
-                'title': data.get('name'),
-                'description': clean_html(data.get('overview', '')),
-                'genre': ', '.join([g['name'] for g in data.get('genres', [])]),
-                'rating': data.get('vote_average'),
-                'poster': f"{self.image_base_url}{data.get('poster_path')}" if data.get('poster_path') else None,
-                'year': int(data.get('first_air_date', '2000')[:4]),
-                'seasons': data.get('number_of_seasons', 1)
-            }
+            return self._format_series(self._fetch_details(tmdb_id, 'tv'))
         except Exception as e:
             print(f"Error obteniendo detalles de serie {tmdb_id}: {e}")
             return None
     
+    def get_many_details(self, ids, kind='movie', max_workers=None):
+        """
+        Obtener detalles de varios títulos a la vez
+        
+        Primero se resuelven los que ya están en el cache de TMDB; el resto
+        se pide con un pool acotado de hilos.
+        
+        Args:
+            ids: lista de tmdb_id
+            kind: 'movie' o 'tv'
+            max_workers: concurrencia máxima (por defecto TMDB_BULK_WORKERS)
+        
+        Returns:
+            tuple: (resultados, errores). resultados mantiene el orden de ids
+            con None donde falló; errores es {tmdb_id: mensaje}
+        """
+        kind = 'tv' if kind in ('tv', 'series') else 'movie'
+        formatter = self._format_movie if kind == 'movie' else self._format_series
+        params = {'language': self.language}
+        
+        results = [None] * len(ids)
+        errors = {}
+        pending = []
+        
+        # 1. Cache primero (sin pasar por el pool). Cada id se busca una
+        # sola vez: los misses se piden sin volver a mirar el cache (no se
+        # cuentan dos veces) y con la copia vencida como respaldo
+        for index, tmdb_id in enumerate(ids):
+            cached, fresh = None, False
+            if tmdb_client.cache is not None:
+                cached, fresh = tmdb_client.cache.lookup(f"{kind}/{tmdb_id}", params)
+            if fresh:
+                try:
+                    results[index] = formatter(cached)
+                    continue
+                except Exception:
+                    cached = None
+            pending.append((index, tmdb_id, cached))
+        
+        if not pending:
+            return results, errors
+        
+        # 2. El resto en paralelo, acotado
+        workers = min(max_workers or config.TMDB_BULK_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tmdb-bulk') as executor:
+            futures = {
+                executor.submit(self._refresh_details, tmdb_id, kind, stale): (index, tmdb_id)
+                for index, tmdb_id, stale in pending
+            }
+            for future in as_completed(futures):
+                index, tmdb_id = futures[future]
+                try:
+                    results[index] = formatter(future.result())
+                except Exception as e:
+                    errors[tmdb_id] = str(e)
+        
+        return results, errors
+    
+    def _fetch_details(self, tmdb_id, kind):
+        """JSON crudo de /movie/<id> o /tv/<id> (lanza excepción si falla)"""
+        return tmdb_client.get_json(
+            f"{kind}/{tmdb_id}",
+            params={'language': self.language},
+            timeout=10
+        )
+    
+    def _refresh_details(self, tmdb_id, kind, stale=None):
+        """Como _fetch_details, para un id que ya se buscó en el cache"""
+        return tmdb_client.refresh_json(
+            f"{kind}/{tmdb_id}",
+            params={'language': self.language},
+            timeout=10,
+            stale=stale
+        )
+    
+    def _format_movie(self, data):
+        return {
+            'tmdb_id': data.get('id'),
+            'title': data.get('title'),
+            'description': clean_html(data.get('overview', '')),
+            'genre': ', '.join([g['name'] for g in data.get('genres', [])]),
+            'rating': data.get('vote_average'),
+            'duration': data.get('runtime'),
+            'poster': f"{self.image_base_url}{data.get('poster_path')}" if data.get('poster_path') else None,
+            'year': int(data.get('release_date', '2000')[:4])
+        }
+    
+    def _format_series(self, data):
+        return {
+            'tmdb_id': data.get('id'),
+            'title': data.get('name'),
+            'description': clean_html(data.get('overview', '')),
+            'genre': ', '.join([g['name'] for g in data.get('genres', [])]),
+            'rating': data.get('vote_average'),
+            'poster': f"{self.image_base_url}{data.get('poster_path')}" if data.get('poster_path') else None,
+            'year': int(data.get('first_air_date', '2000')[:4]),
+            'seasons': data.get('number_of_seasons', 1)
+        }
+    
     def get_trending_movies(self, time_window='week'):
         """Obtener películas tendencia"""
         params = {
@@ -121,13 +175,12 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/trending/movie/{time_window}",
+            data = tmdb_client.get_json(
+                f"trending/movie/{time_window}",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])[:20]
+            return data.get('results', [])[:20]
         except Exception as e:
             print(f"Error obteniendo películas tendencia: {e}")
             return []
@@ -140,13 +193,12 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/trending/tv/{time_window}",
+            data = tmdb_client.get_json(
+                f"trending/tv/{time_window}",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])[:20]
+            return data.get('results', [])[:20]
         except Exception as e:
             print(f"Error obteniendo series tendencia: {e}")
             return []
@@ -160,13 +212,12 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/movie/popular",
+            data = tmdb_client.get_json(
+                "movie/popular",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])
+            return data.get('results', [])
         except Exception as e:
             print(f"Error obteniendo películas populares: {e}")
             return []
@@ -180,13 +231,12 @@ class TMDBService:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/tv/popular",
+            data = tmdb_client.get_json(
+                "tv/popular",
                 params=params,
                 timeout=10
             )
-            response.raise_for_status()
-            return response.json().get('results', [])
+            return data.get('results', [])
         except Exception as e:
             print(f"Error obteniendo series populares: {e}")
             return []
@@ -1,13 +1,42 @@
 import requests
 from datetime import datetime, timedelta
 
+# Estados de un link (los mismos que guarda la columna links.status)
+LINK_ACTIVE = 'active'
+LINK_BROKEN = 'broken'
+LINK_UNKNOWN = 'unknown'    # no se pudo saber (rate limit, caída momentánea)
+
+# Respuestas que no dicen nada del link en sí
+INCONCLUSIVE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Hosts que no implementan HEAD: se reintenta con GET sin bajar el cuerpo
+HEAD_UNSUPPORTED = {405, 501}
+
+def check_link(url, session=None, headers=None, timeout=5):
+    """
+    Estado de un link: HEAD (o GET sin cuerpo si el host no soporta HEAD)
+
+    Returns:
+        tuple: (LINK_ACTIVE/LINK_BROKEN/LINK_UNKNOWN, código HTTP o None, error o None)
+    """
+    http = session or requests
+    try:
+        response = http.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        if response.status_code in HEAD_UNSUPPORTED:
+            response = http.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True)
+            response.close()
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        return LINK_UNKNOWN, None, type(e).__name__
+    except requests.exceptions.RequestException as e:
+        return LINK_BROKEN, None, type(e).__name__
+
+    code = response.status_code
+    if code in INCONCLUSIVE_STATUS:
+        return LINK_UNKNOWN, code, f'HTTP {code}'
+    return (LINK_ACTIVE if code < 400 else LINK_BROKEN), code, None
+
 def validate_url(url):
     """Validar si una URL es accesible"""
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        return response.status_code < 400
-    except:
-        return False
+    return check_link(url)[0] == LINK_ACTIVE
 
 def is_link_expired(checked_at, days=7):
     """Verificar si un link debe ser re-verificado"""